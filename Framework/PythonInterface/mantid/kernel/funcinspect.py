@@ -13,6 +13,7 @@
                    return
 """
 
+from functools import lru_cache
 import inspect
 import dis
 
@@ -198,6 +199,9 @@ __operator_names = {'CALL_FUNCTION', 'CALL_FUNCTION_VAR', 'CALL_FUNCTION_KW', 'C
                     'INPLACE_LSHIFT', 'INPLACE_RSHIFT', 'INPLACE_AND', 'INPLACE_XOR', 'INPLACE_OR', 'COMPARE_OP',
                     'CALL_FUNCTION_EX', 'LOAD_METHOD', 'CALL_METHOD'}
 
+# The maximum number of call sites for which the lhs information is kept
+__call_site_cache_size = 1024
+
 
 def process_frame(frame):
     """Returns the number of arguments on the left of assignment along
@@ -213,9 +217,31 @@ def process_frame(frame):
     =========
     Returns the a tuple with the number of arguments and their names
     """
-    # Index of the last attempted instruction in byte code
-    last_i = frame.f_lasti
-    ins_stack = decompile(frame.f_code)
+    # f_lasti is the index of the last attempted instruction in byte code
+    max_returns, output_var_names = _process_call_site(frame.f_code, frame.f_lasti)
+    # Copy the nested lists of names so the cached result cannot be modified
+    return (max_returns, tuple(list(names) if isinstance(names, list) else names for names in output_var_names))
+
+
+@lru_cache(maxsize=__call_site_cache_size)
+def _process_call_site(code_object, last_i):
+    """Returns the number of arguments on the left of assignment along
+    with the names of the variables for the call at the given instruction.
+    The result is cached as disassembling the byte code is slow and the same
+    call site is usually visited many times, e.g. from within a loop.
+
+    Call signature(s)::
+
+    Required arguments:
+    ===========================   ==========
+    code_object                   The code object containing the call
+    last_i                        The offset of the call instruction in the byte code
+
+    Outputs:
+    =========
+    Returns the a tuple with the number of arguments and their names
+    """
+    ins_stack = decompile(code_object)
 
     call_function_locs = {}
     start_index = 0
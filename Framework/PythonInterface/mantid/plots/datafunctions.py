@@ -8,7 +8,6 @@
 #
 #
 import datetime
-from itertools import tee
 
 import numpy as np
 from matplotlib.collections import PolyCollection, QuadMesh
@@ -16,7 +15,6 @@ from matplotlib.container import ErrorbarContainer
 from matplotlib.colors import LogNorm
 from matplotlib.ticker import LogLocator
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-from scipy.interpolate import interp1d
 
 import mantid.api
 import mantid.kernel
@@ -532,41 +530,83 @@ def get_matrix_2d_ragged(workspace, normalize_by_bin_width, histogram2D=False, t
         return x, y, counts
 
 
-def pairwise(iterable):
-    a, b = tee(iterable)
-    next(b, None)
-    return zip(a, b)
+def _vertical_axis_edges(workspace):
+    """
+    Get sorted bin edges describing the vertical axis of a workspace, so values
+    on the axis can be converted to workspace indices with a single searchsorted.
+
+    :param workspace: a MatrixWorkspace
+    :returns: a tuple of the edges and a flag which is True if the edges were
+        computed from the centres of a NumericAxis, or None if the axis cannot
+        be searched in this way (e.g. a TextAxis or unsorted spectrum numbers)
+    """
+    axis = workspace.getAxis(1)
+    if axis.isText():
+        return None
+    values = np.asarray(axis.extractValues(), dtype=np.float64)
+    if values.size < 2 or np.any(np.diff(values) < 0):
+        return None
+
+    if isinstance(axis, mantid.api.BinEdgeAxis):
+        return values, False
+    return boundaries_from_points(values), not axis.isSpectra()
 
 
 def _workspace_indices(y_bins, workspace):
-    workspace_indices = []
-    for y in y_bins:
-        try:
-            workspace_index = workspace.getAxis(1).indexOfValue(y)
-            workspace_indices.append(workspace_index)
-        except IndexError:
-            workspace_indices.append(-1)
-    return workspace_indices
+    """
+    Find the workspace index of the spectrum containing each value in y_bins
+    using the vertical axis of the workspace. Values outside of the axis are
+    given an index of -1.
+
+    :param y_bins: values on the vertical axis
+    :param workspace: a MatrixWorkspace
+    :returns: a numpy array of workspace indices
+    """
+    axis_edges = _vertical_axis_edges(workspace)
+    if axis_edges is None:
+        workspace_indices = []
+        for y in y_bins:
+            try:
+                workspace_index = workspace.getAxis(1).indexOfValue(y)
+                workspace_indices.append(workspace_index)
+            except IndexError:
+                workspace_indices.append(-1)
+        return np.asarray(workspace_indices, dtype=np.int64)
+
+    edges, from_centers = axis_edges
+    y_bins = np.asarray(y_bins, dtype=np.float64)
+    # Matches Axis.indexOfValue: a value on the edge between two points of a numeric axis
+    # belongs to the upper point, a value on an edge of a spectra or bin edge axis to the lower bin
+    if from_centers:
+        workspace_indices = np.searchsorted(edges[1:-1], y_bins, side='right')
+    else:
+        workspace_indices = np.maximum(np.searchsorted(edges, y_bins, side='left') - 1, 0)
+    workspace_indices[(y_bins < edges[0]) | (y_bins > edges[-1])] = -1
+    return workspace_indices.astype(np.int64)
 
 
 def _workspace_indices_maxpooling(y_bins, workspace):
-    summed_spectra_workspace = _integrate_workspace(workspace)
-    summed_spectra = summed_spectra_workspace.extractY()
-    workspace_indices = []
-    for y_range in pairwise(y_bins):
-        try:
-            workspace_range = [workspace.getAxis(1).indexOfValue(y_range[0]),
-                               workspace.getAxis(1).indexOfValue(y_range[1])]
-            # if the range doesn't span more than one spectra just grab the first element
-            # else we need to pick the spectra which has the highest intensity
-            if np.diff(workspace_range)[0] > 1:
-                workspace_range = range(workspace_range[0], workspace_range[1])
-                workspace_index = workspace_range[np.argmax(summed_spectra[workspace_range])]
-            else:
-                workspace_index = workspace_range[0]
-            workspace_indices.append(workspace_index)
-        except IndexError:
-            workspace_indices.append(-1)
+    """
+    For each range between consecutive values in y_bins, find the workspace index of
+    the spectrum with the highest integrated counts. Ranges which are not fully
+    inside the vertical axis are given an index of -1.
+
+    :param y_bins: values on the vertical axis
+    :param workspace: a MatrixWorkspace
+    :returns: a numpy array of workspace indices, one shorter than y_bins
+    """
+    from mantid.plots.resampling_image.integratedspectra import integrated_spectra_table
+    summed_spectra = integrated_spectra_table(workspace, _integrate_workspace)
+
+    bin_indices = _workspace_indices(y_bins, workspace)
+    range_start, range_stop = bin_indices[:-1], bin_indices[1:]
+    workspace_indices = np.where((range_start == -1) | (range_stop == -1), -1, range_start)
+    # if the range doesn't span more than one spectra just grab the first element
+    # else we need to pick the spectra which has the highest intensity
+    spans_spectra = (workspace_indices != -1) & (range_stop - range_start > 1)
+    if np.any(spans_spectra):
+        workspace_indices[spans_spectra] = summed_spectra.argmax(range_start[spans_spectra],
+                                                                 range_stop[spans_spectra])
     return workspace_indices
 
 
@@ -586,34 +626,83 @@ def _integrate_workspace(workspace):
 def interpolate_y_data(workspace, x, y, normalize_by_bin_width, spectrum_info=None, maxpooling=False):
     workspace_indices = _workspace_indices_maxpooling(y, workspace) \
         if maxpooling else _workspace_indices(y, workspace)
+    workspace_indices = np.asarray(workspace_indices, dtype=np.int64)
     counts = np.full([len(workspace_indices), x.size], np.nan, dtype=np.float64)
-    previous_index = -1
-    index = -1
-    for workspace_index in workspace_indices:
-        index += 1
-        # if workspace axis is beyond limits carry on
-        if workspace_index == -1:
-            continue
-        # avoid repeating calculations
-        if previous_index == workspace_index:
-            counts[index, :] = counts[index - 1]
-            continue
-        previous_index = workspace_index
-        if not (spectrum_info and spectrum_info.hasDetectors(workspace_index) and spectrum_info.isMonitor(
-                workspace_index)):
-            centers, ztmp, _, _ = get_spectrum(workspace, workspace_index,
-                                               normalize_by_bin_width=normalize_by_bin_width,
-                                               withDy=False, withDx=False)
-            interpolation_function = interp1d(centers, ztmp, kind='nearest', bounds_error=False,
-                                              fill_value="extrapolate")
-            # only set values in the range of workspace
-            x_range = np.where((x >= workspace.readX(workspace_index)[0]) & (x <= workspace.readX(workspace_index)[-1]))
-            # set values outside x data to nan
-            counts[index, x_range] = interpolation_function(x[x_range])
+
+    # avoid repeating calculations: each spectrum is resampled once however many rows it fills
+    unique_indices, rows = np.unique(workspace_indices, return_inverse=True)
+    # if workspace axis is beyond limits carry on
+    plotted = unique_indices != -1
+    if spectrum_info:
+        for i, workspace_index in enumerate(unique_indices):
+            if plotted[i] and spectrum_info.hasDetectors(int(workspace_index)) \
+                    and spectrum_info.isMonitor(int(workspace_index)):
+                plotted[i] = False
+
+    if np.any(plotted):
+        unique_counts = np.full([unique_indices.size, x.size], np.nan, dtype=np.float64)
+        unique_counts[plotted] = _resample_spectra(workspace, unique_indices[plotted], x, normalize_by_bin_width)
+        counts = unique_counts[rows]
+
     counts = np.ma.masked_invalid(counts, copy=False)
     return counts
 
 
+def _resample_spectra(workspace, workspace_indices, x, normalize_by_bin_width):
+    """
+    Nearest-neighbour resample a set of spectra onto common x values. Points outside
+    of the x range of a spectrum, and all points of masked spectra, are set to nan.
+
+    :param workspace: a MatrixWorkspace
+    :param workspace_indices: workspace indices of the spectra to resample
+    :param x: the x values to sample each spectrum at
+    :param normalize_by_bin_width: flag to divide the data by bin width
+    :returns: a 2D numpy array with a row of resampled counts per spectrum
+    """
+    workspace_indices = [int(workspace_index) for workspace_index in workspace_indices]
+    x_data = [workspace.readX(workspace_index) for workspace_index in workspace_indices]
+    y_data = [workspace.readY(workspace_index) for workspace_index in workspace_indices]
+
+    if all(len(x_row) == len(x_data[0]) for x_row in x_data) and common_x(np.array(x_data)):
+        # a single lookup serves every spectrum
+        resampled = _resample_rows(x_data[0], np.array(y_data, dtype=np.float64), x, workspace,
+                                   normalize_by_bin_width)
+    else:
+        resampled = np.vstack([
+            _resample_rows(x_row, np.array(y_row, dtype=np.float64, ndmin=2), x, workspace, normalize_by_bin_width)
+            for x_row, y_row in zip(x_data, y_data)
+        ])
+
+    try:
+        spectrum_info = workspace.spectrumInfo()
+        masked = [spectrum_info.hasDetectors(workspace_index) and spectrum_info.isMasked(workspace_index)
+                  for workspace_index in workspace_indices]
+        resampled[np.asarray(masked, dtype=bool)] = np.nan
+    except:
+        pass
+    return resampled
+
+
+def _resample_rows(x_row, y_data, x, workspace, normalize_by_bin_width):
+    """
+    Nearest-neighbour resample rows of y_data which share the same x_row.
+    Equivalent to scipy's interp1d(kind='nearest', fill_value='extrapolate')
+    limited to the range of x_row.
+    """
+    if workspace.isHistogramData():
+        if normalize_by_bin_width and not workspace.isDistribution():
+            y_data = y_data / (x_row[1:] - x_row[0:-1])
+        centers = points_from_boundaries(x_row)
+    else:
+        centers = x_row
+
+    nearest = np.searchsorted((centers[1:] + centers[:-1]) * 0.5, x, side='left')
+    resampled = y_data[:, nearest]
+    # set values outside x data to nan
+    resampled[:, (x < x_row[0]) | (x > x_row[-1])] = np.nan
+    return resampled
+
+
 def get_matrix_2d_data(workspace, distribution, histogram2D=False, transpose=False):
     '''
     Get all data from a Matrix workspace that has the same number of bins
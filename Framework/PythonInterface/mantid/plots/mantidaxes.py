@@ -6,6 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 #  This file is part of the mantid package
 from collections.abc import Iterable
+from contextlib import contextmanager
 import copy
 import numpy as np
 import re
@@ -100,6 +101,9 @@ class MantidAxes(Axes):
         self.interactive_markers = []
         # flag to indicate if a function has been set to replace data
         self.data_replaced = False
+        # set while the artists of a workspace are replaced, so that the axes are autoscaled only once
+        self._autoscale_deferred = False
+        self._autoscale_requested = False
 
         self.waterfall_x_offset = 0
         self.waterfall_y_offset = 0
@@ -436,7 +440,9 @@ class MantidAxes(Axes):
         except KeyError:
             return False
 
-        is_empty_list = [workspace_artist.replace_data(workspace) for workspace_artist in artist_info]
+        # Rescale the axes once after all the artists are updated
+        with self._deferred_autoscale():
+            is_empty_list = [workspace_artist.replace_data(workspace) for workspace_artist in artist_info]
 
         for index, empty in reversed(list(enumerate(is_empty_list))):
             if empty:
@@ -444,6 +450,29 @@ class MantidAxes(Axes):
 
         return True
 
+    @contextmanager
+    def _deferred_autoscale(self):
+        """
+        Postpone the relim and autoscale requested by the data updates of artists until the end of the context
+        """
+        self._autoscale_deferred, self._autoscale_requested = True, False
+        try:
+            yield
+        finally:
+            self._autoscale_deferred = False
+            if self._autoscale_requested:
+                self._relim_and_autoscale()
+
+    def _relim_and_autoscale(self):
+        """
+        Recompute the data limits and autoscale the axes, unless this is postponed by _deferred_autoscale
+        """
+        if self._autoscale_deferred:
+            self._autoscale_requested = True
+        else:
+            self.relim()
+            self.autoscale()
+
     def rename_workspace(self, new_name, old_name):
         """
         Rename a workspace, and update the artists, creation arguments and tracked workspaces accordingly
@@ -659,8 +688,7 @@ class MantidAxes(Axes):
                     _autoscale_on = self.get_autoscale_on()
 
                 if _autoscale_on:
-                    self.relim()
-                    self.autoscale()
+                    self._relim_and_autoscale()
                 return artists
 
             workspace = args[0]
@@ -0,0 +1,128 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+from threading import Lock
+
+import numpy as np
+
+from mantid.api import AnalysisDataServiceObserver
+
+
+class RangeMaxTable:
+    """
+    Sparse table answering "which element of values[start:stop] is largest"
+    in constant time per query, after an O(n log n) setup.
+    Ties are resolved to the first largest element, as numpy.argmax does.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        # argmax treats nan as the largest value
+        self._values = np.where(np.isnan(values), np.inf, values)
+        index_type = np.int32 if self._values.size < np.iinfo(np.int32).max else np.int64
+        # level k holds the position of the largest element of values[i:i + 2**k]
+        self._levels = [np.arange(self._values.size, dtype=index_type)]
+        width = 1
+        while 2 * width <= self._values.size:
+            previous = self._levels[-1]
+            self._levels.append(self._argmax(previous[:-width], previous[width:]))
+            width *= 2
+
+    def __len__(self):
+        return self._values.size
+
+    def argmax(self, start, stop):
+        """
+        Find the position of the largest element in each range values[start:stop]
+        :param start: array of the first positions of each range
+        :param stop: array of the positions after the end of each range. Must be > start.
+        :return: array of positions of the largest element in each range
+        """
+        start = np.asarray(start, dtype=np.int64)
+        stop = np.asarray(stop, dtype=np.int64)
+        positions = np.empty(start.shape, dtype=np.int64)
+        # each range is covered by two, possibly overlapping, ranges of width 2**level
+        levels = np.floor(np.log2(stop - start)).astype(np.int64)
+        for level in np.unique(levels):
+            in_level = levels == level
+            table = self._levels[level]
+            positions[in_level] = self._argmax(table[start[in_level]], table[stop[in_level] - (1 << level)])
+        return positions
+
+    def _argmax(self, left, right):
+        return np.where(self._values[left] >= self._values[right], left, right)
+
+
+class IntegratedSpectraCache(AnalysisDataServiceObserver):
+    """
+    Holds a RangeMaxTable of the integrated counts of each spectrum for workspaces in
+    the ADS, so max-pooling the same workspace again does not need to integrate it.
+    An entry is discarded when its workspace is replaced, renamed or deleted.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._tables = {}
+        self._lock = Lock()
+
+        self.observeClear(True)
+        self.observeDelete(True)
+        self.observeRename(True)
+        self.observeReplace(True)
+
+    def get(self, workspace, integrate):
+        """
+        Get the RangeMaxTable of integrated spectra for a workspace
+        :param workspace: A MatrixWorkspace
+        :param integrate: A function returning the integrated workspace, called on a cache miss
+        :return: A RangeMaxTable with an entry per spectrum
+        """
+        name = workspace.name()
+        with self._lock:
+            table = self._tables.get(name)
+        if table is not None and len(table) == workspace.getNumberHistograms():
+            return table
+
+        table = RangeMaxTable(integrate(workspace).extractY())
+        # workspaces outside of the ADS have no name and no notifications to invalidate them
+        if name:
+            with self._lock:
+                self._tables[name] = table
+        return table
+
+    def clearHandle(self):
+        with self._lock:
+            self._tables.clear()
+
+    def deleteHandle(self, workspace_name, _):
+        self._invalidate(workspace_name)
+
+    def renameHandle(self, old_name, _):
+        self._invalidate(old_name)
+
+    def replaceHandle(self, workspace_name, _):
+        self._invalidate(workspace_name)
+
+    def _invalidate(self, workspace_name):
+        with self._lock:
+            self._tables.pop(workspace_name, None)
+
+
+_integrated_spectra_cache = None
+
+
+def integrated_spectra_table(workspace, integrate):
+    """
+    Get a RangeMaxTable of the integrated spectra of a workspace, reusing a cached
+    table if the workspace has not changed since it was last integrated
+    :param workspace: A MatrixWorkspace
+    :param integrate: A function returning the integrated workspace
+    :return: A RangeMaxTable with an entry per spectrum
+    """
+    global _integrated_spectra_cache
+    if _integrated_spectra_cache is None:
+        _integrated_spectra_cache = IntegratedSpectraCache()
+    return _integrated_spectra_cache.get(workspace, integrate)
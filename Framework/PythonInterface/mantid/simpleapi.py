@@ -31,8 +31,11 @@ from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
 import datetime
 from dateutil.parser import parse as parse_date
+import hashlib
+import json
 import os
 import sys
+import tempfile
 
 import mantid
 # This is a simple API so give access to the aliases by default as well
@@ -66,6 +69,14 @@ __LOGGING_KEYWORD__ = "EnableLogging"
 __STORE_KEYWORD__ = "StoreInADS"
 # This is the default value for __STORE_KEYWORD__
 __STORE_ADS_DEFAULT__ = True
+# The name of the file, in the application data directory, caching the information used to create functions lazily
+__ALGORITHM_CACHE_FILENAME__ = "simpleapi_algorithms.json"
+# Algorithm objects, or stand-ins for them, for functions that will be created on first access
+_lazy_algorithms = {}
+# Names of the Python plugins that are being loaded and so are not yet registered
+_pending_plugin_names = set()
+# True if the algorithm functions are created when first accessed. Set on initialization.
+_create_lazily = False
 
 
 def specialization_exists(name):
@@ -1151,7 +1162,8 @@ def _find_parent_pythonalgorithm(frame):
 
 
 def _create_fake_function(name):
-    """Create fake functions for the given name
+    """Create a fake function for the given name
+    :returns: the fake function
     """
 
     # ------------------------------------------------------------------------------------------------
@@ -1163,7 +1175,7 @@ def _create_fake_function(name):
     # ------------------------------------------------------------------------------------------------
     fake_function.__name__ = name
     _replace_signature(fake_function, ("", ""))
-    globals()[name] = fake_function
+    return fake_function
 
 
 def _mockup(plugins):
@@ -1233,22 +1245,268 @@ def _translate():
             continue
 
         algorithm_wrapper = _create_algorithm_function(name, max(versions), algm_object)
-        method_name = algm_object.workspaceMethodName()
-        if len(method_name) > 0:
-            if method_name in new_methods:
-                other_alg = new_methods[method_name]
-                raise RuntimeError("simpleapi: Trying to attach '%s' as method to point to '%s' algorithm but "
-                                   "it has already been attached to point to the '%s' algorithm.\n"
-                                   "Does one inherit from the other? "
-                                   "Please check and update one of the algorithms accordingly."
-                                   % (method_name, algm_object.name(), other_alg))
-            _attach_algorithm_func_as_method(method_name, algorithm_wrapper, algm_object)
-            new_methods[method_name] = algm_object.name()
+        _register_workspace_method(new_methods, algorithm_wrapper, algm_object)
         new_func_attrs.append(name)
 
     return new_func_attrs
 
 
+def _register_workspace_method(new_methods, algorithm_wrapper, algm_object):
+    """
+        Attach the algorithm function as a workspace method if the algorithm requests one
+        :param new_methods: Method names mapped to the algorithm names they have been attached for
+        :param algorithm_wrapper: The function running the algorithm
+        :param algm_object: The algorithm object, or a stand-in for it
+    """
+    method_name = algm_object.workspaceMethodName()
+    if len(method_name) > 0:
+        if method_name in new_methods:
+            other_alg = new_methods[method_name]
+            raise RuntimeError("simpleapi: Trying to attach '%s' as method to point to '%s' algorithm but "
+                               "it has already been attached to point to the '%s' algorithm.\n"
+                               "Does one inherit from the other? "
+                               "Please check and update one of the algorithms accordingly."
+                               % (method_name, algm_object.name(), other_alg))
+        _attach_algorithm_func_as_method(method_name, algorithm_wrapper, algm_object)
+        new_methods[method_name] = algm_object.name()
+
+
+# -------------------------------------------------------------------------------------------------------------
+# Lazy creation of the algorithm functions
+#
+# When 'simpleapi.lazy' is enabled the functions are created the first time they are accessed
+# through the module __getattr__, rather than on import. The information needed to register
+# them is cached on disk, keyed on the contents of the algorithm registry, so that importing
+# this module does not need to create any algorithms while the registry is unchanged.
+# -------------------------------------------------------------------------------------------------------------
+
+
+class _CachedAlgorithm(object):
+    """
+        Stands in for an algorithm object when creating its function, answering the registration
+        queries from cached values. The algorithm itself is only created if anything else is requested.
+    """
+
+    def __init__(self, info):
+        """
+            :param info: A dictionary of the cached values, as created by _algorithm_info
+        """
+        self._info = info
+        self._algorithm = None
+
+    def name(self):
+        return self._info['name']
+
+    def version(self):
+        return self._info['version']
+
+    def alias(self):
+        return self._info['alias']
+
+    def aliasDeprecated(self):
+        return self._info['alias_deprecated']
+
+    def workspaceMethodName(self):
+        return self._info['method_name']
+
+    def workspaceMethodInputProperty(self):
+        return self._info['method_input_property']
+
+    def workspaceMethodOn(self):
+        return self._info['method_on']
+
+    def initialize(self):
+        if self._info.get('doc') is None:
+            self._get_algorithm().initialize()
+
+    def docString(self):
+        doc = self._info.get('doc')
+        return self._get_algorithm().docString() if doc is None else doc
+
+    def __getattr__(self, item):
+        return getattr(self._get_algorithm(), item)
+
+    def _get_algorithm(self):
+        if self._algorithm is None:
+            self._algorithm = AlgorithmManager.createUnmanaged(self.name(), self.version())
+        return self._algorithm
+
+
+def _algorithm_info(algm_object):
+    """
+        Extract the values needed to create the function for an algorithm. The docstring
+        is only stored for algorithms attached as workspace methods, as it is needed when
+        the method is attached.
+        :param algm_object: An algorithm object
+        :returns: A dictionary of values that can be stored as JSON
+    """
+    info = {'name': algm_object.name(),
+            'version': algm_object.version(),
+            'alias': algm_object.alias().strip(),
+            'alias_deprecated': algm_object.aliasDeprecated(),
+            'method_name': algm_object.workspaceMethodName(),
+            'method_input_property': '',
+            'method_on': [],
+            'doc': None}
+    if info['method_name']:
+        info['method_input_property'] = algm_object.workspaceMethodInputProperty()
+        info['method_on'] = list(algm_object.workspaceMethodOn())
+        algm_object.initialize()
+        info['doc'] = algm_object.docString()
+    return info
+
+
+def _algorithm_cache_key(algs, plugin_files):
+    """
+        Create a key identifying the contents of the algorithm registry
+        :param algs: A dictionary of registered algorithm names mapped to their versions
+        :param plugin_files: The Python plugin files that have been loaded
+        :returns: A string hash of the registry contents
+    """
+    plugin_times = []
+    for plugin_file in sorted(plugin_files):
+        try:
+            plugin_times.append((plugin_file, os.path.getmtime(plugin_file)))
+        except OSError:
+            plugin_times.append((plugin_file, None))
+    contents = json.dumps([mantid.__version__,
+                           sorted((name, sorted(versions)) for name, versions in algs.items()),
+                           plugin_times])
+    return hashlib.sha1(contents.encode('utf-8')).hexdigest()
+
+
+def _algorithm_cache_path():
+    return os.path.join(ConfigService.getAppDataDirectory(), __ALGORITHM_CACHE_FILENAME__)
+
+
+def _read_algorithm_cache(cache_key):
+    """
+        Read the cached algorithm information
+        :param cache_key: The key identifying the current contents of the algorithm registry
+        :returns: A list of dictionaries created by _algorithm_info, or None if the cache is
+                  missing or was created for a different registry
+    """
+    try:
+        with open(_algorithm_cache_path()) as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get('key') != cache_key:
+        return None
+    return cache.get('algorithms')
+
+
+def _write_algorithm_cache(cache_key, algorithm_infos):
+    """
+        Save the algorithm information for the next import. Failures are only logged
+        as the cache is not required.
+        :param cache_key: The key identifying the current contents of the algorithm registry
+        :param algorithm_infos: A list of dictionaries created by _algorithm_info
+    """
+    cache_path = _algorithm_cache_path()
+    try:
+        # Write to a temporary file first so a concurrent import never reads a partial cache
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        with os.fdopen(file_descriptor, 'w') as cache_file:
+            json.dump({'key': cache_key, 'algorithms': algorithm_infos}, cache_file)
+        os.replace(temporary_path, cache_path)
+    except OSError as exc:
+        logger.information("Unable to write the simple API cache '{0}': {1}".format(cache_path, str(exc)))
+
+
+def _create_algorithm_infos(algs):
+    """
+        Create every registered algorithm to find the information needed to create its function
+        :param algs: A dictionary of registered algorithm names mapped to their versions
+        :returns: A list of dictionaries created by _algorithm_info
+    """
+    algorithm_infos = []
+    for name, versions in algs.items():
+        if specialization_exists(name):
+            continue
+        try:
+            algm_object = AlgorithmManager.createUnmanaged(name, max(versions))
+            algorithm_infos.append(_algorithm_info(algm_object))
+        except Exception as exc:
+            logger.warning("Error initializing {0} on registration: '{1}'".format(name, str(exc)))
+    return algorithm_infos
+
+
+def _translate_lazily(plugin_files):
+    """
+        Register every algorithm so that its function is created the first time it is
+        accessed. Only workspace methods are attached immediately.
+        :param plugin_files: The Python plugin files that have been loaded
+        :returns: a list of the name of new function calls
+    """
+    from mantid.api import AlgorithmFactory
+
+    algs = AlgorithmFactory.getRegisteredAlgorithms(True)
+    cache_key = _algorithm_cache_key(algs, plugin_files)
+    algorithm_infos = _read_algorithm_cache(cache_key)
+    if algorithm_infos is None:
+        algorithm_infos = _create_algorithm_infos(algs)
+        _write_algorithm_cache(cache_key, algorithm_infos)
+
+    new_func_attrs = []
+    new_methods = {}
+    for info in algorithm_infos:
+        algm_object = _CachedAlgorithm(info)
+        for func_name in [algm_object.name()] + algm_object.alias().split():
+            _lazy_algorithms[func_name] = algm_object
+        if algm_object.workspaceMethodName():
+            algorithm_wrapper = _create_algorithm_function(algm_object.name(), algm_object.version(), algm_object)
+            _register_workspace_method(new_methods, algorithm_wrapper, algm_object)
+        new_func_attrs.append(algm_object.name())
+
+    return new_func_attrs
+
+
+def __getattr__(name):
+    """
+        Create the function for an algorithm when it is first accessed, if functions are created lazily.
+        While the Python plugins are loading, their functions are mocked as _mockup would.
+    """
+    if _create_lazily and not name.startswith('_'):
+        algm_object = _lazy_algorithms.get(name)
+        if algm_object is None:
+            from mantid.api import AlgorithmFactory
+            if AlgorithmFactory.exists(name) and not specialization_exists(name):
+                algm_object = _CachedAlgorithm({'name': name, 'version': AlgorithmFactory.highestVersion(name),
+                                                'alias': '', 'alias_deprecated': ''})
+            elif name in _pending_plugin_names:
+                return _create_fake_function(name)
+        if algm_object is not None:
+            _create_algorithm_function(algm_object.name(), algm_object.version(), algm_object)
+            return globals()[name]
+    raise AttributeError("module '{0}' has no attribute '{1}'".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_algorithms))
+
+
+def _star_import_names(plugin_names):
+    """
+        List the names 'from mantid.simpleapi import *' imports while the Python plugins are loading.
+        The functions have not been created yet, so they would not be found in the module namespace.
+        Importing each name creates its function, or mocks it if its plugin has not been loaded yet.
+        :param plugin_names: The names of the plugins about to be loaded
+        :returns: A sorted list of names for __all__
+    """
+    from mantid.api import AlgorithmFactory
+
+    names = set(globals()) | set(AlgorithmFactory.getRegisteredAlgorithms(True)) | set(plugin_names)
+    return sorted(name for name in names if not name.startswith('_'))
+
+
+def _lazy_simpleapi():
+    """
+        :returns: True if the algorithm functions are created when first accessed
+    """
+    return ConfigService.Instance().get('simpleapi.lazy', '0').strip().lower() in ('1', 'true', 'on')
+
+
 # -------------------------------------------------------------------------------------------------------------
 
 
@@ -1292,7 +1550,9 @@ def _update_sys_path(dirs):
 #   - loads the python plugins and create new algorithm functions
 if not _api.FrameworkManagerImpl.hasInstance():
     _api.FrameworkManagerImpl.Instance()
-_translate()
+_create_lazily = _lazy_simpleapi()
+if not _create_lazily:
+    _translate()
 
 # Load the Python plugins
 # The exported C++ plugins
@@ -1346,20 +1606,36 @@ try:
             continue
 
     # Mock out the expected functions
-    _mockup(_plugin_files)
+    if _create_lazily:
+        _pending_plugin_names.update(os.path.splitext(os.path.basename(plugin))[0] for plugin in _plugin_files)
+        # Plugins using 'from mantid.simpleapi import *' need the functions listed before they are loaded
+        __all__ = _star_import_names(_pending_plugin_names)
+    else:
+        _mockup(_plugin_files)
     # Load the plugins.
     with _update_sys_path(_plugin_dirs):
         _plugin_modules = _plugin_helper.load(_plugin_files)
     # Create the final proper algorithm definitions for the plugins
-    _plugin_attrs = _translate()
+    if _create_lazily:
+        _pending_plugin_names.clear()
+        _plugin_attrs = [name for name in _translate_lazily(_plugin_files)
+                         if any(hasattr(plugin_module, name) for plugin_module in _plugin_modules)]
+        _plugin_functions = {name: __getattr__(name) for name in _plugin_attrs}
+    else:
+        _plugin_attrs = _translate()
+        _plugin_functions = globals()
     # Finally, overwrite the mocked function definitions in the loaded modules with the real ones
-    _plugin_helper.sync_attrs(globals(), _plugin_attrs, _plugin_modules)
+    _plugin_helper.sync_attrs(_plugin_functions, _plugin_attrs, _plugin_modules)
 
     # Attach fit function wrappers
     from .fitfunctions import _wrappers
 
     _globals = globals()
     _globals.update(_wrappers())
+
+    if _create_lazily:
+        # 'from mantid.simpleapi import *' must also import the functions that have not been created yet
+        __all__ = sorted(set(name for name in _globals if not name.startswith('_')) | set(_lazy_algorithms))
 except Exception:
     # If an error gets raised remove the attribute to be consistent
     # with standard python behaviour and reraise the exception
@@ -6,11 +6,12 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 from mantid.api import mtd, AlgorithmFactory, DistributedDataProcessorAlgorithm, ITableWorkspaceProperty, \
     MatrixWorkspaceProperty, MultipleFileProperty, PropertyMode
-from mantid.kernel import Direction, PropertyManagerDataService
-from mantid.simpleapi import AlignAndFocusPowder, CompressEvents, ConvertDiffCal, ConvertUnits, CopyLogs, \
-    CopySample, CreateCacheFilename, DeleteWorkspace, DetermineChunking, Divide, EditInstrumentGeometry, FilterBadPulses, \
-    LoadDiffCal, Load, LoadIDFFromNexus, LoadNexusProcessed, PDDetermineCharacterizations, Plus, \
-    RebinToWorkspace, RemoveLogs, RenameWorkspace, SaveNexusProcessed
+from mantid.kernel import Direction, IntBoundedValidator, MemoryStats, PropertyManagerDataService
+from mantid.simpleapi import CompressEvents, ConvertDiffCal, CopySample, CreateCacheFilename, DeleteWorkspace, \
+    DetermineChunking, EditInstrumentGeometry, LoadDiffCal, Load, LoadNexusProcessed, PDDetermineCharacterizations, \
+    Plus, RebinToWorkspace, RemoveLogs, RenameWorkspace, SaveNexusProcessed
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import os
 import numpy as np
 
@@ -107,6 +108,10 @@ class AlignAndFocusPowderFromFiles(DistributedDataProcessorAlgorithm):
                              "Files to combine in reduction")
         self.declareProperty("MaxChunkSize", 0.,
                              "Specify maximum Gbytes of file to read in one chunk.  Default is whole file.")
+        self.declareProperty("MaxConcurrentChunks", 1, IntBoundedValidator(lower=0),
+                             "Maximum number of chunks of a file to focus at the same time, chunks are still loaded "
+                             "one at a time. 0 uses one per core. "
+                             "This is reduced so that the chunks, each of up to MaxChunkSize Gbytes, fit in memory.")
         self.declareProperty("FilterBadPulses", 0.,
                              doc="Filter out events measured while proton charge is more than 5% below average")
 
@@ -340,6 +345,9 @@ class AlignAndFocusPowderFromFiles(DistributedDataProcessorAlgorithm):
 
         unfocusname_chunk = ''
         canSkipLoadingLogs = False
+        maxConcurrentChunks = self.__getMaxConcurrentChunks(len(chunks))
+        if maxConcurrentChunks > 1:
+            self.log().information('Processing up to {:d} chunks at the same time'.format(maxConcurrentChunks))
 
         # inner loop is over chunks
         haveAccumulationForFile = False
@@ -355,25 +363,12 @@ class AlignAndFocusPowderFromFiles(DistributedDataProcessorAlgorithm):
                 if unfocusname:  # only create unfocus chunk if needed
                     unfocusname_chunk = '{}_c{:d}'.format(unfocusname, j)
 
-            # load a chunk - this is a bit crazy long because we need to get an output property from `Load` when it
-            # is run and the algorithm history doesn't exist until the parent algorithm (this) has finished
-            loader = self.__createLoader(filename, chunkname,
-                                         skipLoadingLogs=(len(chunks) > 1 and canSkipLoadingLogs and haveAccumulationForFile),
-                                         progstart=prog_start, progstop=prog_start + prog_per_chunk_step,
-                                         **chunk)
-            loader.execute()
+            loader = self.__loadChunk(filename, chunk, chunkname, wkspname,
+                                      (len(chunks) > 1 and canSkipLoadingLogs and haveAccumulationForFile),
+                                      prog_start, prog_start + prog_per_chunk_step)
             if j == 0:
                 self.__setupCalibration(chunkname)
 
-            # copy the necessary logs onto the workspace
-            if len(chunks) > 1 and canSkipLoadingLogs and haveAccumulationForFile:
-                CopyLogs(InputWorkspace=wkspname, OutputWorkspace=chunkname, MergeStrategy='WipeExisting')
-                # re-load instrument so detector positions that depend on logs get initialized
-                try:
-                    LoadIDFFromNexus(Workspace=chunkname, Filename=filename, InstrumentParentPath='/entry')
-                except RuntimeError as e:
-                    self.log().warning('Reloading instrument using "LoadIDFFromNexus" failed: {}'.format(e))
-
             # get the underlying loader name if we used the generic one
             if self.__loaderName == 'Load':
                 self.__loaderName = loader.getPropertyValue('LoaderName')
@@ -390,50 +385,21 @@ class AlignAndFocusPowderFromFiles(DistributedDataProcessorAlgorithm):
                 continue
 
             prog_start += prog_per_chunk_step
-            if self.filterBadPulses > 0.:
-                FilterBadPulses(InputWorkspace=chunkname, OutputWorkspace=chunkname,
-                                LowerCutoff=self.filterBadPulses,
-                                startProgress=prog_start, endProgress=prog_start+prog_per_chunk_step)
-                if mtd[chunkname].getNumberEvents() == 0:
-                    msg = 'FilterBadPulses removed all events from '
-                    if len(chunks) == 1:
-                        raise RuntimeError(msg + filename)
-                    else:
-                        raise RuntimeError(msg + 'chunk {} of {} in {}'.format(j, len(chunks), filename))
-
-            prog_start += prog_per_chunk_step
-
-            # absorption correction workspace
-            if self.absorption is not None and len(str(self.absorption)) > 0:
-                ConvertUnits(InputWorkspace=chunkname, OutputWorkspace=chunkname,
-                             Target='Wavelength', EMode='Elastic')
-                # rebin the absorption correction to match the binning of the inputs if in histogram mode
-                # EventWorkspace will compare the wavelength of each individual event
-                absWksp = self.absorption
-                if mtd[chunkname].id() != 'EventWorkspace':
-                    absWksp = '__absWkspRebinned'
-                    RebinToWorkspace(WorkspaceToRebin=self.absorption, WorkspaceToMatch=chunkname, OutputWorkspace=absWksp)
-                Divide(LHSWorkspace=chunkname, RHSWorkspace=absWksp, OutputWorkspace=chunkname,
-                       startProgress=prog_start, endProgress=prog_start+prog_per_chunk_step)
-                if absWksp != self.absorption:  # clean up
-                    DeleteWorkspace(Workspace=absWksp)
-                ConvertUnits(InputWorkspace=chunkname, OutputWorkspace=chunkname,
-                             Target='TOF', EMode='Elastic')
-            prog_start += prog_per_chunk_step
-
-            if self.kwargs is None:
-                raise RuntimeError('Somehow arguments for "AlignAndFocusPowder" aren\'t set')
-
-            AlignAndFocusPowder(InputWorkspace=chunkname,
-                                OutputWorkspace=chunkname, UnfocussedWorkspace=unfocusname_chunk,
-                                startProgress=prog_start, endProgress=prog_start+2.*prog_per_chunk_step,
-                                **self.kwargs)
-            prog_start += 2. * prog_per_chunk_step  # AlignAndFocusPowder counts for two steps
+            self.__focusChunk(filename, chunkname, unfocusname_chunk, j, len(chunks), prog_start, prog_per_chunk_step)
 
             self.__accumulate(chunkname, wkspname, unfocusname_chunk, unfocusname, not haveAccumulationForFile,
                               removelogs=canSkipLoadingLogs)
 
             haveAccumulationForFile = True
+
+            # the remaining chunks can be processed at the same time once the first has been accumulated into the
+            # file's workspace, which supplies their logs
+            if maxConcurrentChunks > 1 and j + 1 < len(chunks):
+                canSkipLoadingLogs = self.__loaderName == 'LoadEventNexus' and self.filterBadPulses <= 0.
+                self.__processChunksConcurrently(filename, chunks, j + 1, wkspname, unfocusname, file_prog_start,
+                                                 numSteps, prog_per_chunk_step, canSkipLoadingLogs,
+                                                 maxConcurrentChunks)
+                break
         # end of inner loop
         if not mtd.doesExist(wkspname):
             raise RuntimeError('Failed to process any data from file "{}"'.format(filename))
@@ -451,6 +417,142 @@ class AlignAndFocusPowderFromFiles(DistributedDataProcessorAlgorithm):
 
         return wkspname, unfocusname
 
+    def __getMaxConcurrentChunks(self, numChunks):
+        '''The number of chunks to process at the same time, limited so that the loaded chunks fit in memory'''
+        maxConcurrentChunks = self.getProperty('MaxConcurrentChunks').value
+        if maxConcurrentChunks == 1 or numChunks <= 1:
+            return 1
+        if maxConcurrentChunks == 0:
+            maxConcurrentChunks = os.cpu_count() or 1
+        # a file is only split into chunks when MaxChunkSize is set, and each loaded chunk is at most that size
+        availableGiB = MemoryStats().availMem() / 1024. / 1024.
+        chunksInMemory = max(1, int(availableGiB / self.chunkSize))
+        return min(maxConcurrentChunks, chunksInMemory, numChunks)
+
+    def __runChild(self, name, startProgress=None, endProgress=None, **kwargs):
+        '''Run a child algorithm that stores its output in the ADS. Unlike the simpleapi functions this also
+        creates a child algorithm when called from the threads that process chunks.'''
+        if startProgress is None or endProgress is None:
+            alg = self.createChildAlgorithm(name)
+        else:
+            alg = self.createChildAlgorithm(name, startProgress=startProgress, endProgress=endProgress)
+        alg.setAlwaysStoreInADS(True)
+        alg.setRethrows(True)
+        for key, value in kwargs.items():
+            if isinstance(value, str):
+                alg.setPropertyValue(key, value)
+            else:
+                alg.setProperty(key, value)
+        alg.execute()
+        return alg
+
+    def __loadChunk(self, filename, chunk, chunkname, wkspname, skipLoadingLogs, progstart, progstop):
+        # load a chunk - this is a bit crazy long because we need to get an output property from `Load` when it
+        # is run and the algorithm history doesn't exist until the parent algorithm (this) has finished
+        loader = self.__createLoader(filename, chunkname, skipLoadingLogs=skipLoadingLogs,
+                                     progstart=progstart, progstop=progstop, **chunk)
+        loader.execute()
+
+        # copy the necessary logs onto the workspace
+        if skipLoadingLogs:
+            self.__runChild('CopyLogs', InputWorkspace=wkspname, OutputWorkspace=chunkname, MergeStrategy='WipeExisting')
+            # re-load instrument so detector positions that depend on logs get initialized
+            try:
+                self.__runChild('LoadIDFFromNexus', Workspace=chunkname, Filename=filename, InstrumentParentPath='/entry')
+            except RuntimeError as e:
+                self.log().warning('Reloading instrument using "LoadIDFFromNexus" failed: {}'.format(e))
+        return loader
+
+    def __focusChunk(self, filename, chunkname, unfocusname_chunk, chunkIndex, numChunks, prog_start,
+                     prog_per_chunk_step):
+        '''Filter, correct for absorption, then align and focus a loaded chunk'''
+        if self.filterBadPulses > 0.:
+            self.__runChild('FilterBadPulses', prog_start, prog_start + prog_per_chunk_step,
+                            InputWorkspace=chunkname, OutputWorkspace=chunkname, LowerCutoff=self.filterBadPulses)
+            if mtd[chunkname].getNumberEvents() == 0:
+                msg = 'FilterBadPulses removed all events from '
+                if numChunks == 1:
+                    raise RuntimeError(msg + filename)
+                else:
+                    raise RuntimeError(msg + 'chunk {} of {} in {}'.format(chunkIndex, numChunks, filename))
+
+        prog_start += prog_per_chunk_step
+
+        # absorption correction workspace
+        if self.absorption is not None and len(str(self.absorption)) > 0:
+            self.__runChild('ConvertUnits', InputWorkspace=chunkname, OutputWorkspace=chunkname,
+                            Target='Wavelength', EMode='Elastic')
+            # rebin the absorption correction to match the binning of the inputs if in histogram mode
+            # EventWorkspace will compare the wavelength of each individual event
+            absWksp = self.absorption
+            if mtd[chunkname].id() != 'EventWorkspace':
+                absWksp = '__absWkspRebinned_{}'.format(chunkname)
+                self.__runChild('RebinToWorkspace', WorkspaceToRebin=self.absorption, WorkspaceToMatch=chunkname,
+                                OutputWorkspace=absWksp)
+            self.__runChild('Divide', prog_start, prog_start + prog_per_chunk_step,
+                            LHSWorkspace=chunkname, RHSWorkspace=absWksp, OutputWorkspace=chunkname)
+            if absWksp != self.absorption:  # clean up
+                self.__runChild('DeleteWorkspace', Workspace=absWksp)
+            self.__runChild('ConvertUnits', InputWorkspace=chunkname, OutputWorkspace=chunkname,
+                            Target='TOF', EMode='Elastic')
+        prog_start += prog_per_chunk_step
+
+        if self.kwargs is None:
+            raise RuntimeError('Somehow arguments for "AlignAndFocusPowder" aren\'t set')
+
+        # AlignAndFocusPowder counts for two steps
+        self.__runChild('AlignAndFocusPowder', prog_start, prog_start + 2. * prog_per_chunk_step,
+                        InputWorkspace=chunkname, OutputWorkspace=chunkname, UnfocussedWorkspace=unfocusname_chunk,
+                        **self.kwargs)
+
+    def __processChunksConcurrently(self, filename, chunks, firstChunk, wkspname, unfocusname, file_prog_start,
+                                    numSteps, prog_per_chunk_step, skipLoadingLogs, maxConcurrentChunks):
+        '''Focus the chunks from firstChunk onwards on maxConcurrentChunks threads. The chunks are loaded one at a
+        time on this thread, as reading NeXus files from several threads is not safe, while the chunks loaded
+        before are focused. The focused chunks are summed in a reduction tree as they finish, then added to the
+        file's workspace.'''
+        # each partial sum is (level, name, unfocused name) and holds 2**level chunks
+        partialSums = []
+
+        def accumulateFocused(future, chunkname, unfocusname_chunk):
+            future.result()  # wait for the chunk to be focused
+            level = 0
+            while partialSums and partialSums[-1][0] == level:
+                _, sumname, sumunfocusname = partialSums.pop()
+                self.__accumulate(chunkname, sumname, unfocusname_chunk, sumunfocusname, False,
+                                  removelogs=skipLoadingLogs)
+                chunkname, unfocusname_chunk = sumname, sumunfocusname
+                level += 1
+            partialSums.append((level, chunkname, unfocusname_chunk))
+
+        with ThreadPoolExecutor(max_workers=maxConcurrentChunks) as executor:
+            pending = deque()
+            for j in range(firstChunk, len(chunks)):
+                # wait for a chunk to be focused before loading another, so no more than
+                # maxConcurrentChunks are in memory at a time
+                if len(pending) >= maxConcurrentChunks:
+                    accumulateFocused(*pending.popleft())
+
+                prog_start = file_prog_start + float(j) * float(numSteps - 1) * prog_per_chunk_step
+                chunkname = '{}_c{:d}'.format(wkspname, j)
+                unfocusname_chunk = '{}_c{:d}'.format(unfocusname, j) if unfocusname else ''
+                self.__loadChunk(filename, chunks[j], chunkname, wkspname, skipLoadingLogs,
+                                 prog_start, prog_start + prog_per_chunk_step)
+                if self.__loaderName == 'LoadEventNexus' and mtd[chunkname].getNumberEvents() == 0:
+                    self.log().notice('Chunk {} of {} contained no events. Skipping to next chunk.'.format(j+1, len(chunks)))
+                    self.__runChild('DeleteWorkspace', Workspace=chunkname)
+                    continue
+
+                future = executor.submit(self.__focusChunk, filename, chunkname, unfocusname_chunk, j, len(chunks),
+                                         prog_start + prog_per_chunk_step, prog_per_chunk_step)
+                pending.append((future, chunkname, unfocusname_chunk))
+
+            while pending:
+                accumulateFocused(*pending.popleft())
+
+        for _, chunkname, unfocusname_chunk in reversed(partialSums):
+            self.__accumulate(chunkname, wkspname, unfocusname_chunk, unfocusname, False, removelogs=skipLoadingLogs)
+
     def __compressEvents(self, wkspname):
         if self.kwargs['PreserveEvents'] and self.kwargs['CompressTolerance'] > 0.:
             CompressEvents(InputWorkspace=wkspname, OutputWorkspace=wkspname,
@@ -12,6 +12,9 @@ from mantid.api import (PythonAlgorithm, AlgorithmFactory, PropertyMode, MatrixW
                         WorkspaceGroupProperty, InstrumentValidator, Progress)
 from mantid.kernel import (StringListValidator, IntBoundedValidator, FloatBoundedValidator, Direction, logger)
 
+# The largest number of (angle, wavelength, integration point) values evaluated at once
+MAX_INTEGRATION_POINTS = 2**22
+
 
 def set_material_density(set_material_alg, density_type, density, number_density_unit):
     if density_type == 'Mass Density':
@@ -241,20 +244,12 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
         self._get_angles()
         self._transmission()
 
-        dataA1 = []
-        dataA2 = []
-        dataA3 = []
-        dataA4 = []
-
         data_prog = Progress(self, start=0.1, end=0.85, nreports=len(self._angles))
-        for angle in self._angles:
-            (A1, A2, A3, A4) = self._cyl_abs(angle)
-            logger.information('Angle : %f * successful' % angle)
-            data_prog.report('Appending data for angle %f' % angle)
-            dataA1 = np.append(dataA1, A1)
-            dataA2 = np.append(dataA2, A2)
-            dataA3 = np.append(dataA3, A3)
-            dataA4 = np.append(dataA4, A4)
+        (A1, A2, A3, A4) = self._cyl_abs(self._angles, data_prog)
+        dataA1 = A1.ravel()
+        dataA2 = A2.ravel()
+        dataA3 = A3.ravel()
+        dataA4 = A4.ravel()
 
         dataX = self._waves * len(self._angles)
 
@@ -589,7 +584,7 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
 
 #------------------------------------------------------------------------------
 
-    def _cyl_abs(self, angle):
+    def _cyl_abs(self, angles, progress):
         #  Parameters :
         #  self._step_size - step size
         #  self._beam - beam parameters
@@ -598,185 +593,188 @@ class CylinderPaalmanPingsCorrection(PythonAlgorithm):
         #  density - list of densities (for each annulus)
         #  sigs - list of scattering cross-sections (for each annulus)
         #  siga - list of absorption cross-sections (for each annulus)
-        #  angle - list of angles
+        #  angles - list of angles
         #  wavelas - elastic wavelength
         #  waves - list of wavelengths
+        #  progress - reports the angles done
         #  Output parameters :  A1 - Ass ; A2 - Assc ; A3 - Acsc ; A4 - Acc
+        #  each an array of shape (number of angles, number of wavelengths)
 
-        amu_scat = np.zeros(self._number_can)
         amu_scat = self._density*self._sig_s
-        sig_abs = np.zeros(self._number_can)
         sig_abs = self._density*self._sig_a
-        amu_tot_i = np.zeros(self._number_can)
-        amu_tot_s = np.zeros(self._number_can)
-
-        theta = angle*math.pi/180.
-        A1 = []
-        A2 = []
-        A3 = []
-        A4 = []
-        #loop over wavelengths
-        for wave in self._waves:
-            #loop over annuli
-            if self._emode == 'Elastic':
-                amu_tot_i = amu_scat + sig_abs*self._elastic/1.7979
-                amu_tot_s = amu_scat + sig_abs*self._elastic/1.7979
-            elif self._emode == 'Direct':
-                amu_tot_i = amu_scat + sig_abs*self._fixed/1.7979
-                amu_tot_s = amu_scat + sig_abs*wave/1.7979
-            elif self._emode == 'Indirect':
-                amu_tot_i = amu_scat + sig_abs*wave/1.7979
-                amu_tot_s = amu_scat + sig_abs*self._fixed/1.7979
-            elif self._emode == 'Efixed':
-                amu_tot_i = amu_scat + sig_abs*self._fixed/1.7979
-                amu_tot_s = amu_scat + sig_abs*self._fixed/1.7979
-            (Ass, Assc, Acsc, Acc) = self._acyl(theta, amu_scat, amu_tot_i, amu_tot_s)
-            A1.append(Ass)
-            A2.append(Assc)
-            A3.append(Acsc)
-            A4.append(Acc)
-        return A1, A2, A3, A4
+
+        # wavelengths of the incident and scattered neutrons
+        waves = np.array(self._waves, dtype=float)
+        if self._emode == 'Elastic':
+            waves_i = np.full_like(waves, self._elastic)
+            waves_s = waves_i
+        elif self._emode == 'Direct':
+            waves_i = np.full_like(waves, self._fixed)
+            waves_s = waves
+        elif self._emode == 'Indirect':
+            waves_i = waves
+            waves_s = np.full_like(waves, self._fixed)
+        else:
+            waves_i = np.full_like(waves, self._fixed)
+            waves_s = waves_i
+        # attenuation coefficients of shape (number of wavelengths, number of annuli)
+        amu_tot_i = amu_scat + sig_abs*waves_i[:, np.newaxis]/1.7979
+        amu_tot_s = amu_scat + sig_abs*waves_s[:, np.newaxis]/1.7979
+
+        # evaluate the integrals for chunks of angles to bound the memory used
+        number_points = max(len(self._ring_points(a, radius_1, radius_2, ms)[1])
+                            for _, _, radius_1, radius_2, ms in self._annuli() for a in (self._beam[1], -self._beam[1]))
+        chunk_size = max(1, MAX_INTEGRATION_POINTS // max(1, len(waves)*number_points))
+        angles = np.array(angles, dtype=float)
+        results = []
+        for start in range(0, len(angles), chunk_size):
+            chunk = angles[start:start + chunk_size]
+            results.append(self._acyl(chunk*math.pi/180., amu_scat, amu_tot_i, amu_tot_s))
+            progress.reportIncrement(len(chunk), 'Calculated corrections up to angle %f' % chunk[-1])
+        return tuple(np.concatenate([result[index] for result in results]) for index in range(4))
+
+#------------------------------------------------------------------------------
+
+    def _annuli(self):
+        """
+        The annuli to integrate over, with the region for scattering, the region for absorption,
+        the inner and outer radii and the number of radial steps of each
+        """
+        nan = self._number_can
+        if nan < 2:
+            return [(0, 0, self._radii[0], self._radii[1], self._ms)]
+        annuli = []
+        for i in range(0, nan):
+            radius_1 = self._radii[i]
+            radius_2 = self._radii[i+1]
+#
+#  No. STEPS ARE CHOSEN SO THAT STEP WIDTH IS THE SAME FOR ALL ANNULI
+#
+            ms = int(self._ms*(radius_2 - radius_1)/(self._radii[1] - self._radii[0]))
+            if ms < 1:
+                ms = 1
+            annuli.append((i, 0 if i < nan - 1 else 1, radius_1, radius_2, ms))
+        return annuli
 
 #------------------------------------------------------------------------------
 
-    def _acyl(self, theta, amu_scat, amu_tot_i, amu_tot_s):
+    def _acyl(self, thetas, amu_scat, amu_tot_i, amu_tot_s):
         A = self._beam[1]
         Area_s = 0.0
         Ass = 0.0
         Acc = 0.0
         Acsc = 0.0
         Assc = 0.0
-        nan = self._number_can
+        annuli = self._annuli()
         if self._number_can < 2:
-#
-#  No. STEPS ARE CHOSEN SO THAT STEP WIDTH IS THE SAME FOR ALL ANNULI
-#
-            AAAA, BBBA, Area_A = self._sum_rom(0, 0, A, self._radii[0], self._radii[1], self._ms,
-                                               theta, amu_scat, amu_tot_i, amu_tot_s)
-            AAAB, BBBB, Area_B = self._sum_rom(0, 0, -A, self._radii[0], self._radii[1], self._ms,
-                                               theta, amu_scat, amu_tot_i, amu_tot_s)
+            n_scat, n_abs, radius_1, radius_2, ms = annuli[0]
+            AAAA, BBBA, Area_A = self._sum_rom(n_scat, n_abs, A, radius_1, radius_2, ms,
+                                               thetas, amu_scat, amu_tot_i, amu_tot_s)
+            AAAB, BBBB, Area_B = self._sum_rom(n_scat, n_abs, -A, radius_1, radius_2, ms,
+                                               thetas, amu_scat, amu_tot_i, amu_tot_s)
             Area_s += Area_A + Area_B
             Ass += AAAA + AAAB
             Ass /= Area_s
-        else:
-            for i in range(0, self._number_can -1):
-                radius_1 = self._radii[i]
-                radius_2 = self._radii[i+1]
-#
-#  No. STEPS ARE CHOSEN SO THAT STEP WIDTH IS THE SAME FOR ALL ANNULI
-#
-                ms = int(self._ms*(radius_2 - radius_1)/(self._radii[1] - self._radii[0]))
-                if ms < 1:
-                    ms = 1
-                AAAA, BBBA, Area_A = self._sum_rom(i, 0, A, radius_1, radius_2,
-                                                   ms, theta, amu_scat, amu_tot_i, amu_tot_s)
-                AAAB, BBBB, Area_B = self._sum_rom(i, 0, -A, radius_1, radius_2,
-                                                   ms, theta, amu_scat, amu_tot_i, amu_tot_s)
-                Area_s += Area_A + Area_B
-                Ass += AAAA + AAAB
-                Assc += BBBA + BBBB
-            Ass = Ass/Area_s
-            Assc = Assc/Area_s
-            radius_1 = self._radii[nan -1]
-            radius_2 = self._radii[nan]
-            ms = int(self._ms*(radius_2 - radius_1)/(self._radii[1] - self._radii[0]))
-            if ms < 1:
-                ms = 1
-            AAAA, BBBA, Area_A = self._sum_rom(nan-1, 1, A, radius_1, radius_2,
-                                               ms, theta, amu_scat, amu_tot_i, amu_tot_s)
-            AAAB, BBBB, Area_B = self._sum_rom(nan-1, 1, -A, radius_1, radius_2,
-                                               ms, theta, amu_scat, amu_tot_i, amu_tot_s)
-            Area_C = Area_A + Area_B
-            Acsc = (AAAA + AAAB)/Area_C
-            Acc = (BBBA + BBBB)/Area_C
+            shape = Ass.shape
+            return Ass, np.zeros(shape), np.zeros(shape), np.zeros(shape)
+
+        for n_scat, n_abs, radius_1, radius_2, ms in annuli[:-1]:
+            AAAA, BBBA, Area_A = self._sum_rom(n_scat, n_abs, A, radius_1, radius_2,
+                                               ms, thetas, amu_scat, amu_tot_i, amu_tot_s)
+            AAAB, BBBB, Area_B = self._sum_rom(n_scat, n_abs, -A, radius_1, radius_2,
+                                               ms, thetas, amu_scat, amu_tot_i, amu_tot_s)
+            Area_s += Area_A + Area_B
+            Ass += AAAA + AAAB
+            Assc += BBBA + BBBB
+        Ass = Ass/Area_s
+        Assc = Assc/Area_s
+        n_scat, n_abs, radius_1, radius_2, ms = annuli[-1]
+        AAAA, BBBA, Area_A = self._sum_rom(n_scat, n_abs, A, radius_1, radius_2,
+                                           ms, thetas, amu_scat, amu_tot_i, amu_tot_s)
+        AAAB, BBBB, Area_B = self._sum_rom(n_scat, n_abs, -A, radius_1, radius_2,
+                                           ms, thetas, amu_scat, amu_tot_i, amu_tot_s)
+        Area_C = Area_A + Area_B
+        Acsc = (AAAA + AAAB)/Area_C
+        Acc = (BBBA + BBBB)/Area_C
         return Ass, Assc, Acsc, Acc
 
 #------------------------------------------------------------------------------
 
-    def _sum_rom(self, n_scat, n_abs, a, r1, r2, ms, theta, amu_scat, amu_tot_i, amu_tot_s):
-        #n_scat is region for scattering
-        #n_abs is region for absorption
-        nan = self._number_can
+    def _ring_points(self, a, r1, r2, ms):
+        """
+        Find the integration points of an annulus which are in the beam. The points only depend
+        on the geometry, so they are shared by all the angles and wavelengths.
+        Only the last radial step of the annulus contributes to the integrals.
+        @return The radius of the points, an array of their omega values and their area element
+        """
         omega_add = 0.
         if a < 0.:
             omega_add = math.pi
-        AAA = 0.
-        BBB = 0.
-        Area = 0.
-        theta_deg = math.pi - theta
-        num = ms
         r_step = (r2 - r1)/ms
         r_add = -0.5*r_step + r1
+        r = ms*r_step + r_add
+        number_omega = int(math.pi*r/r_step)
+        omega_ster = math.pi/number_omega
+        omega_deg = -0.5*omega_ster + omega_add
+
+        omegas = []
+        I = 1
+        for _ in range(1, number_omega +1):
+            omega = I*omega_ster + omega_deg
+            if abs(r*math.sin(omega)) <= a:
+                omegas.append(omega)
+                I += 1
+            else:
+                I = number_omega -I +2
+        return r, np.array(omegas), r*r_step*omega_ster
+
+#------------------------------------------------------------------------------
 
-# start loop over M
-        for M in range(1, num+1):
-            r = M*r_step + r_add
-            number_omega = int(math.pi*r/r_step)
-            omega_ster = math.pi/number_omega
-            omega_deg = -0.5*omega_ster + omega_add
-            Area_y = r*r_step*omega_ster*amu_scat[n_scat]
-            sum_1 = 0.
-            sum_2 = 0.
-            I = 1
-            Area_sum = 0.
-            for _ in range(1, number_omega +1):
-                omega = I*omega_ster + omega_deg
-                distance = r*math.sin(omega)
-
-                skip = True
-                if abs(distance) <= a:
+    def _sum_rom(self, n_scat, n_abs, a, r1, r2, ms, thetas, amu_scat, amu_tot_i, amu_tot_s):
+        #n_scat is region for scattering
+        #n_abs is region for absorption
+        #the sums are evaluated for all the (angle, wavelength, point) values at once
+        nan = self._number_can
+        r, omegas, area_element = self._ring_points(a, r1, r2, ms)
+        Area_y = area_element*amu_scat[n_scat]
+        shape = (len(thetas), amu_tot_i.shape[0])
+        if omegas.size == 0:
+            return np.zeros(shape), np.zeros(shape), 0.
 #
 # CALCULATE DISTANCE INCIDENT NEUTRON PASSES THROUGH EACH ANNULUS
-                    LIS = []
-                    for j in range(0, nan):
-                        LIST = self._distance(r, self._radii[j], omega)
-                        LISN = self._distance(r, self._radii[j+1], omega)
-                        LIS.append(LISN - LIST)
+        LIS = [self._distance(r, self._radii[j+1], omegas) - self._distance(r, self._radii[j], omegas)
+               for j in range(0, nan)]
 #
 # CALCULATE DISTANCE SCATTERED NEUTRON PASSES THROUGH EACH ANNULUS
-                    O = omega + theta_deg
-                    LSS = []
-                    for j in range(0, nan):
-                        LSST = self._distance(r, self._radii[j], O)
-                        LSSN = self._distance(r, self._radii[j+1], O)
-                        LSS.append(LSSN - LSST)
+        O = omegas[np.newaxis, :] + (math.pi - thetas)[:, np.newaxis]
+        LSS = [self._distance(r, self._radii[j+1], O) - self._distance(r, self._radii[j], O)
+               for j in range(0, nan)]
 #
 # CALCULATE ABSORPTION FOR PATH THROUGH ALL ANNULI,AND THROUGH INNER ANNULI
-                    path = np.zeros(3)
-#	split into input (I) and scattered (S) paths
-                    path[0] += amu_tot_i[0]*LIS[0] + amu_tot_s[0]*LSS[0]
-                    if nan == 2:
-                        path[2] += amu_tot_i[1]*LIS[1] + amu_tot_s[1]*LSS[1]
-                        path[1] = path[0] + path[2]
-                    sum_1 += math.exp(-path[n_abs])
-                    sum_2 += math.exp(-path[n_abs +1])
-                    Area_sum += 1.0
-                    skip = False
-
-                if skip:
-                    I = number_omega -I +2
-                else:
-                    I += 1
-        AAA += sum_1*Area_y
-        BBB += sum_2*Area_y
-        Area += Area_sum*Area_y
-        return AAA, BBB, Area
+#	split into input (I) and scattered (S) paths, of shape (angles, wavelengths, points)
+        path = [np.zeros(shape + (omegas.size,))]*3
+        path[0] = amu_tot_i[np.newaxis, :, 0, np.newaxis]*LIS[0] + amu_tot_s[np.newaxis, :, 0, np.newaxis]*LSS[0][:, np.newaxis, :]
+        if nan == 2:
+            path[2] = amu_tot_i[np.newaxis, :, 1, np.newaxis]*LIS[1] + amu_tot_s[np.newaxis, :, 1, np.newaxis]*LSS[1][:, np.newaxis, :]
+            path[1] = path[0] + path[2]
+        sum_1 = np.exp(-path[n_abs]).sum(axis=2)
+        sum_2 = np.exp(-path[n_abs +1]).sum(axis=2)
+        return sum_1*Area_y, sum_2*Area_y, omegas.size*Area_y
 
 #------------------------------------------------------------------------------
 
     def _distance(self, r1, radius, omega):
+        # omega is an array of angles
         r = r1
-        distance = 0.
-        b = r*math.sin(omega)
-        if abs(b) < radius:
-            t = r*math.cos(omega)
-            c = radius*radius -b*b
-            d = math.sqrt(c)
-            if r <= radius:
-                distance = t + d
-            else:
-                distance = d*(1.0 + math.copysign(1.0, t))
-        return distance
+        b = r*np.sin(omega)
+        inside = np.abs(b) < radius
+        t = r*np.cos(omega)
+        d = np.sqrt(np.where(inside, radius*radius -b*b, 0.))
+        if r <= radius:
+            distance = t + d
+        else:
+            distance = d*(1.0 + np.copysign(1.0, t))
+        return np.where(inside, distance, 0.)
 
 #------------------------------------------------------------------------------
 
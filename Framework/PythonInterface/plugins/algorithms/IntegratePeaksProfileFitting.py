@@ -12,7 +12,11 @@ fitting for integrating peaks.
 from mantid.kernel import *
 from mantid.api import *
 from mantid.simpleapi import *
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import itertools
 import numpy as np
+import os
 
 
 class IntegratePeaksProfileFitting(PythonAlgorithm):
@@ -64,6 +68,9 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
 
         self.declareProperty("DQMax", defaultValue=0.15, doc="Largest total side length (in Angstrom) to consider for profile fitting.")
         self.declareProperty("PeakNumber", defaultValue=-1,  doc="Which Peak to fit.  Leave negative for all.")
+        self.declareProperty("MaxConcurrentPeaks", defaultValue=1, validator=IntBoundedValidator(lower=0),
+                             doc="Maximum number of peaks to fit at the same time. 0 uses one per core. Peaks used to "
+                                 "build the strong peak profiles are always fit one at a time.")
 
     def initializeStrongPeakSettings(self, strongPeaksParamsFile, peaks_ws, sampleRun, forceCutoff, edgeCutoff, numDetRows,
                                      numDetCols):
@@ -166,8 +173,6 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
 
     def PyExec(self):
         import ICCFitTools as ICCFT
-        import BVGFitTools as BVGFT
-        from scipy.ndimage.filters import convolve
         MDdata = self.getProperty('InputWorkspace').value
         peaks_ws = self.getProperty('PeaksWorkspace').value
         fracStop = self.getProperty('FracStop').value
@@ -185,7 +190,6 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
         q_frame='lab'
         mtd['MDdata'] = MDdata
         zBG = 1.96
-        neigh_length_m=3
         iccFitDict = ICCFT.parseConstraints(peaks_ws) #Contains constraints and guesses for ICC Fitting
         padeCoefficients = ICCFT.getModeratorCoefficients(padeFile)
 
@@ -235,101 +239,24 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
         peaks_ws_out = peaks_ws.clone()
         np.warnings.filterwarnings('ignore') # There can be a lot of warnings for bad solutions that get rejected.
         progress = Progress(self, 0.0, 1.0, len(peaksToFit))
-        sigX0Params, sigY0, sigP0Params = self.getBVGInitialGuesses(peaks_ws, strongPeakParams_ws)
-
-        for fitNumber, peakNumber in enumerate(peaksToFit):#range(peaks_ws.getNumberPeaks()):
-            peakNumber = int(peakNumber)
-            peak = peaks_ws_out.getPeak(peakNumber)
-            progress.report(' ')
-            if peak.getRunNumber() != MDdata.getExperimentInfo(0).getRunNumber():
-                logger.warning('Peak number %i has run number %i but MDWorkspace is from run number %i.  Skipping this peak.'%(
-                                           peakNumber, peak.getRunNumber(), MDdata.getExperimentInfo(0).getRunNumber()))
-                continue
-            try:
-                box = ICCFT.getBoxFracHKL(peak, peaks_ws, MDdata, UBMatrix, peakNumber,
-                                          dQ, fracHKL=0.5, dQPixel=dQPixel, q_frame=q_frame)
-                if ~needsForcedProfile[peakNumber]:
-                    strongPeakParamsToSend = None
-                else:
-                    strongPeakParamsToSend = strongPeakParams
-
-                # Will allow forced weak and edge peaks to be fit using a neighboring peak profile
-                Y3D, goodIDX, pp_lambda, params = BVGFT.get3DPeak(
-                    peak, peakNumber, peaks_ws, box, padeCoefficients, qMask, nTheta=nTheta, nPhi=nPhi,
-                    plotResults=False, zBG=zBG, fracBoxToHistogram=1.0,bgPolyOrder=1,
-                    strongPeakParams=strongPeakParamsToSend, q_frame=q_frame, mindtBinWidth=mindtBinWidth,
-                    maxdtBinWidth=maxdtBinWidth, pplmin_frac=pplmin_frac, pplmax_frac=pplmax_frac,
-                    forceCutoff=forceCutoff, edgeCutoff=edgeCutoff, peakMaskSize=peakMaskSize, iccFitDict=iccFitDict,
-                    sigX0Params=sigX0Params, sigY0=sigY0, sigP0Params=sigP0Params, fitPenalty=1.e7)
-                # First we get the peak intensity
-                peakIDX = Y3D/Y3D.max() > fracStop
-                intensity = np.sum(Y3D[peakIDX])
-
-                # Now the number of background counts under the peak assuming a constant bg across the box
-                n_events = box.getNumEventsArray()
-                convBox = 1.0*np.ones([neigh_length_m, neigh_length_m,neigh_length_m]) / neigh_length_m**3
-                conv_n_events = convolve(n_events,convBox)
-                bgIDX = np.logical_and.reduce(np.array([~goodIDX, qMask, conv_n_events>0]))
-                bgEvents = np.mean(n_events[bgIDX])*np.sum(peakIDX)
-
-                # Now we consider the variation of the fit.  These are done as three independent fits.  So we need to consider
-                # the variance within our fit sig^2 = sum(N*(yFit-yData)) / sum(N) and scale by the number of parameters that go into
-                # the fit.  In total: 10 (removing scale variables)
-                w_events = n_events.copy()
-                w_events[w_events==0] = 1
-                varFit = np.average((n_events[peakIDX]-Y3D[peakIDX])*(n_events[peakIDX]-Y3D[peakIDX]), weights=(w_events[peakIDX]))
-
-                sigma = np.sqrt(intensity + bgEvents + varFit)
-
-                compStr = 'peak {:d}; original: {:4.2f} +- {:4.2f};  new: {:4.2f} +- {:4.2f}'.format(peakNumber,
-                                                                                                     peak.getIntensity(),
-                                                                                                     peak.getSigmaIntensity(),
-                                                                                                     intensity, sigma)
-                logger.information(compStr)
-
-                # Save the results
-                params['peakNumber'] = peakNumber
-                params['Intens3d'] = intensity
-                params['SigInt3d'] = sigma
-                params['newQ'] = V3D(params['newQ'][0],params['newQ'][1],params['newQ'][2])
-                params_ws.addRow(params)
-                peak.setIntensity(intensity)
-                peak.setSigmaIntensity(sigma)
-
-                if generateStrongPeakParams and ~needsForcedProfile[peakNumber]:
-                    qPeak = peak.getQLabFrame()
-                    theta = np.arctan2(qPeak[2], np.hypot(qPeak[0],qPeak[1])) #2theta
-                    try:
-                        p = mtd['__fitSigX0_Parameters'].column(1)[:-1]
-                        tol = 0.2 #We should have a good idea now - only allow 20% variation
-                    except:
-                        p = peaks_ws.getInstrument().getStringParameter("sigSC0Params")
-                        p = np.array(str(p).strip('[]\'').split(),dtype=float)
-                        tol = 5.0 #High tolerance since we don't know what the answer will be
-                    predSigX = BVGFT.coshPeakWidthModel(theta, p[0],p[1],p[2],p[3])
-
-                    if np.abs((params['SigX'] - predSigX)/1./predSigX) < tol:
-                        strongPeakParams[fitNumber, 0] = np.arctan2(qPeak[1], qPeak[0]) # phi
-                        strongPeakParams[fitNumber, 1] = np.arctan2(qPeak[2], np.hypot(qPeak[0],qPeak[1])) #theta
-                        strongPeakParams[fitNumber, 2] = params['scale3d']
-                        strongPeakParams[fitNumber, 3] = params['MuTH']
-                        strongPeakParams[fitNumber, 4] = params['MuPH']
-                        strongPeakParams[fitNumber, 5] = params['SigX']
-                        strongPeakParams[fitNumber, 6] = params['SigY']
-                        strongPeakParams[fitNumber, 7] = params['SigP']
-                        strongPeakParams[fitNumber, 8] = peakNumber
-                        strongPeakParams_ws.addRow(strongPeakParams[fitNumber])
-                        sigX0Params, sigY0, sigP0Params = self.getBVGInitialGuesses(peaks_ws, strongPeakParams_ws)
-
-            except KeyboardInterrupt:
-                np.warnings.filterwarnings('default') # Re-enable on exit
-                raise
 
-            except:
-                #raise
-                logger.warning('Error fitting peak number ' + str(peakNumber))
-                peak.setIntensity(0.0)
-                peak.setSigmaIntensity(1.0)
+        # Settings shared by the fits of all of the peaks
+        self._peaks_ws = peaks_ws
+        self._params_ws = params_ws
+        self._fracStop = fracStop
+        self._qMask = qMask
+        self._generateStrongPeakParams = generateStrongPeakParams
+        self._needsForcedProfile = needsForcedProfile
+        self._strongPeakParams = strongPeakParams
+        self._strongPeakParams_ws = strongPeakParams_ws
+        self._get3DPeakArgs = dict(padeCoefficients=padeCoefficients, qMask=qMask, nTheta=nTheta, nPhi=nPhi,
+                                   plotResults=False, zBG=zBG, fracBoxToHistogram=1.0, bgPolyOrder=1, q_frame=q_frame,
+                                   mindtBinWidth=mindtBinWidth, maxdtBinWidth=maxdtBinWidth, pplmin_frac=pplmin_frac,
+                                   pplmax_frac=pplmax_frac, forceCutoff=forceCutoff, edgeCutoff=edgeCutoff,
+                                   peakMaskSize=peakMaskSize, iccFitDict=iccFitDict, fitPenalty=1.e7)
+        boxArgs = dict(UBMatrix=UBMatrix, dQ=dQ, fracHKL=0.5, dQPixel=dQPixel, q_frame=q_frame)
+
+        self._fitPeaks(peaks_ws_out, MDdata, peaksToFit, boxArgs, progress)
 
         # Cleanup
         for wsName in mtd.getObjectNames():
@@ -340,6 +267,164 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
         self.setProperty('OutputPeaksWorkspace', peaks_ws_out)
         self.setProperty('OutputParamsWorkspace', params_ws)
 
+    def _getMaxConcurrentPeaks(self, numPeaks):
+        maxConcurrentPeaks = self.getProperty('MaxConcurrentPeaks').value
+        if maxConcurrentPeaks == 0:
+            maxConcurrentPeaks = os.cpu_count() or 1
+        return max(1, min(maxConcurrentPeaks, numPeaks))
+
+    def _fitPeaks(self, peaks_ws_out, MDdata, peaksToFit, boxArgs, progress):
+        """
+        Fits the peaks in peaksToFit, saving the results into peaks_ws_out and the parameters workspace in the
+        order of peaksToFit.  The peaks used to build the strong peak profiles change the initial guesses for the
+        peaks after them, so they are fit one at a time while the other peaks can be fit at the same time.
+        """
+        import ICCFitTools as ICCFT
+        maxConcurrentPeaks = self._getMaxConcurrentPeaks(len(peaksToFit))
+        bvgInitialGuesses = self.getBVGInitialGuesses(self._peaks_ws, self._strongPeakParams_ws)
+        # Each thread fitting peaks uses its own names for the temporary workspaces
+        workerNumbers = itertools.count()
+        executor = ThreadPoolExecutor(max_workers=maxConcurrentPeaks,
+                                      initializer=lambda: ICCFT.setWorkspaceNamePrefix(
+                                          '__peakWorker{:d}_'.format(next(workerNumbers))))
+        # Peaks being fit on the executor, their results are saved in the order of peaksToFit
+        pendingFits = deque()
+        try:
+            for fitNumber, peakNumber in enumerate(peaksToFit):
+                peakNumber = int(peakNumber)
+                peak = peaks_ws_out.getPeak(peakNumber)
+                progress.report(' ')
+                if peak.getRunNumber() != MDdata.getExperimentInfo(0).getRunNumber():
+                    logger.warning('Peak number %i has run number %i but MDWorkspace is from run number %i.  Skipping this peak.'%(
+                                               peakNumber, peak.getRunNumber(), MDdata.getExperimentInfo(0).getRunNumber()))
+                    continue
+                fitNow = maxConcurrentPeaks == 1 or (self._generateStrongPeakParams and ~self._needsForcedProfile[peakNumber])
+                if fitNow:
+                    while pendingFits:
+                        self._savePendingFit(pendingFits)
+                try:
+                    box = ICCFT.getBoxFracHKL(peak, self._peaks_ws, MDdata, peakNumber=peakNumber, **boxArgs)
+                    if fitNow:
+                        results = self._fitPeak(peak, peakNumber, box, bvgInitialGuesses)
+                        if self._saveResults(fitNumber, peak, peakNumber, *results):
+                            bvgInitialGuesses = self.getBVGInitialGuesses(self._peaks_ws, self._strongPeakParams_ws)
+                    else:
+                        pendingFits.append((fitNumber, peak, peakNumber,
+                                            executor.submit(self._fitPeak, peak, peakNumber, box, bvgInitialGuesses)))
+                        # Limit the number of boxes held in memory
+                        if len(pendingFits) > 2 * maxConcurrentPeaks:
+                            self._savePendingFit(pendingFits)
+                except BaseException as exception:
+                    self._handleFailedFit(peak, peakNumber, exception)
+            while pendingFits:
+                self._savePendingFit(pendingFits)
+        finally:
+            for _, _, _, future in pendingFits:
+                future.cancel()
+            executor.shutdown()
+
+    def _savePendingFit(self, pendingFits):
+        fitNumber, peak, peakNumber, future = pendingFits.popleft()
+        try:
+            self._saveResults(fitNumber, peak, peakNumber, *future.result())
+        except BaseException as exception:
+            self._handleFailedFit(peak, peakNumber, exception)
+
+    def _fitPeak(self, peak, peakNumber, box, bvgInitialGuesses):
+        import BVGFitTools as BVGFT
+        from scipy.ndimage.filters import convolve
+        neigh_length_m = 3
+        sigX0Params, sigY0, sigP0Params = bvgInitialGuesses
+        # Will allow forced weak and edge peaks to be fit using a neighboring peak profile
+        if ~self._needsForcedProfile[peakNumber]:
+            strongPeakParamsToSend = None
+        else:
+            strongPeakParamsToSend = self._strongPeakParams
+        Y3D, goodIDX, pp_lambda, params = BVGFT.get3DPeak(
+            peak, peakNumber, self._peaks_ws, box, strongPeakParams=strongPeakParamsToSend,
+            sigX0Params=sigX0Params, sigY0=sigY0, sigP0Params=sigP0Params, **self._get3DPeakArgs)
+        # First we get the peak intensity
+        peakIDX = Y3D/Y3D.max() > self._fracStop
+        intensity = np.sum(Y3D[peakIDX])
+
+        # Now the number of background counts under the peak assuming a constant bg across the box
+        n_events = box.getNumEventsArray()
+        convBox = 1.0*np.ones([neigh_length_m, neigh_length_m,neigh_length_m]) / neigh_length_m**3
+        conv_n_events = convolve(n_events,convBox)
+        bgIDX = np.logical_and.reduce(np.array([~goodIDX, self._qMask, conv_n_events>0]))
+        bgEvents = np.mean(n_events[bgIDX])*np.sum(peakIDX)
+
+        # Now we consider the variation of the fit.  These are done as three independent fits.  So we need to consider
+        # the variance within our fit sig^2 = sum(N*(yFit-yData)) / sum(N) and scale by the number of parameters that go into
+        # the fit.  In total: 10 (removing scale variables)
+        w_events = n_events.copy()
+        w_events[w_events==0] = 1
+        varFit = np.average((n_events[peakIDX]-Y3D[peakIDX])*(n_events[peakIDX]-Y3D[peakIDX]), weights=(w_events[peakIDX]))
+
+        sigma = np.sqrt(intensity + bgEvents + varFit)
+        return params, intensity, sigma
+
+    def _saveResults(self, fitNumber, peak, peakNumber, params, intensity, sigma):
+        """
+        Saves the results of a fit to the peak and the parameters workspace.  Returns True if the fit was added to
+        the strong peak profiles.
+        """
+        compStr = 'peak {:d}; original: {:4.2f} +- {:4.2f};  new: {:4.2f} +- {:4.2f}'.format(peakNumber,
+                                                                                             peak.getIntensity(),
+                                                                                             peak.getSigmaIntensity(),
+                                                                                             intensity, sigma)
+        logger.information(compStr)
+
+        # Save the results
+        params['peakNumber'] = peakNumber
+        params['Intens3d'] = intensity
+        params['SigInt3d'] = sigma
+        params['newQ'] = V3D(params['newQ'][0],params['newQ'][1],params['newQ'][2])
+        self._params_ws.addRow(params)
+        peak.setIntensity(intensity)
+        peak.setSigmaIntensity(sigma)
+
+        if self._generateStrongPeakParams and ~self._needsForcedProfile[peakNumber]:
+            return self._addStrongPeakParams(fitNumber, peak, peakNumber, params)
+        return False
+
+    def _addStrongPeakParams(self, fitNumber, peak, peakNumber, params):
+        import BVGFitTools as BVGFT
+        strongPeakParams = self._strongPeakParams
+        qPeak = peak.getQLabFrame()
+        theta = np.arctan2(qPeak[2], np.hypot(qPeak[0],qPeak[1])) #2theta
+        try:
+            p = mtd['__fitSigX0_Parameters'].column(1)[:-1]
+            tol = 0.2 #We should have a good idea now - only allow 20% variation
+        except:
+            p = self._peaks_ws.getInstrument().getStringParameter("sigSC0Params")
+            p = np.array(str(p).strip('[]\'').split(),dtype=float)
+            tol = 5.0 #High tolerance since we don't know what the answer will be
+        predSigX = BVGFT.coshPeakWidthModel(theta, p[0],p[1],p[2],p[3])
+
+        if np.abs((params['SigX'] - predSigX)/1./predSigX) < tol:
+            strongPeakParams[fitNumber, 0] = np.arctan2(qPeak[1], qPeak[0]) # phi
+            strongPeakParams[fitNumber, 1] = np.arctan2(qPeak[2], np.hypot(qPeak[0],qPeak[1])) #theta
+            strongPeakParams[fitNumber, 2] = params['scale3d']
+            strongPeakParams[fitNumber, 3] = params['MuTH']
+            strongPeakParams[fitNumber, 4] = params['MuPH']
+            strongPeakParams[fitNumber, 5] = params['SigX']
+            strongPeakParams[fitNumber, 6] = params['SigY']
+            strongPeakParams[fitNumber, 7] = params['SigP']
+            strongPeakParams[fitNumber, 8] = peakNumber
+            self._strongPeakParams_ws.addRow(strongPeakParams[fitNumber])
+            return True
+        return False
+
+    @staticmethod
+    def _handleFailedFit(peak, peakNumber, exception):
+        if isinstance(exception, KeyboardInterrupt):
+            np.warnings.filterwarnings('default') # Re-enable on exit
+            raise exception
+        logger.warning('Error fitting peak number ' + str(peakNumber))
+        peak.setIntensity(0.0)
+        peak.setSigmaIntensity(1.0)
+
 
 # Register algorith with Mantid
 AlgorithmFactory.subscribe(IntegratePeaksProfileFitting)
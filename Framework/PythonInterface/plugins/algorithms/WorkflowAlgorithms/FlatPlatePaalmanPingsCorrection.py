@@ -240,15 +240,9 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
                                                    self._can_density,
                                                    self._can_number_density_unit)
 
-        # Holders for the corrected data
-        data_ass = []
-        data_assc = []
-        data_acsc = []
-        data_acc = []
-
         self._get_angles()
         num_angles = len(self._angles)
-        workflow_prog = Progress(self, start=0.2, end=0.8, nreports=num_angles * 2)
+        workflow_prog = Progress(self, start=0.2, end=0.8, nreports=2)
 
         # Check sample input
         sam_material = mtd[self._sample_ws_name].sample().getMaterial()
@@ -278,17 +272,15 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
                     "A can workspace was given but the can back thickness was not given. Continuing but no absorption for can back"
                     " will be computed.")
 
-        for angle_idx in range(num_angles):
-            workflow_prog.report('Running flat correction for angle %s' % angle_idx)
-            angle = self._angles[angle_idx]
-            (ass, assc, acsc, acc) = self._flat_abs(angle)
+        workflow_prog.report('Running flat correction for %d angles' % num_angles)
+        (ass, assc, acsc, acc) = self._flat_abs(self._angles)
+        logger.information('Angles 1 to %d successful' % num_angles)
 
-            logger.information('Angle %d: %f successful' % (angle_idx + 1, self._angles[angle_idx]))
-            workflow_prog.report('Appending data for angle %s' % angle_idx)
-            data_ass = np.append(data_ass, ass)
-            data_assc = np.append(data_assc, assc)
-            data_acsc = np.append(data_acsc, acsc)
-            data_acc = np.append(data_acc, acc)
+        workflow_prog.report('Appending data for all angles')
+        data_ass = ass.ravel()
+        data_assc = assc.ravel()
+        data_acsc = acsc.ravel()
+        data_acc = acc.ravel()
 
         log_prog = Progress(self, start=0.8, end=1.0, nreports=8)
 
@@ -554,7 +546,7 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
 
     # ------------------------------------------------------------------------------
 
-    def _flat_abs(self, angle):
+    def _flat_abs(self, angles):
         """
         FlatAbs - calculate flat plate absorption factors
 
@@ -567,7 +559,8 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
             Open-Source Implementation libabsco, and Why it Should be Used with Caution',
             http://apps.jcns.fz-juelich.de/doku/sc/_media/abs00.pdf
 
-        @return: A tuple containing the attenuations;
+        @param angles: The detector angles in degrees
+        @return: A tuple containing the attenuations, each of shape (number of angles, number of wavelengths);
             1) scattering and absorption in sample,
             2) scattering in sample and absorption in sample and container
             3) scattering in container and absorption in sample and container,
@@ -578,25 +571,24 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         # self._sample_angle = 0 means that the sample is perpendicular
         # to the incident beam
         alpha = (90.0 + self._sample_angle) * self.PICONV
-        theta = angle * self.PICONV
+        # The angles are a column, so that the attenuations broadcast over (angles, wavelengths)
+        theta = np.array(angles, dtype=float)[:, np.newaxis] * self.PICONV
         salpha = np.sin(alpha)
-        if theta > (alpha + np.pi):
-            stha = np.sin(abs(theta-alpha-np.pi))
-        else:
-            stha = np.sin(abs(theta-alpha))
-
-        nlam = len(self._wavelengths)
-
-        ass = np.ones(nlam)
-        assc = np.ones(nlam)
-        acsc = np.ones(nlam)
-        acc = np.ones(nlam)
 
         # Scattering in direction of slab --> calculation is not reliable
         # Default to 1 for everything
         # Tolerance is 0.001 rad ~ 0.06 deg
-        if abs(theta-alpha) < 0.001:
-            return ass, assc, acsc, acc
+        in_slab = np.abs(theta-alpha) < 0.001
+        stha = np.where(theta > (alpha + np.pi), np.sin(np.abs(theta-alpha-np.pi)), np.sin(np.abs(theta-alpha)))
+        # Avoid dividing by zero for the angles in the slab, which are overwritten anyway
+        stha = np.where(in_slab, 1.0, stha)
+        transmission = (theta < alpha) | (theta > (alpha + np.pi))
+
+        shape = (len(angles), len(self._wavelengths))
+        ass = np.ones(shape)
+        assc = np.ones(shape)
+        acsc = np.ones(shape)
+        acc = np.ones(shape)
 
         sample = mtd[self._sample_ws_name].sample()
         sam_material = sample.getMaterial()
@@ -604,22 +596,19 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         # List of wavelengths
         waveslengths = np.array(self._wavelengths)
 
-        sst = np.vectorize(self._self_shielding_transmission)
-        ssr = np.vectorize(self._self_shielding_reflection)
-
         ki_s, kf_s = 0, 0
         if self._has_sample_in:
-            ki_s, kf_s, ass = self._sample_cross_section_calc(sam_material, waveslengths, theta, alpha, stha, salpha, sst, ssr)
+            ki_s, kf_s, ass = self._sample_cross_section_calc(sam_material, waveslengths, transmission, stha, salpha)
 
         # Container --> Acc, Assc, Acsc
         if self._use_can:
-            ass, assc, acsc, acc = self._can_cross_section_calc(waveslengths, theta, alpha, stha, salpha, ki_s, kf_s, ass, acc, sst, ssr)
+            ass, assc, acsc, acc = self._can_cross_section_calc(waveslengths, transmission, stha, salpha, ki_s, kf_s, ass, acc)
 
-        return ass, assc, acsc, acc
+        return tuple(np.where(in_slab, 1.0, np.broadcast_to(attenuation, shape)) for attenuation in (ass, assc, acsc, acc))
 
     # ------------------------------------------------------------------------------
 
-    def _sample_cross_section_calc(self, sam_material, waves, theta, alpha, stha, salpha, sst, ssr):
+    def _sample_cross_section_calc(self, sam_material, waves, transmission, stha, salpha):
         # Sample cross section (value for each of the wavelengths and for E = Efixed)
         sample_x_section = (sam_material.totalScatterXSection()
                             + sam_material.absorbXSection() * waves / self.TABULATED_WAVELENGTH) * self._sample_density
@@ -638,18 +627,13 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
             ki_s, kf_s = self._calc_ki_kf(waves, self._sample_thickness, salpha, stha,
                                           sample_x_section, sample_x_section_efixed)
 
-        if theta < alpha or theta > (alpha + np.pi):
-            # transmission case
-            ass = sst(ki_s, kf_s)
-        else:
-            # reflection case
-            ass = ssr(ki_s, kf_s)
+        ass = np.where(transmission, self._self_shielding_transmission(ki_s, kf_s), self._self_shielding_reflection(ki_s, kf_s))
 
         return ki_s, kf_s, ass
 
     # ------------------------------------------------------------------------------
 
-    def _can_cross_section_calc(self, wavelengths, theta, alpha, stha, salpha, ki_s, kf_s, ass, acc, sst, ssr):
+    def _can_cross_section_calc(self, wavelengths, transmission, stha, salpha, ki_s, kf_s, ass, acc):
         can_sample = mtd[self._can_ws_name].sample()
         can_material = can_sample.getMaterial()
 
@@ -669,35 +653,31 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         if self._has_can_front_in:
             # Front container --> Acc1
             ki_c1, kf_c1, acc1 = self._can_thickness_calc(can_x_section, can_x_section_efixed, self._can_front_thickness, wavelengths,
-                                                          theta, alpha, stha, salpha, ssr, sst)
+                                                          transmission, stha, salpha)
         if self._has_can_back_in:
             # Back container --> Acc2
             ki_c2, kf_c2, acc2 = self._can_thickness_calc(can_x_section, can_x_section_efixed, self._can_back_thickness, wavelengths,
-                                                          theta, alpha, stha, salpha, ssr, sst)
+                                                          transmission, stha, salpha)
 
-        # Attenuation due to passage by other layers (sample or container)
-        if theta < alpha or theta > (alpha + np.pi):  # transmission case
-            assc, acsc, acc = self._container_transmission_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c2, ass)
-        else:  # reflection case
-            assc, acsc, acc = self._container_reflection_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c1, ass)
+        # Attenuation due to passage by other layers (sample or container),
+        # in the transmission case or the reflection case depending on the angle
+        transmitted = self._container_transmission_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c2, ass)
+        reflected = self._container_reflection_calc(acc, acc1, acc2, ki_s, kf_s, ki_c1, kf_c1, ass)
+        assc, acsc, acc = [np.where(transmission, transmitted_attenuation, reflected_attenuation)
+                           for transmitted_attenuation, reflected_attenuation in zip(transmitted, reflected)]
 
         return ass, assc, acsc, acc
 
     # ------------------------------------------------------------------------------
 
-    def _can_thickness_calc(self, can_x_section, can_x_section_efixed, can_thickness, wavelengths, theta, alpha, stha, salpha, ssr, sst):
+    def _can_thickness_calc(self, can_x_section, can_x_section_efixed, can_thickness, wavelengths, transmission, stha, salpha):
         if self._emode == 'Efixed':
             ki = can_x_section_efixed * can_thickness / salpha
             kf = can_x_section_efixed * can_thickness / stha
         else:
             ki, kf = self._calc_ki_kf(wavelengths, can_thickness, salpha, stha, can_x_section, can_x_section_efixed)
 
-        if theta < alpha or theta > (alpha + np.pi):
-            # transmission case
-            acc = sst(ki, kf)
-        else:
-            # reflection case
-            acc = ssr(ki, kf)
+        acc = np.where(transmission, self._self_shielding_transmission(ki, kf), self._self_shielding_reflection(ki, kf))
 
         return ki, kf, acc
 
@@ -775,15 +755,17 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
     # ------------------------------------------------------------------------------
 
     def _self_shielding_transmission(self, ki, kf):
-        if abs(ki-kf) < 1.0e-3:
-            return np.exp(-ki) * ( 1.0 - 0.5*(kf-ki) + (kf-ki)**2/12.0 )
-        else:
-            return (np.exp(-kf)-np.exp(-ki)) / (ki-kf)
+        ki, kf = np.broadcast_arrays(ki, kf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(np.abs(ki-kf) < 1.0e-3,
+                            np.exp(-ki) * ( 1.0 - 0.5*(kf-ki) + (kf-ki)**2/12.0 ),
+                            (np.exp(-kf)-np.exp(-ki)) / (ki-kf))
 
     # ------------------------------------------------------------------------------
 
     def _self_shielding_reflection(self, ki, kf):
-        return (1.0 - np.exp(-ki-kf)) / (ki+kf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (1.0 - np.exp(-ki-kf)) / (ki+kf)
 
     # ------------------------------------------------------------------------------
 
@@ -799,8 +781,9 @@ class FlatPlatePaalmanPingsCorrection(PythonAlgorithm):
         elif self._emode == 'Indirect':
             ki = np.copy(x_section)
             kf *= x_section_efixed
-        ki *= (thickness / sinangle1)
-        kf *= (thickness / sinangle2)
+        # sinangle2 may be a column with a value for each angle
+        ki = ki * (thickness / sinangle1)
+        kf = kf * (thickness / sinangle2)
         return ki, kf
 
     # ------------------------------------------------------------------------------
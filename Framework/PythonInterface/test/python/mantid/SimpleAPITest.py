@@ -5,9 +5,11 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import inspect
+import os
 import unittest
 
-from mantid.api import (AlgorithmFactory, IAlgorithm, IEventWorkspace, ITableWorkspace, PythonAlgorithm, MatrixWorkspace, mtd)
+from mantid.api import (AlgorithmFactory, AlgorithmManager, IAlgorithm, IEventWorkspace, ITableWorkspace, PythonAlgorithm,
+                        MatrixWorkspace, mtd)
 import mantid.simpleapi as simpleapi
 import numpy
 
@@ -504,6 +506,110 @@ class SimpleAPITest(unittest.TestCase):
         mtd.remove('ws')
         self.assertTrue(ws)
 
+    def test_cached_algorithm_matches_algorithm_it_was_created_from(self):
+        algm = AlgorithmManager.createUnmanaged('Rebin')
+        algm.initialize()
+        info = simpleapi._algorithm_info(algm)
+
+        cached = simpleapi._CachedAlgorithm(info)
+
+        self.assertEqual(algm.name(), cached.name())
+        self.assertEqual(algm.version(), cached.version())
+        self.assertEqual(algm.workspaceMethodName(), cached.workspaceMethodName())
+        self.assertEqual(list(algm.workspaceMethodOn()), cached.workspaceMethodOn())
+        self.assertEqual(algm.docString(), cached.docString())
+        self.assertIsNone(cached._algorithm)
+
+    def test_algorithm_cache_is_only_read_with_matching_key(self):
+        import tempfile
+        from unittest import mock
+        infos = [simpleapi._algorithm_info(AlgorithmManager.createUnmanaged('Rebin'))]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, simpleapi.__ALGORITHM_CACHE_FILENAME__)
+            with mock.patch.object(simpleapi, '_algorithm_cache_path', return_value=cache_path):
+                self.assertIsNone(simpleapi._read_algorithm_cache('key'))
+                simpleapi._write_algorithm_cache('key', infos)
+
+                self.assertEqual(infos, simpleapi._read_algorithm_cache('key'))
+                self.assertIsNone(simpleapi._read_algorithm_cache('other key'))
+
+    def test_algorithm_cache_key_changes_with_registered_algorithms(self):
+        algs = {'Rebin': [1]}
+
+        self.assertEqual(simpleapi._algorithm_cache_key(algs, []), simpleapi._algorithm_cache_key(algs, []))
+        self.assertNotEqual(simpleapi._algorithm_cache_key(algs, []),
+                            simpleapi._algorithm_cache_key({'Rebin': [1, 2]}, []))
+
+    def _run_lazily(self, code, app_data_dir, **config):
+        """
+            Run the code in a fresh interpreter, importing mantid.simpleapi with simpleapi.lazy=1. The
+            option has to be set before the module is first imported so this can not be done in this process.
+            :param code: A list of lines run after mantid.simpleapi is imported as simpleapi
+            :param app_data_dir: A directory used as the home directory, which keeps the cache out of
+                                 the user's application data directory
+            :param config: Other config options set before the import
+        """
+        import subprocess
+        import sys
+        config = dict(config, **{'simpleapi.lazy': '1'})
+        code = ["from mantid.kernel import config"] \
+            + ["config[{0!r}] = {1!r}".format(key, value) for key, value in config.items()] \
+            + ["import mantid.simpleapi as simpleapi", "assert simpleapi._create_lazily"] + code
+        env = dict(os.environ, HOME=app_data_dir, APPDATA=app_data_dir)
+        result = subprocess.run([sys.executable, '-c', "\n".join(code)], env=env, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(0, result.returncode, result.stderr)
+
+    def test_lazy_import_creates_functions_on_first_access(self):
+        import tempfile
+        code = ["import os",
+                "assert 'CreateSampleWorkspace' in simpleapi.__all__",
+                "ws = simpleapi.CreateSampleWorkspace(NumBanks=1, BankPixelWidth=1, StoreInADS=False)",
+                "assert ws.getNumberHistograms() == 1",
+                "assert 'CreateSampleWorkspace' in vars(simpleapi)",
+                "assert os.path.isfile(simpleapi._algorithm_cache_path())"]
+
+        with tempfile.TemporaryDirectory() as app_data_dir:
+            # The second import reads the cache written by the first
+            for _ in range(2):
+                self._run_lazily(code, app_data_dir)
+
+    def test_lazy_import_gives_python_plugins_functions_through_star_import(self):
+        import tempfile
+        import textwrap
+        # The first plugin runs a C++ algorithm and the second plugin through their star imported functions
+        plugin_template = textwrap.dedent("""
+            from mantid.api import AlgorithmFactory, MatrixWorkspaceProperty, PythonAlgorithm
+            from mantid.kernel import Direction
+            from mantid.simpleapi import *
+
+
+            class {name}(PythonAlgorithm):
+
+                def PyInit(self):
+                    self.declareProperty(MatrixWorkspaceProperty('OutputWorkspace', '', Direction.Output))
+
+                def PyExec(self):
+                    self.setProperty('OutputWorkspace', {body})
+
+
+            AlgorithmFactory.subscribe({name})
+            """)
+        plugins = {'LazyStarImportFirst': "Scale(LazyStarImportSecond(StoreInADS=False), Factor=2., StoreInADS=False)",
+                   'LazyStarImportSecond': "CreateSampleWorkspace(NumBanks=1, BankPixelWidth=1, StoreInADS=False)"}
+        code = ["ws = simpleapi.LazyStarImportFirst(StoreInADS=False)",
+                "assert ws.getNumberHistograms() == 1",
+                "assert ws.readY(0)[0] == 2. * simpleapi.LazyStarImportSecond(StoreInADS=False).readY(0)[0]"]
+
+        with tempfile.TemporaryDirectory() as app_data_dir:
+            plugin_dir = os.path.join(app_data_dir, 'plugins')
+            os.mkdir(plugin_dir)
+            for name, body in plugins.items():
+                with open(os.path.join(plugin_dir, name + '.py'), 'w') as plugin_file:
+                    plugin_file.write(plugin_template.format(name=name, body=body))
+            self._run_lazily(code, app_data_dir, **{'user.python.plugins.directories': plugin_dir})
+
 
 if __name__ == '__main__':
     unittest.main()
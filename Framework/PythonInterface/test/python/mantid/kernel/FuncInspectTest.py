@@ -0,0 +1,69 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+#  This file is part of the mantid package
+import timeit
+import unittest
+from unittest import mock
+
+from mantid.kernel import funcinspect
+from mantid.kernel.funcinspect import lhs_info
+
+
+def _lhs():
+    return lhs_info()
+
+
+class FuncInspectTest(unittest.TestCase):
+
+    def setUp(self):
+        funcinspect._process_call_site.cache_clear()
+
+    def test_lhs_info_with_single_return_value(self):
+        result = _lhs()
+
+        self.assertEqual((1, ('result',)), result)
+
+    def test_lhs_info_with_unpacked_return_values(self):
+        first, second = _lhs()
+
+        self.assertEqual(2, first)
+        self.assertEqual(('first', 'second'), second)
+
+    def test_lhs_info_is_cached_for_each_call_site(self):
+        for _ in range(10):
+            result = _lhs()
+        other_result = _lhs()
+
+        self.assertEqual((1, ('result',)), result)
+        self.assertEqual((1, ('other_result',)), other_result)
+        cache_info = funcinspect._process_call_site.cache_info()
+        self.assertEqual(2, cache_info.misses)
+        self.assertEqual(9, cache_info.hits)
+
+    def test_cached_names_cannot_be_modified_by_caller(self):
+        def chained_assignment():
+            a, b = c = _lhs()  # noqa: F841
+            return c[1]
+
+        chained_assignment()[0].append('modified')
+
+        self.assertEqual((['a', 'b'], 'c'), chained_assignment())
+
+    def test_cached_lhs_info_is_faster_than_decompiling(self):
+        def call_in_loop():
+            for _ in range(1000):
+                result = _lhs()  # noqa: F841
+
+        cached_time = min(timeit.repeat(call_in_loop, number=1, repeat=5))
+        with mock.patch.object(funcinspect, '_process_call_site', funcinspect._process_call_site.__wrapped__):
+            uncached_time = min(timeit.repeat(call_in_loop, number=1, repeat=5))
+
+        self.assertLess(cached_time, 0.5 * uncached_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+#  This file is part of the mantid package
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from mantid.plots.resampling_image.integratedspectra import IntegratedSpectraCache, RangeMaxTable
+from mantid.simpleapi import CreateWorkspace, DeleteWorkspace, Integration, RenameWorkspace, Scale
+
+
+class RangeMaxTableTest(unittest.TestCase):
+
+    def test_argmax_matches_numpy_for_all_ranges(self):
+        values = np.array([3., 1., 4., 1., 5., 9., 2., 6., 5., 3., 5., 9.])
+        table = RangeMaxTable(values)
+        start, stop = np.triu_indices(values.size + 1, k=1)
+
+        expected = [start_index + np.argmax(values[start_index:stop_index])
+                    for start_index, stop_index in zip(start, stop)]
+
+        np.testing.assert_array_equal(table.argmax(start, stop), expected)
+
+    def test_nan_is_treated_as_largest_value(self):
+        table = RangeMaxTable([1., np.nan, 100.])
+
+        np.testing.assert_array_equal(table.argmax([0, 2], [3, 3]), [1, 2])
+
+
+class IntegratedSpectraCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ws = CreateWorkspace(DataX=[1, 2, 3] * 4, DataY=[1, 1, 5, 5, 2, 2, 1, 1], NSpec=4,
+                                  OutputWorkspace='integrated_spectra_ws')
+        self.cache = IntegratedSpectraCache()
+        self.integrate = Mock(side_effect=lambda ws: Integration(ws, StoreInADS=False))
+
+    def tearDown(self):
+        self.cache.observeAll(False)
+        for name in ('integrated_spectra_ws', 'renamed_ws'):
+            try:
+                DeleteWorkspace(name)
+            except ValueError:
+                pass
+
+    def test_workspace_integrated_once_while_unchanged(self):
+        first = self.cache.get(self.ws, self.integrate)
+        second = self.cache.get(self.ws, self.integrate)
+
+        self.assertIs(first, second)
+        self.integrate.assert_called_once()
+        self.assertEqual(1, first.argmax([0], [4])[0])
+
+    def test_replacing_workspace_invalidates_cache(self):
+        self.cache.get(self.ws, self.integrate)
+        Scale(self.ws, Factor=2, OutputWorkspace='integrated_spectra_ws')
+
+        self.cache.get(self.ws, self.integrate)
+
+        self.assertEqual(2, self.integrate.call_count)
+
+    def test_renaming_workspace_invalidates_cache(self):
+        self.cache.get(self.ws, self.integrate)
+        RenameWorkspace(self.ws, OutputWorkspace='renamed_ws')
+
+        self.assertNotIn('integrated_spectra_ws', self.cache._tables)
+
+    def test_workspace_outside_ads_is_not_cached(self):
+        ws = CreateWorkspace(DataX=[1, 2], DataY=[1], StoreInADS=False)
+
+        self.cache.get(ws, self.integrate)
+        self.cache.get(ws, self.integrate)
+
+        self.assertEqual(2, self.integrate.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,7 +21,8 @@ from mantid.kernel import config, ConfigService
 from mantid.plots.utility import MantidAxType
 from mantid.simpleapi import (AddSampleLog, AddTimeSeriesLog, ConjoinWorkspaces,
                               CreateMDHistoWorkspace, CreateSampleWorkspace,
-                              CreateSingleValuedWorkspace, CreateWorkspace, DeleteWorkspace, LoadRaw)
+                              CreateSingleValuedWorkspace, CreateWorkspace, DeleteWorkspace, LoadRaw,
+                              MaskDetectors)
 
 
 def add_workspace_with_data(func):
@@ -503,6 +504,29 @@ class DataFunctionsTest(unittest.TestCase):
         # 12th spectra is high counting but will skipped if we don't use maxpooling
         np.testing.assert_allclose(z[0], self.ws2d_high_counting_detector.readY(0))
 
+    def test_workspace_indices_match_axis_index_of_value(self):
+        for ws in (self.ws2d_histo_rag, self.ws2d_high_counting_detector, self.ws2d_histo_uneven):
+            axis = ws.getAxis(1)
+            y_values = np.linspace(axis.getMin() - 5, axis.getMax() + 5, 97)
+            expected = []
+            for y in y_values:
+                try:
+                    expected.append(axis.indexOfValue(y))
+                except IndexError:
+                    expected.append(-1)
+
+            np.testing.assert_array_equal(funcs._workspace_indices(y_values, ws), expected)
+
+    def test_get_matrix2d_ragged_skips_masked_spectra(self):
+        ws = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=2, StoreInADS=False)
+        MaskDetectors(ws, WorkspaceIndexList=[1])
+        x_range = [ws.readX(0)[0], ws.readX(0)[-1]]
+
+        _, _, z = funcs.get_matrix_2d_ragged(ws, False, histogram2D=True, extent=x_range + [1, 4], xbins=10, ybins=4)
+
+        self.assertTrue(np.all(z.mask[1]))
+        self.assertFalse(np.any(z.mask[[0, 2, 3]]))
+
     def test_get_uneven_data(self):
         # even points
         x, y, z = funcs.get_uneven_data(self.ws2d_point_rag, True)
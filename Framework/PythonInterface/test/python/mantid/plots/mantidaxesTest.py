@@ -200,6 +200,25 @@ class MantidAxesTest(unittest.TestCase):
         # try deleting
         self.ax.remove_workspace_artists(plot_data)
 
+    def test_replace_workspace_data_autoscales_once_for_all_lines(self):
+        plot_data = CreateWorkspace(DataX=[10, 20, 30, 10, 20, 30, 10, 20, 30],
+                                    DataY=[3, 4, 5, 3, 4, 5],
+                                    DataE=[1, 2, 3, 4, 1, 1],
+                                    NSpec=3)
+        for spec_num in range(1, 4):
+            self.ax.plot(plot_data, specNum=spec_num)
+        plot_data = CreateWorkspace(DataX=[20, 30, 40, 20, 30, 40, 20, 30, 40],
+                                    DataY=[3, 4, 5, 3, 4, 5],
+                                    DataE=[1, 2, 3, 4, 1, 1],
+                                    NSpec=3)
+
+        with patch.object(self.ax, 'relim') as mock_relim:
+            self.ax.replace_workspace_artists(plot_data)
+
+        mock_relim.assert_called_once_with()
+        self.assertAlmostEqual(25, self.ax.lines[2].get_xdata()[0])
+        self.ax.remove_workspace_artists(plot_data)
+
     def test_replace_workspace_data_errorbar(self):
         eb_data = CreateWorkspace(DataX=[10, 20, 30, 10, 20, 30, 10, 20, 30],
                                   DataY=[3, 4, 5, 3, 4, 5],
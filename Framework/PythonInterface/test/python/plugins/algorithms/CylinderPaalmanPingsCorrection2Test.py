@@ -5,10 +5,15 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
+from unittest import mock
+
+import numpy as np
 from mantid import mtd, config
 from mantid.simpleapi import (CreateSampleWorkspace, Scale, DeleteWorkspace, ConvertToPointData,
                               CylinderPaalmanPingsCorrection, SetInstrumentParameter)
 
+import plugins.algorithms.CylinderPaalmanPingsCorrection2 as _CylinderPaalmanPingsCorrection2
+
 
 class CylinderPaalmanPingsCorrection2Test(unittest.TestCase):
     def setUp(self):
@@ -308,6 +313,57 @@ class CylinderPaalmanPingsCorrection2Test(unittest.TestCase):
             self.assertEqual(run.getLogData('emode').value,'Efixed')
             self.assertAlmostEqual(run.getLogData('efixed').value, 7.5)
 
+    def _cylinder_absorption(self, angles, progress):
+        """
+        Calculate the corrections for a sample in a can with fixed attenuation coefficients.
+        """
+        algorithm = _CylinderPaalmanPingsCorrection2.CylinderPaalmanPingsCorrection()
+        algorithm._number_can = 2
+        algorithm._radii = np.array([0.1, 0.2, 0.25])
+        algorithm._density = np.array([0.05, 0.08])
+        algorithm._sig_s = np.array([5.1, 3.2])
+        algorithm._sig_a = np.array([2.3, 0.9])
+        algorithm._beam = [3.0, 0.15, -0.15, 0.3, -0.3, 0.0, 0.3, 0.0, 0.3]
+        algorithm._ms = 10
+        algorithm._emode = 'Indirect'
+        algorithm._fixed = 6.2
+        algorithm._waves = [5.0, 7.0]
+        return algorithm._cyl_abs(angles, progress)
+
+    def test_corrections_are_unchanged(self):
+        """
+        Tests the values of the corrections, calculating two of the three angles at a time
+        """
+        angles = [10.0, 90.0, 170.0]
+        progress = mock.MagicMock()
+        # Each of the two wavelengths has 59 integration points, so 250 points allow two angles
+        with mock.patch.object(_CylinderPaalmanPingsCorrection2, 'MAX_INTEGRATION_POINTS', 250):
+            ass, assc, acsc, acc = self._cylinder_absorption(angles, progress)
+
+        self.assertEqual(2, progress.reportIncrement.call_count)
+
+        np.testing.assert_allclose(ass, [[0.8510507331752, 0.8385484009064],
+                                         [0.8847464241881, 0.8728664475058],
+                                         [0.8781611560751, 0.8674861259324]], rtol=1e-10)
+        np.testing.assert_allclose(assc, [[0.8062660785362, 0.7908849278280],
+                                          [0.8268802556945, 0.8121149074365],
+                                          [0.8318107569833, 0.8180462408892]], rtol=1e-10)
+        np.testing.assert_allclose(acsc, [[0.8163147735494, 0.7981596671680],
+                                          [0.8620002158513, 0.8445345060504],
+                                          [0.8109156585910, 0.7961815718447]], rtol=1e-10)
+        np.testing.assert_allclose(acc, [[0.9482015293501, 0.9436394787338],
+                                         [0.9312740701409, 0.9268749761476],
+                                         [0.9437947171405, 0.9394348726047]], rtol=1e-10)
+
+    def test_corrections_do_not_depend_on_the_number_of_angles_calculated_together(self):
+        angles = [10.0, 90.0, 170.0]
+        corrections = self._cylinder_absorption(angles, mock.MagicMock())
+        with mock.patch.object(_CylinderPaalmanPingsCorrection2, 'MAX_INTEGRATION_POINTS', 1):
+            corrections_per_angle = self._cylinder_absorption(angles, mock.MagicMock())
+
+        for correction, correction_per_angle in zip(corrections, corrections_per_angle):
+            np.testing.assert_allclose(correction, correction_per_angle, rtol=1e-12)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from mantid.simpleapi import (AddSampleLog, ConvertToEventWorkspace, ConvertToMD, CreatePeaksWorkspace,
+                              CreateSampleWorkspace, IntegratePeaksProfileFitting, MoveInstrumentComponent,
+                              PredictPeaks, RotateInstrumentComponent, SetInstrumentParameter, SetUB, mtd)
+
+
+class IntegratePeaksProfileFittingTest(unittest.TestCase):
+
+    _numPeaks = 4
+
+    @classmethod
+    def setUpClass(cls):
+        cls._directory = tempfile.mkdtemp()
+        # Constant Ikeda-Carpenter parameters (A, B, R, T0): the pade approximant is c[0] when only c[0], c[4]
+        # and c[8] are set
+        coefficients = np.zeros((4, 10))
+        coefficients[:, 0] = [0.6, 0.02, 0.05, 0.0]
+        coefficients[:, 4] = coefficients[:, 8] = 1.0
+        cls._moderatorFile = os.path.join(cls._directory, 'moderator_coefficients.dat')
+        np.savetxt(cls._moderatorFile, coefficients)
+        # With a strong peak profiles file none of the peaks have to be fit one at a time
+        cls._strongPeaksFile = os.path.join(cls._directory, 'strong_peaks.pkl')
+        with open(cls._strongPeaksFile, 'wb') as strongPeaksFile:
+            pickle.dump(np.empty((0, 9)), strongPeaksFile)
+
+        cls._createData()
+
+    @classmethod
+    def tearDownClass(cls):
+        mtd.clear()
+        shutil.rmtree(cls._directory)
+
+    @classmethod
+    def _createData(cls):
+        # A single bank at 90 degrees with fine pixels, and the instrument parameters the fit needs
+        data = CreateSampleWorkspace(WorkspaceType='Histogram', Function='Flat background', NumBanks=1,
+                                     BankPixelWidth=64, PixelSpacing=0.001, BankDistanceFromSample=0.5,
+                                     XUnit='TOF', XMin=3000., XMax=14000., BinWidth=20., OutputWorkspace='data')
+        MoveInstrumentComponent(Workspace=data, ComponentName='bank1', X=0.5, Y=0., Z=0., RelativePosition=False)
+        RotateInstrumentComponent(Workspace=data, ComponentName='bank1', X=0., Y=1., Z=0., Angle=90.,
+                                  RelativeRotation=False)
+        AddSampleLog(Workspace=data, LogName='run_number', LogText='1', LogType='Number')
+        for name, value in [('numDetRows', '64'), ('numDetCols', '64'), ('numBinsTheta', '50'), ('numBinsPhi', '50'),
+                            ('fracHKL', '0.25'), ('dQPixel', '0.005'), ('mindtBinWidth', '15.0'),
+                            ('maxdtBinWidth', '50.0'), ('peakMaskSize', '5'), ('sigAZ0', '0.0025')]:
+            SetInstrumentParameter(Workspace=data, ParameterName=name, ParameterType='Number', Value=value)
+        SetInstrumentParameter(Workspace=data, ParameterName='sigSC0Params', ParameterType='String',
+                               Value='0.00413132 1.54103839 1.0 -0.00266634')
+        SetUB(Workspace=data, a=20., b=20., c=20., alpha=90., beta=90., gamma=90.)
+
+        # Fit a few of the predicted peaks away from the edges of the bank
+        predicted = PredictPeaks(InputWorkspace=data, WavelengthMin=2., WavelengthMax=4., MinDSpacing=1.,
+                                 MaxDSpacing=20., ReflectionCondition='Primitive', OutputWorkspace='predicted')
+        peaks = CreatePeaksWorkspace(InstrumentWorkspace=data, NumberOfPeaks=0, OutputWorkspace='peaks')
+        for index in range(predicted.getNumberPeaks()):
+            peak = predicted.getPeak(index)
+            if 8 <= peak.getRow() < 56 and 8 <= peak.getCol() < 56:
+                peak.setRunNumber(1)
+                peaks.addPeak(peak)
+            if peaks.getNumberPeaks() == cls._numPeaks:
+                break
+
+        # Each peak spreads over the neighbouring pixels, with a moderator-like tail in time-of-flight,
+        # on a flat background
+        rng = np.random.RandomState(5)
+        spectrumInfo = data.spectrumInfo()
+        directions = np.array([np.array(spectrumInfo.position(index)) for index in range(data.getNumberHistograms())])
+        directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+        tofBins = data.readX(0)
+        counts = rng.poisson(0.05, size=(data.getNumberHistograms(), len(tofBins) - 1)).astype(float)
+        for index in range(peaks.getNumberPeaks()):
+            peak = peaks.getPeak(index)
+            peakDirection = np.array(peak.getDetPos())
+            peakDirection /= np.linalg.norm(peakDirection)
+            angles = np.arccos(np.clip(directions.dot(peakDirection), -1., 1.))
+            weights = np.exp(-0.5 * (angles / 0.004)**2)
+            pixels = rng.choice(len(weights), size=5000, p=weights / weights.sum())
+            tofs = peak.getTOF() + rng.normal(0., 10., size=len(pixels)) + rng.exponential(40., size=len(pixels))
+            tofIndices = np.searchsorted(tofBins, tofs) - 1
+            inRange = np.logical_and(tofIndices >= 0, tofIndices < counts.shape[1])
+            np.add.at(counts, (pixels[inRange], tofIndices[inRange]), 1.)
+        for index in range(data.getNumberHistograms()):
+            data.setY(index, counts[index])
+            data.setE(index, np.sqrt(counts[index]))
+
+        events = ConvertToEventWorkspace(InputWorkspace=data, GenerateMultipleEvents=True, MaxEventsPerBin=1000,
+                                         OutputWorkspace='events')
+        ConvertToMD(InputWorkspace=events, QDimensions='Q3D', dEAnalysisMode='Elastic', Q3DFrames='Q_lab',
+                    QConversionScales='Q in A^-1', MinValues='-6,-6,-6', MaxValues='6,6,6', MaxRecursionDepth=10,
+                    LorentzCorrection=False, OutputWorkspace='md')
+
+    def _integrate(self, maxConcurrentPeaks):
+        suffix = '_{}'.format(maxConcurrentPeaks)
+        IntegratePeaksProfileFitting(OutputPeaksWorkspace='peaks_out' + suffix, OutputParamsWorkspace='params' + suffix,
+                                     InputWorkspace='md', PeaksWorkspace='peaks', MinpplFrac=0.9, MaxpplFrac=1.1,
+                                     ModeratorCoefficientsFile=self._moderatorFile,
+                                     StrongPeakParamsFile=self._strongPeaksFile,
+                                     MaxConcurrentPeaks=maxConcurrentPeaks)
+        return mtd['peaks_out' + suffix], mtd['params' + suffix]
+
+    def test_concurrent_fits_match_serial_fits(self):
+        self.assertEqual(self._numPeaks, mtd['peaks'].getNumberPeaks())
+
+        serialPeaks, serialParams = self._integrate(maxConcurrentPeaks=1)
+        concurrentPeaks, concurrentParams = self._integrate(maxConcurrentPeaks=3)
+
+        self.assertEqual(serialPeaks.getNumberPeaks(), concurrentPeaks.getNumberPeaks())
+        np.testing.assert_allclose(serialPeaks.column('Intens'), concurrentPeaks.column('Intens'))
+        np.testing.assert_allclose(serialPeaks.column('SigInt'), concurrentPeaks.column('SigInt'))
+        self.assertEqual(serialParams.rowCount(), concurrentParams.rowCount())
+        np.testing.assert_allclose(serialParams.column('peakNumber'), concurrentParams.column('peakNumber'))
+        np.testing.assert_allclose(serialParams.column('Intens3d'), concurrentParams.column('Intens3d'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,10 +5,15 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
+from unittest import mock
+
+import numpy as np
 from mantid import mtd, config
 from mantid.simpleapi import CreateSampleWorkspace, Scale, DeleteWorkspace, ConvertToPointData, \
                              SetInstrumentParameter, FlatPlatePaalmanPingsCorrection
 
+import plugins.algorithms.WorkflowAlgorithms.FlatPlatePaalmanPingsCorrection as _FlatPlatePaalmanPingsCorrection
+
 
 class FlatPlatePaalmanPingsCorrectionTest(unittest.TestCase):
     def setUp(self):
@@ -333,5 +338,55 @@ class FlatPlatePaalmanPingsCorrectionTest(unittest.TestCase):
             self.assertEqual(run.getLogData('emode').value,'Efixed')
             self.assertAlmostEqual(run.getLogData('efixed').value, 7.5)
 
+    def _workspace_with_material(self, total_scatter_x_section, absorb_x_section):
+        workspace = mock.MagicMock()
+        material = workspace.sample.return_value.getMaterial.return_value
+        material.totalScatterXSection.return_value = total_scatter_x_section
+        material.absorbXSection.return_value = absorb_x_section
+        return workspace
+
+    def test_corrections_are_unchanged(self):
+        """
+        Tests the values of the corrections for angles in transmission, along the plate and in reflection
+        """
+        algorithm = _FlatPlatePaalmanPingsCorrection.FlatPlatePaalmanPingsCorrection()
+        algorithm._emode = 'Indirect'
+        algorithm._efixed = 1.845
+        algorithm._sample_angle = 0.0
+        algorithm._sample_thickness = 0.1
+        algorithm._sample_density = 0.05
+        algorithm._can_front_thickness = 0.02
+        algorithm._can_back_thickness = 0.03
+        algorithm._can_density = 0.08
+        algorithm._has_sample_in = True
+        algorithm._has_can_front_in = True
+        algorithm._has_can_back_in = True
+        algorithm._use_can = True
+        algorithm._sample_ws_name = 'sample'
+        algorithm._can_ws_name = 'can'
+        algorithm._wavelengths = [5.0, 7.0]
+        workspaces = {'sample': self._workspace_with_material(5.1, 2.3), 'can': self._workspace_with_material(3.2, 0.9)}
+
+        with mock.patch.object(_FlatPlatePaalmanPingsCorrection, 'mtd', workspaces):
+            ass, assc, acsc, acc = algorithm._flat_abs([10.0, 90.0, 135.0, 300.0])
+
+        np.testing.assert_allclose(ass, [[0.9386578122111, 0.9326680862688],
+                                         [1.0, 1.0],
+                                         [0.9269075091492, 0.9211551292427],
+                                         [0.9079450083393, 0.9020868030825]], rtol=1e-10)
+        np.testing.assert_allclose(assc, [[0.9154403820956, 0.9081429995916],
+                                          [1.0, 1.0],
+                                          [0.9050105795634, 0.8979546137336],
+                                          [0.8719224749972, 0.8649101870714]], rtol=1e-10)
+        np.testing.assert_allclose(acsc, [[0.9168648633878, 0.9080148954158],
+                                          [1.0, 1.0],
+                                          [0.8886823037224, 0.8807354442102],
+                                          [0.8821027713969, 0.8733408103758]], rtol=1e-10)
+        np.testing.assert_allclose(acc, [[0.9756291463830, 0.9736771105647],
+                                         [1.0, 1.0],
+                                         [0.9707026353772, 0.9687809829647],
+                                         [0.9631926941378, 0.9612572896599]], rtol=1e-10)
+
+
 if __name__ == "__main__":
     unittest.main()
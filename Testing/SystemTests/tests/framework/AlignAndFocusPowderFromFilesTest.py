@@ -112,6 +112,29 @@ class ChunkingCompare(systemtesting.MantidSystemTest):
         return ('with_chunks', 'no_chunks')
 
 
+class ConcurrentChunkingCompare(systemtesting.MantidSystemTest):
+
+    def requiredMemoryMB(self):
+        return 24*1024  # GiB
+
+    def runTest(self):
+        # 11MB file
+        kwargs = {'Filename':'SNAP_45874',
+                  'Params':(.5,-.004,7)}
+
+        # process 4 chunks, 2 at a time
+        AlignAndFocusPowderFromFiles(OutputWorkspace='concurrent_chunks', MaxChunkSize=.01, MaxConcurrentChunks=2,
+                                     **kwargs)
+        # process 4 chunks, one after another
+        AlignAndFocusPowderFromFiles(OutputWorkspace='serial_chunks', MaxChunkSize=.01, **kwargs)
+
+    def validateMethod(self):
+        return "ValidateWorkspaceToWorkspace"
+
+    def validate(self):
+        return ('concurrent_chunks', 'serial_chunks')
+
+
 class UseCache(systemtesting.MantidSystemTest):
     cal_file  = "PG3_FERNS_d4832_2011_08_24.cal"
     char_file = "PG3_characterization_2012_02_23-HR-ILL.txt"
@@ -0,0 +1,71 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Benchmarks the resampling used to draw colorfill plots of ragged workspaces
+with the number of spectra found on large ISIS instruments.
+"""
+from abc import ABCMeta, abstractmethod
+import time
+
+from mantid.plots.datafunctions import get_matrix_2d_ragged
+from mantid.simpleapi import ConvertUnits, CreateSampleWorkspace
+from systemtesting import MantidSystemTest
+
+# Images are resampled to roughly the size of a plot on screen
+IMAGE_BINS = 1000
+# Generous upper limit on the time to draw one image, in seconds
+MAX_RESAMPLE_TIME = 10.0
+
+
+class _ResampledImagePerformanceBase(MantidSystemTest, metaclass=ABCMeta):
+    """
+    Resample a full view, and a zoomed view, of a workspace with ragged bins
+    as SamplingImage does when panning and zooming.
+    """
+
+    @abstractmethod
+    def workspace_size(self):
+        """Return the number of 64 x 64 pixel banks and the number of bins"""
+
+    def requiredMemoryMB(self):
+        return 8000
+
+    def runTest(self):
+        num_banks, num_bins = self.workspace_size()
+        ws = CreateSampleWorkspace(NumBanks=num_banks, BankPixelWidth=64, XMin=1000, XMax=20000,
+                                   BinWidth=(19000 / num_bins), StoreInADS=False)
+        # Converting to d-spacing gives every spectrum different bins
+        ws = ConvertUnits(ws, Target='dSpacing', StoreInADS=False)
+        spectrum_info = ws.spectrumInfo()
+        x_min, x_max = ws.readX(0)[0], ws.readX(0)[-1]
+        num_spectra = ws.getNumberHistograms()
+
+        extents = {'full': [x_min, x_max, 1, num_spectra],
+                   'zoomed': [x_min, 0.5 * (x_min + x_max), 1, num_spectra // 10]}
+        for view, extent in extents.items():
+            start = time.time()
+            _, _, counts = get_matrix_2d_ragged(ws, True, histogram2D=True, extent=extent, xbins=IMAGE_BINS,
+                                                ybins=IMAGE_BINS, spec_info=spectrum_info)
+            duration = time.time() - start
+
+            self.reportResult(f'{view}_resample_time', duration)
+            self.assertEqual((IMAGE_BINS, IMAGE_BINS), counts.shape)
+            self.assertLessThan(duration, MAX_RESAMPLE_TIME)
+
+
+class MERLINSizedResampledImagePerformanceTest(_ResampledImagePerformanceBase):
+    """69,632 spectra"""
+
+    def workspace_size(self):
+        return 17, 500
+
+
+class WISHSizedResampledImagePerformanceTest(_ResampledImagePerformanceBase):
+    """778,240 spectra"""
+
+    def workspace_size(self):
+        return 190, 50
@@ -82,7 +82,8 @@ DEFAULTS = {
         'prompt_save_on_close': True,
         'prompt_save_editor_modified': True,
         'prompt_on_deleting_workspace': False,
-        'save_altered_workspaces_only': False
+        'save_altered_workspaces_only': False,
+        'skip_unchanged_workspaces': False
     },
     'Editors': {
         'completion_enabled': True,
@@ -14,6 +14,7 @@ import io
 import sys
 import re
 from functools import wraps
+from threading import Lock
 
 import matplotlib
 from matplotlib._pylab_helpers import Gcf
@@ -21,7 +22,7 @@ from matplotlib.axes import Axes
 from matplotlib.backend_bases import FigureManagerBase
 from matplotlib.collections import LineCollection
 from mpl_toolkits.mplot3d.axes3d import Axes3D
-from qtpy.QtCore import QObject, Qt
+from qtpy.QtCore import QObject, Qt, QTimer, Signal
 from qtpy.QtGui import QImage
 from qtpy.QtWidgets import QApplication, QLabel, QFileDialog
 from qtpy import QT_VERSION
@@ -45,6 +46,9 @@ from workbench.plotting.plotscriptgenerator import generate_script
 from workbench.plotting.toolbar import WorkbenchNavigationToolbar, ToolbarStateManager
 from workbench.plotting.plothelppages import PlotHelpPages
 
+# The shortest time between two updates of a figure following replaced workspaces
+FIGURE_UPDATE_INTERVAL_MS = 40
+
 
 def _replace_workspace_name_in_string(old_name, new_name, string):
     return re.sub(rf'\b{old_name}\b', new_name, string)
@@ -65,11 +69,91 @@ def _catch_exceptions(func):
     return wrapper
 
 
+class FigureUpdateScheduler(QObject):
+    """
+    Updates a figure when the workspaces it plots are replaced. Replacements can be requested
+    from any thread and are coalesced: the figure is updated on the QApplication thread at most
+    once per FIGURE_UPDATE_INTERVAL_MS, using the latest version of each replaced workspace,
+    and redrawn once. The updates of a hidden figure wait until it is shown again.
+    """
+    sig_update_requested = Signal()
+
+    def __init__(self, window, canvas):
+        super(FigureUpdateScheduler, self).__init__()
+        self.window = window
+        self.canvas = canvas
+        self._pending_names = set()
+        self._pending_names_lock = Lock()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FIGURE_UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self.update_figure)
+        # queued across threads, so that the timer is only ever started from the QApplication thread
+        self.sig_update_requested.connect(self._start_timer)
+        self.window.visibility_changed.connect(self._start_timer)
+
+    def request_update(self, workspace_name):
+        """
+        Request an update of the artists of a replaced workspace
+        :param workspace_name: The name of the replaced workspace
+        """
+        with self._pending_names_lock:
+            self._pending_names.add(workspace_name)
+        self.sig_update_requested.emit()
+
+    def cancel_update(self, workspace_name=None):
+        """
+        Cancel the pending update of a workspace, for example because it has been deleted
+        :param workspace_name: The name of the workspace, or None to cancel all pending updates
+        """
+        with self._pending_names_lock:
+            if workspace_name is None:
+                self._pending_names.clear()
+            else:
+                self._pending_names.discard(workspace_name)
+
+    def rename_update(self, old_name, new_name):
+        """
+        Keep the pending update of a renamed workspace
+        :param old_name: The old name of the workspace
+        :param new_name: The new name of the workspace
+        """
+        with self._pending_names_lock:
+            if old_name in self._pending_names:
+                self._pending_names.remove(old_name)
+                self._pending_names.add(new_name)
+
+    def _start_timer(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @_catch_exceptions
+    def update_figure(self):
+        """Replace the data of the artists of all the replaced workspaces and redraw the figure once"""
+        if self.window.isHidden() or self.window.isMinimized():
+            return
+        with self._pending_names_lock:
+            workspace_names, self._pending_names = self._pending_names, set()
+
+        redraw = False
+        for workspace_name in workspace_names:
+            if not AnalysisDataService.doesExist(workspace_name):
+                continue
+            workspace = AnalysisDataService.retrieve(workspace_name)
+            for ax in self.canvas.figure.axes:
+                if isinstance(ax, MantidAxes):
+                    redraw = ax.replace_workspace_artists(workspace) | redraw
+        if redraw:
+            self.canvas.draw()
+
+
 class FigureManagerADSObserver(AnalysisDataServiceObserver):
     def __init__(self, manager):
         super(FigureManagerADSObserver, self).__init__()
         self.window = manager.window
         self.canvas = manager.canvas
+        self.update_scheduler = FigureUpdateScheduler(self.window, self.canvas)
 
         self.observeClear(True)
         self.observeDelete(True)
@@ -79,18 +163,20 @@ class FigureManagerADSObserver(AnalysisDataServiceObserver):
     @_catch_exceptions
     def clearHandle(self):
         """Called when the ADS is deleted all of its workspaces"""
+        self.update_scheduler.cancel_update()
         self.window.emit_close()
 
     @_catch_exceptions
-    def deleteHandle(self, _, workspace):
+    def deleteHandle(self, name, workspace):
         """
         Called when the ADS has deleted a workspace. Checks the
         attached axes for any hold a plot from this workspace. If removing
         this leaves empty axes then the parent window is triggered for
         closer
-        :param _: The name of the workspace. Unused
+        :param name: The name of the workspace
         :param workspace: A pointer to the workspace
         """
+        self.update_scheduler.cancel_update(name)
         # Find the axes with this workspace reference
         all_axes = self.canvas.figure.axes
         if not all_axes:
@@ -119,22 +205,15 @@ class FigureManagerADSObserver(AnalysisDataServiceObserver):
             self.canvas.draw()
 
     @_catch_exceptions
-    def replaceHandle(self, _, workspace):
+    def replaceHandle(self, name, _):
         """
         Called when the ADS has replaced a workspace with one of the same name.
         If this workspace is attached to this figure then its data is updated
-        :param _: The name of the workspace. Unused
-        :param workspace: A reference to the new workspace
+        by the update scheduler, which coalesces rapid replacements
+        :param name: The name of the workspace
+        :param _: A reference to the new workspace. Unused
         """
-        redraw = False
-        for ax in self.canvas.figure.axes:
-            if isinstance(ax, MantidAxes):
-                redraw_this = ax.replace_workspace_artists(workspace)
-            else:
-                continue
-            redraw = redraw | redraw_this
-        if redraw:
-            self.canvas.draw()
+        self.update_scheduler.request_update(name)
 
     @_catch_exceptions
     def renameHandle(self, oldName, newName):
@@ -145,6 +224,7 @@ class FigureManagerADSObserver(AnalysisDataServiceObserver):
         :param oldName: The old name of the workspace.
         :param newName: The new name of the workspace
         """
+        self.update_scheduler.rename_update(oldName, newName)
         for ax in self.canvas.figure.axes:
             if isinstance(ax, MantidAxes):
                 ws = AnalysisDataService.retrieve(newName)
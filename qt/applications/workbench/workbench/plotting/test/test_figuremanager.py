@@ -8,8 +8,9 @@
 import unittest
 
 from unittest.mock import MagicMock, patch
+from mantid.plots import MantidAxes
 from mantidqt.utils.qt.testing import start_qapplication
-from workbench.plotting.figuremanager import MantidFigureCanvas, FigureManagerWorkbench
+from workbench.plotting.figuremanager import MantidFigureCanvas, FigureManagerWorkbench, FigureUpdateScheduler
 
 
 @start_qapplication
@@ -32,5 +33,52 @@ class FigureManagerWorkbenchTest(unittest.TestCase):
         self.assertEqual(fig_mgr.get_window_title(), "Figure 1")
 
 
+@start_qapplication
+class FigureUpdateSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.window = MagicMock()
+        self.window.isHidden.return_value = False
+        self.window.isMinimized.return_value = False
+        self.canvas = MagicMock()
+        self.ax = MagicMock(spec=MantidAxes)
+        self.ax.replace_workspace_artists.return_value = True
+        self.canvas.figure.axes = [self.ax]
+        self.scheduler = FigureUpdateScheduler(self.window, self.canvas)
+
+    @patch("workbench.plotting.figuremanager.AnalysisDataService")
+    def test_replacements_of_a_workspace_are_coalesced_into_one_update(self, mock_ads):
+        for _ in range(3):
+            self.scheduler.request_update("ws")
+
+        self.scheduler.update_figure()
+
+        mock_ads.retrieve.assert_called_once_with("ws")
+        self.ax.replace_workspace_artists.assert_called_once_with(mock_ads.retrieve.return_value)
+        self.canvas.draw.assert_called_once_with()
+
+    @patch("workbench.plotting.figuremanager.AnalysisDataService")
+    def test_hidden_figure_is_updated_when_shown(self, mock_ads):
+        self.window.isHidden.return_value = True
+        self.scheduler.request_update("ws")
+
+        self.scheduler.update_figure()
+        self.ax.replace_workspace_artists.assert_not_called()
+
+        self.window.isHidden.return_value = False
+        self.scheduler.update_figure()
+        self.ax.replace_workspace_artists.assert_called_once_with(mock_ads.retrieve.return_value)
+
+    @patch("workbench.plotting.figuremanager.AnalysisDataService")
+    def test_deleted_workspace_is_not_updated(self, mock_ads):
+        self.scheduler.request_update("ws")
+        self.scheduler.cancel_update("ws")
+
+        self.scheduler.update_figure()
+
+        mock_ads.retrieve.assert_not_called()
+        self.canvas.draw.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -37,6 +37,16 @@ class Project(AnalysisDataServiceObserver):
         # Last save locations
         self.last_project_location = None
 
+        # whether to keep the files of workspaces that have not changed since the last save to the same place, rather
+        # than writing them again. Changes made to a workspace in place do not notify the ADS, so they are not saved.
+        self.skip_unchanged_workspaces = False
+
+        # The workspaces written to the directory of the last save, and the names of workspaces changed in the ADS
+        # since then. Used to avoid writing unchanged workspaces again when saving to the same place.
+        self._saved_workspaces_directory = None
+        self._saved_workspaces = set()
+        self._modified_workspaces = set()
+
         # whether to discard workspaces that have only been loaded when saving the project
         self.save_altered_workspaces_only = False
 
@@ -56,6 +66,7 @@ class Project(AnalysisDataServiceObserver):
     def load_settings_from_config(self, config):
         self.prompt_save_on_close = config.get('project', 'prompt_save_on_close')
         self.save_altered_workspaces_only = config.get('project', 'save_altered_workspaces_only')
+        self.skip_unchanged_workspaces = config.get('project', 'skip_unchanged_workspaces')
 
     @property
     def saved(self):
@@ -145,13 +156,47 @@ class Project(AnalysisDataServiceObserver):
                     plots_to_save = self._filter_plots_with_unaltered_workspaces(plots_to_save, workspaces_to_save)
 
                 interfaces_to_save = self.interface_populating_function()
+                unchanged_workspaces = self._get_unchanged_workspaces(workspaces_to_save)
+                # Anything changed from here on has to be written again by the next save
+                self._modified_workspaces = set()
+                self._saved_workspaces = set()
                 project_saver = ProjectSaver(self.project_file_ext)
-                project_saver.save_project(file_name=self.last_project_location, workspace_to_save=workspaces_to_save,
-                                           plots_to_save=plots_to_save, interfaces_to_save=interfaces_to_save)
+                saved_workspaces = project_saver.save_project(file_name=self.last_project_location,
+                                                              workspace_to_save=workspaces_to_save,
+                                                              plots_to_save=plots_to_save,
+                                                              interfaces_to_save=interfaces_to_save,
+                                                              unchanged_workspaces=unchanged_workspaces)
+                self._saved_workspaces_directory = self._get_project_directory()
+                self._saved_workspaces = set(saved_workspaces or [])
                 self.__saved = True
         finally:
             self.__is_saving = False
 
+    def _get_project_directory(self):
+        return os.path.dirname(self.last_project_location) if self.last_project_location else None
+
+    def _get_unchanged_workspaces(self, workspace_names):
+        """
+        Get the workspaces which were written to the project directory by the last save and have not changed since.
+        A group is only unchanged if none of its members have changed either. Only workspaces replaced in the ADS are
+        seen as changed, so this is empty unless skip_unchanged_workspaces is set.
+        :param workspace_names: List of Strings; The workspaces that are going to be saved
+        :return: A set of the names of the unchanged workspaces
+        """
+        directory = self._get_project_directory()
+        if not self.skip_unchanged_workspaces or directory is None or directory != self._saved_workspaces_directory:
+            return set()
+        unchanged_workspaces = set()
+        for name in workspace_names:
+            if name not in self._saved_workspaces or name in self._modified_workspaces:
+                continue
+            workspace = AnalysisDataService.retrieve(name)
+            if isinstance(workspace, WorkspaceGroup) and \
+                    any(member in self._modified_workspaces for member in workspace.getNames()):
+                continue
+            unchanged_workspaces.add(name)
+        return unchanged_workspaces
+
     @staticmethod
     def _get_workspace_names_to_save():
         """
@@ -297,6 +342,30 @@ class Project(AnalysisDataServiceObserver):
         """
         self.modified_project()
 
+    def addHandle(self, ws_name, _):
+        self._modified_workspaces.add(ws_name)
+
+    def replaceHandle(self, ws_name, _):
+        self._modified_workspaces.add(ws_name)
+
+    def deleteHandle(self, ws_name, _):
+        self._modified_workspaces.add(ws_name)
+
+    def renameHandle(self, ws_name, new_name):
+        self._modified_workspaces.update((ws_name, new_name))
+
+    def clearHandle(self):
+        self._saved_workspaces = set()
+
+    def groupHandle(self, ws_name, _):
+        self._modified_workspaces.add(ws_name)
+
+    def unGroupHandle(self, ws_name, _):
+        self._modified_workspaces.add(ws_name)
+
+    def groupUpdateHandle(self, ws_name, _):
+        self._modified_workspaces.add(ws_name)
+
     def notify(self, *args):
         """
         The method that will trigger when a plot is added, destroyed, or changed in the global figure manager.
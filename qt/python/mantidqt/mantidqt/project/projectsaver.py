@@ -19,7 +19,8 @@ class ProjectSaver(object):
     def __init__(self, project_file_ext):
         self.project_file_ext = project_file_ext
 
-    def save_project(self, file_name, workspace_to_save=None, plots_to_save=None, interfaces_to_save=None, project_recovery=True):
+    def save_project(self, file_name, workspace_to_save=None, plots_to_save=None, interfaces_to_save=None, project_recovery=True,
+                     unchanged_workspaces=None):
         """
         The method that will actually save the project and call relevant savers for workspaces, plots, interfaces etc.
         :param file_name: String; The file_name of the
@@ -28,7 +29,9 @@ class ProjectSaver(object):
         :param interfaces_to_save: List of Lists of Window and Encoder; the interfaces to save and the encoders to use
         :param project_recovery: Bool; If the behaviour of Project Save should be altered to function correctly inside
         of project recovery
-        :return: None; If the method cannot be completed.
+        :param unchanged_workspaces: Iterable of Strings; workspaces that have not changed since they were last saved to
+        the directory of file_name, these are not written again
+        :return: List of Strings; the workspaces in the project. None; If the method cannot be completed.
         """
         # Check if the file_name doesn't exist
         if file_name is None:
@@ -44,7 +47,8 @@ class ProjectSaver(object):
         # Save workspaces to that location
         if project_recovery:
             workspace_saver = WorkspaceSaver(directory=directory)
-            workspace_saver.save_workspaces(workspaces_to_save=workspace_to_save)
+            workspace_saver.save_workspaces(workspaces_to_save=workspace_to_save,
+                                            unchanged_workspaces=unchanged_workspaces)
             saved_workspaces = workspace_saver.get_output_list()
         else:
             # Assume that this is project recovery so pass a list of workspace names
@@ -66,6 +70,7 @@ class ProjectSaver(object):
                                save_location=file_name,
                                project_file_ext=self.project_file_ext)
         writer.write_out()
+        return saved_workspaces
 
     @staticmethod
     def _return_interfaces_dicts(directory, interfaces_to_save):
@@ -243,7 +243,60 @@ class ProjectTest(unittest.TestCase):
         saver.assert_called_with(file_name=self.project.last_project_location,
                                  workspace_to_save=['newGroup', 'ws3'],
                                  plots_to_save="mocked_figs",
-                                 interfaces_to_save="mocked_interfaces")
+                                 interfaces_to_save="mocked_interfaces",
+                                 unchanged_workspaces=set())
+
+    def _save_to_temporary_project(self):
+        temp_file_path = tempfile.mkdtemp()
+        self._folders_to_remove.add(temp_file_path)
+        self.project.last_project_location = os.path.join(temp_file_path, "temp" + ".mtdproj")
+        self.project._save()
+
+    def test_saving_again_writes_all_workspaces_by_default(self):
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        self._save_to_temporary_project()
+
+        with mock.patch('mantidqt.project.project.ProjectSaver.save_project') as saver:
+            self.project._save()
+
+        self.assertEqual(set(), saver.call_args[1]["unchanged_workspaces"])
+
+    def test_saving_again_only_writes_workspaces_changed_in_the_ads(self):
+        self.project.skip_unchanged_workspaces = True
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        self._save_to_temporary_project()
+
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        with mock.patch('mantidqt.project.project.ProjectSaver.save_project') as saver:
+            self.project._save()
+
+        self.assertEqual({"ws1"}, saver.call_args[1]["unchanged_workspaces"])
+
+    def test_group_is_written_again_when_a_member_changes(self):
+        self.project.skip_unchanged_workspaces = True
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        GroupWorkspaces(InputWorkspaces="ws1,ws2", OutputWorkspace="newGroup")
+        CreateSampleWorkspace(OutputWorkspace="ws3")
+        self._save_to_temporary_project()
+
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        with mock.patch('mantidqt.project.project.ProjectSaver.save_project') as saver:
+            self.project._save()
+
+        self.assertEqual({"ws3"}, saver.call_args[1]["unchanged_workspaces"])
+
+    def test_all_workspaces_are_written_when_saving_to_a_new_location(self):
+        self.project.skip_unchanged_workspaces = True
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        self._save_to_temporary_project()
+
+        with mock.patch('mantidqt.project.project.ProjectSaver.save_project') as saver:
+            self.project.last_project_location = os.path.join(tempfile.gettempdir(), "other", "temp.mtdproj")
+            self.project._save()
+
+        self.assertEqual(set(), saver.call_args[1]["unchanged_workspaces"])
 
     @staticmethod
     def create_altered_and_unaltered_mock_workspaces():
@@ -10,6 +10,7 @@
 import unittest
 
 from os import listdir
+from os import path
 from os.path import isdir
 from shutil import rmtree
 import tempfile
@@ -59,6 +60,27 @@ class WorkspaceSaverTest(unittest.TestCase):
         self.assertTrue(ws2_name + ".nxs" in list_of_files)
         self.assertTrue(ws1_name + ".nxs" in list_of_files)
 
+    @mock.patch("mantid.simpleapi.SaveNexusProcessed")
+    def test_unchanged_workspaces_are_not_written_again(self, save_nexus):
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory)
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+        CreateSampleWorkspace(OutputWorkspace="ws2")
+        open(path.join(self.working_directory, "ws1.nxs"), "w").close()
+
+        ws_saver.save_workspaces(["ws1", "ws2"], unchanged_workspaces={"ws1"})
+
+        save_nexus.assert_called_once_with(InputWorkspace="ws2", Filename=path.join(self.working_directory, "ws2.nxs"))
+        self.assertEqual(["ws1", "ws2"], ws_saver.get_output_list())
+
+    def test_unchanged_workspaces_are_written_if_their_file_is_missing(self):
+        ws_saver = workspacesaver.WorkspaceSaver(self.working_directory)
+        CreateSampleWorkspace(OutputWorkspace="ws1")
+
+        ws_saver.save_workspaces(["ws1"], unchanged_workspaces={"ws1"})
+
+        self.assertEqual(["ws1.nxs"], listdir(self.working_directory))
+        self.assertEqual(["ws1"], ws_saver.get_output_list())
+
     def test_when_MDWorkspace_is_in_ADS(self):
         ws_saver = workspacesaver.WorkspaceSaver(self.working_directory)
         ws1 = CreateMDHistoWorkspace(SignalInput='1,2,3,4,5,6,7,8,9', ErrorInput='1,1,1,1,1,1,1,1,1',
@@ -22,39 +22,59 @@ class WorkspaceSaver(object):
         self.directory = directory
         self.output_list = []
 
-    def save_workspaces(self, workspaces_to_save=None):
+    def save_workspaces(self, workspaces_to_save=None, unchanged_workspaces=None):
         """
         Use the private method _get_workspaces_to_save to get a list of workspaces that are present in the ADS to save
         to the directory that was passed at object creation time, it will also add each of them to the output_list
         private instance variable on the WorkspaceSaver class.
         :param workspaces_to_save: List of Strings; The workspaces that are to be saved to the project.
+        :param unchanged_workspaces: Iterable of Strings; The workspaces that have not changed since they were last
+        saved to the directory. These are not written again if their file is still present.
         """
 
         # Handle getting here and nothing has been given passed
         if workspaces_to_save is None:
             return
 
+        if unchanged_workspaces is None:
+            unchanged_workspaces = set()
+
         for workspace_name in workspaces_to_save:
-            # Get the workspace from the ADS
-            workspace = ADS.retrieve(workspace_name)
-            place_to_save_workspace = os.path.join(self.directory, workspace_name)
+            if workspace_name in unchanged_workspaces and os.path.isfile(self._get_file_name(workspace_name)):
+                self.output_list.append(workspace_name)
+            elif self._save_workspace(workspace_name):
+                self.output_list.append(workspace_name)
+
+    def _save_workspace(self, workspace_name):
+        """
+        Save a single workspace from the ADS to the directory
+        :param workspace_name: String; The name of the workspace to save
+        :return: Bool; True if the workspace was saved
+        """
+        # Get the workspace from the ADS
+        workspace = ADS.retrieve(workspace_name)
+        file_name = self._get_file_name(workspace_name)
 
-            from mantid.simpleapi import SaveMD, SaveNexusProcessed
+        from mantid.simpleapi import SaveMD, SaveNexusProcessed
 
-            try:
-                if isinstance(workspace, MDHistoWorkspace) or isinstance(workspace, IMDEventWorkspace):
-                    # Save normally using SaveMD
-                    SaveMD(InputWorkspace=workspace_name, Filename=place_to_save_workspace + ".nxs")
-                elif isinstance(workspace, GroupingWorkspace):
-                    # catch this rather than leave SaveNexusProcessed to raise error to avoid message of type error
-                    # being logged
-                    raise RuntimeError("Grouping Workspaces not supported by SaveNexusProcessed")
-                else:
-                    # Save normally using SaveNexusProcessed
-                    SaveNexusProcessed(InputWorkspace=workspace_name, Filename=place_to_save_workspace + ".nxs")
-                self.output_list.append(workspace_name)
-            except Exception as exc:
-                logger.warning("Couldn't save workspace in project: \"" + workspace_name + "\" because " + str(exc))
+        try:
+            if isinstance(workspace, MDHistoWorkspace) or isinstance(workspace, IMDEventWorkspace):
+                # Save normally using SaveMD
+                SaveMD(InputWorkspace=workspace_name, Filename=file_name)
+            elif isinstance(workspace, GroupingWorkspace):
+                # catch this rather than leave SaveNexusProcessed to raise error to avoid message of type error
+                # being logged
+                raise RuntimeError("Grouping Workspaces not supported by SaveNexusProcessed")
+            else:
+                # Save normally using SaveNexusProcessed
+                SaveNexusProcessed(InputWorkspace=workspace_name, Filename=file_name)
+        except Exception as exc:
+            logger.warning("Couldn't save workspace in project: \"" + workspace_name + "\" because " + str(exc))
+            return False
+        return True
+
+    def _get_file_name(self, workspace_name):
+        return os.path.join(self.directory, workspace_name + ".nxs")
 
     def get_output_list(self):
         """
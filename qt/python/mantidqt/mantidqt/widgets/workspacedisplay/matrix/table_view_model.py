@@ -8,6 +8,9 @@
 #  This file is part of the mantid workbench.
 #
 #
+from collections import OrderedDict
+
+import numpy as np
 from qtpy import QtGui
 from qtpy.QtCore import QVariant, Qt, QAbstractTableModel
 from enum import Enum
@@ -46,6 +49,11 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
 
     BLANK_CELL_TOOLTIP = "This cell is blank because the workspace is ragged."
 
+    # The data is read from the workspace in blocks of contiguous rows, and only the most
+    # recently used blocks are kept, which is enough to cover a scrolled viewport
+    ROW_BLOCK_SIZE = 64
+    MAX_CACHED_ROW_BLOCKS = 8
+
     def __init__(self, ws, model_type):
         """
         :param ws:
@@ -63,10 +71,15 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         self.row_count = self.ws.getNumberHistograms()
         self.column_count = self.ws.getMaxNumberBins()
 
-        self.masked_rows_cache = []
-        self.monitor_rows_cache = []
+        self.row_blocks_cache = OrderedDict()
+        # Row flags are read from SpectrumInfo the first time they are needed
+        self.detector_rows_cache = np.zeros(self.row_count, dtype=bool)
+        self.masked_rows_cache = np.zeros(self.row_count, dtype=bool)
+        self.monitor_rows_cache = np.zeros(self.row_count, dtype=bool)
+        self._detector_rows_read = np.zeros(self.row_count, dtype=bool)
+        self._masked_rows_read = np.zeros(self.row_count, dtype=bool)
+        self._monitor_rows_read = np.zeros(self.row_count, dtype=bool)
         self.masked_bins_cache = {}
-        self.blank_cell_cache = {}
 
         self.masked_color = QtGui.QColor(240, 240, 240)
         self.monitor_color = QtGui.QColor(255, 253, 209)
@@ -175,8 +188,9 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         column = index.column()
         if role == Qt.DisplayRole:
             # DisplayRole determines the text of each cell
-            if self.has_data_at(row, column):
-                return str(self.relevant_data(row)[column])
+            row_data = self._get_row_data(row)
+            if column < len(row_data):
+                return str(row_data[column])
             # The cell is blank
             return self.BLANK_CELL_STRING
         elif role == Qt.BackgroundRole:
@@ -227,11 +241,7 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         :param row: The index of the spectrum in the workspace.
         :return: True if the spectrum is masked.
         """
-        if row in self.masked_rows_cache:
-            return True
-        elif self.ws_spectrum_info.hasDetectors(row) and self.ws_spectrum_info.isMasked(row):
-            self.masked_rows_cache.append(row)
-            return True
+        return self._read_row_flag(row, self.masked_rows_cache, self._masked_rows_read, self.ws_spectrum_info.isMasked)
 
     def checkMonitorCache(self, row):
         """
@@ -239,11 +249,7 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         :param row: The index of the spectrum in the workspace.
         :return: True if the spectrum is a monitor.
         """
-        if row in self.monitor_rows_cache:
-            return True
-        elif self.ws_spectrum_info.hasDetectors(row) and self.ws_spectrum_info.isMonitor(row):
-            self.monitor_rows_cache.append(row)
-            return True
+        return self._read_row_flag(row, self.monitor_rows_cache, self._monitor_rows_read, self.ws_spectrum_info.isMonitor)
 
     def checkMaskedBinCache(self, row, column):
         """
@@ -252,16 +258,10 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         :param column: The column index of the cell.
         :return: True if the cell is masked.
         """
-        if row in self.masked_bins_cache:
-            # retrieve the masked bins IDs from the cache
-            if column in self.masked_bins_cache[row]:
-                return True
-
-        elif self.ws.hasMaskedBins(row):
-            masked_bins = self.ws.maskedBinsIndices(row)
-            if column in masked_bins:
-                self.masked_bins_cache[row] = masked_bins
-                return True
+        if row not in self.masked_bins_cache:
+            # an empty set is cached for rows without masked bins so that they are not checked again
+            self.masked_bins_cache[row] = set(self.ws.maskedBinsIndices(row)) if self.ws.hasMaskedBins(row) else set()
+        return column in self.masked_bins_cache[row]
 
     def checkBlankCache(self, row, column):
         """
@@ -270,15 +270,7 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         :param column: The column index of the cell.
         :return: True if the cell should be blank.
         """
-        if row in self.blank_cell_cache and column in self.blank_cell_cache[row]:
-            return True
-        elif not self.has_data_at(row, column):
-            if row in self.blank_cell_cache:
-                self.blank_cell_cache[row].append(column)
-            else:
-                self.blank_cell_cache[row] = [column]
-            return True
-        return False
+        return not self.has_data_at(row, column)
 
     def has_data_at(self, row, column):
         """
@@ -287,8 +279,62 @@ class MatrixWorkspaceTableViewModel(QAbstractTableModel):
         :param column: The column index of the data to check.
         :return: True if data exists at a specific location.
         """
+        return column < len(self._get_row_data(row))
+
+    def _get_row_data(self, row):
+        """
+        Returns the relevant data of a row, reading the block of rows containing it if it is not cached.
+        :param row: The index of the spectrum in the workspace.
+        :return: A numpy array of the data, which is empty if the row does not exist.
+        """
+        if not 0 <= row < self.row_count:
+            # rows outside the workspace are not part of any block
+            return self._read_row(row)
+        block_index = row // self.ROW_BLOCK_SIZE
+        if block_index in self.row_blocks_cache:
+            self.row_blocks_cache.move_to_end(block_index)
+        else:
+            self.row_blocks_cache[block_index] = self._read_row_block(block_index)
+            if len(self.row_blocks_cache) > self.MAX_CACHED_ROW_BLOCKS:
+                self.row_blocks_cache.popitem(last=False)
+        return self.row_blocks_cache[block_index][row % self.ROW_BLOCK_SIZE]
+
+    def _read_row_block(self, block_index):
+        """
+        Copies the relevant data of a block of rows out of the workspace.
+        :param block_index: The index of the block of rows.
+        :return: A list of numpy arrays, one for each row of the block in the workspace.
+        """
+        first_row = block_index * self.ROW_BLOCK_SIZE
+        return [self._read_row(row) for row in range(first_row, min(first_row + self.ROW_BLOCK_SIZE, self.row_count))]
+
+    def _read_row(self, row):
+        """
+        Copies the relevant data of a row out of the workspace.
+        :param row: The index of the spectrum in the workspace.
+        :return: A numpy array of the data, which is empty if the row does not exist.
+        """
         try:
-            row_data = self.relevant_data(row)
-            return column < len(row_data)
+            return np.array(self.relevant_data(row))
         except IndexError:
-            return False
+            return np.empty(0)
+
+    def _read_row_flag(self, row, flags, flags_read, spectrum_info_check):
+        """
+        Returns a flag of a row, reading it from SpectrumInfo the first time it is needed.
+        Only spectra with detectors can be masked or monitors.
+        :param row: The index of the spectrum in the workspace. Flags of rows outside the workspace are not cached.
+        :param flags: The array of cached flags.
+        :param flags_read: The array recording which of the flags have been read.
+        :param spectrum_info_check: The SpectrumInfo method returning the flag of a spectrum.
+        :return: The flag of the row.
+        """
+        if not 0 <= row < self.row_count:
+            return bool(self.ws_spectrum_info.hasDetectors(row) and spectrum_info_check(row))
+        if not flags_read[row]:
+            if not self._detector_rows_read[row]:
+                self.detector_rows_cache[row] = self.ws_spectrum_info.hasDetectors(row)
+                self._detector_rows_read[row] = True
+            flags[row] = self.detector_rows_cache[row] and spectrum_info_check(row)
+            flags_read[row] = True
+        return bool(flags[row])
@@ -37,6 +37,8 @@ def setup_common_for_test_data():
     model_type = MatrixWorkspaceTableViewModelType.x
     # pass onto the MockWorkspace so that it returns it when read from the TableViewModel
     ws = MockWorkspace(read_return=mock_data)
+    # the workspace has to contain the row
+    ws.getNumberHistograms = Mock(return_value=row + 1)
     ws.hasMaskedBins = Mock(return_value=True)
     ws.maskedBinsIndices = Mock(return_value=[column])
     model = MatrixWorkspaceTableViewModel(ws, model_type)
@@ -101,6 +103,44 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
         model.relevant_data.assert_called_with(row)
         self.assertEqual(str(mock_data[column]), output)
 
+    def test_data_is_read_in_blocks_of_rows(self):
+        ws = MockWorkspace(read_return=[1, 2, 3])
+        ws.getNumberHistograms = Mock(return_value=3 * MatrixWorkspaceTableViewModel.ROW_BLOCK_SIZE)
+        model = MatrixWorkspaceTableViewModel(ws, MatrixWorkspaceTableViewModelType.y)
+
+        model.data(MockQModelIndex(0, 0), Qt.DisplayRole)
+        model.data(MockQModelIndex(1, 2), Qt.DisplayRole)
+
+        # the whole first block is read by the first request, and the second one is served from the cache
+        self.assertEqual(MatrixWorkspaceTableViewModel.ROW_BLOCK_SIZE, ws.readY.call_count)
+        ws.readY.assert_has_calls([call(row) for row in range(MatrixWorkspaceTableViewModel.ROW_BLOCK_SIZE)])
+
+    def test_least_recently_used_row_blocks_are_evicted(self):
+        ws = MockWorkspace(read_return=[1, 2, 3])
+        ws.getNumberHistograms = Mock(return_value=3 * MatrixWorkspaceTableViewModel.ROW_BLOCK_SIZE)
+        model = MatrixWorkspaceTableViewModel(ws, MatrixWorkspaceTableViewModelType.y)
+        model.MAX_CACHED_ROW_BLOCKS = 2
+        block_size = model.ROW_BLOCK_SIZE
+
+        model.data(MockQModelIndex(0, 0), Qt.DisplayRole)
+        model.data(MockQModelIndex(block_size, 0), Qt.DisplayRole)
+        # use the first block again so that the second one is the least recently used
+        model.data(MockQModelIndex(0, 0), Qt.DisplayRole)
+        model.data(MockQModelIndex(2 * block_size, 0), Qt.DisplayRole)
+
+        self.assertEqual([0, 2], list(model.row_blocks_cache.keys()))
+        self.assertEqual(3 * block_size, ws.readY.call_count)
+
+    def test_cells_past_the_end_of_ragged_rows_are_blank(self):
+        ws = MockWorkspace()
+        ws.readY = Mock(side_effect=lambda row: [1, 2] if row == 0 else [1])
+        model = MatrixWorkspaceTableViewModel(ws, MatrixWorkspaceTableViewModelType.y)
+
+        self.assertEqual("2", model.data(MockQModelIndex(0, 1), Qt.DisplayRole))
+        self.assertEqual(MatrixWorkspaceTableViewModel.BLANK_CELL_STRING, model.data(MockQModelIndex(1, 1), Qt.DisplayRole))
+        self.assertTrue(model.checkBlankCache(1, 1))
+        self.assertFalse(model.checkBlankCache(1, 0))
+
     def test_row_and_column_count(self):
         ws = MockWorkspace()
         model_type = MatrixWorkspaceTableViewModelType.x
@@ -159,9 +199,8 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
         output = model.data(index, Qt.BackgroundRole)
 
         model.ws_spectrum_info.hasDetectors.assert_called_with(row)
-        # assert that it has been called twice with the same parameters
-        model.ws_spectrum_info.isMasked.assert_has_calls([call.do_work(row), call.do_work(row)])
-        # only called once, as the 2nd time should have hit the cached monitor
+        # the flags of the row were cached the first time, so they are not read again
+        model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
         self.assertEqual(model.monitor_color, output)
 
@@ -192,12 +231,12 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
         # as the functions would be called a 2nd time
         output = model.data(index, Qt.BackgroundRole)
 
-        # masked bins is checked last, so it will call all other functions a second time
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
-        model.ws_spectrum_info.isMasked.assert_has_calls([call.do_work(row), call.do_work(row)])
-        model.ws_spectrum_info.isMonitor.assert_has_calls([call.do_work(row), call.do_work(row)])
+        # the row flags were cached the first time, so they are not read again
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
+        model.ws_spectrum_info.isMasked.assert_called_once_with(row)
+        model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
-        # these, however, should remain at 1 call, as the masked bin cache should have been hit
+        # the masked bin cache should have been hit as well
         ws.hasMaskedBins.assert_called_once_with(row)
         ws.maskedBinsIndices.assert_called_once_with(row)
 
@@ -217,7 +256,7 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         output = model.data(index, Qt.ToolTipRole)
 
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
@@ -225,12 +264,10 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         output = model.data(index, Qt.ToolTipRole)
 
-        # The row was masked so it should have been cached
+        # Both row flags should have been cached
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
-
-        # However it is checked if it is a monitor again
-        self.assertEqual(3, model.ws_spectrum_info.hasDetectors.call_count)
-        self.assertEqual(2, model.ws_spectrum_info.isMonitor.call_count)
+        model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
         self.assertEqual(MatrixWorkspaceTableViewModel.MASKED_ROW_TOOLTIP, output)
 
@@ -244,7 +281,7 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         output = model.data(index, Qt.ToolTipRole)
 
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
@@ -252,7 +289,7 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         # Doing the same thing a second time should hit the cache, so no additional calls will have been made
         output = model.data(index, Qt.ToolTipRole)
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
@@ -271,7 +308,7 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         output = model.data(index, Qt.ToolTipRole)
 
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
@@ -279,9 +316,8 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         # Doing the same thing a second time should hit the cache, so no additional calls will have been made
         output = model.data(index, Qt.ToolTipRole)
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
-        self.assertEqual(2, model.ws_spectrum_info.isMasked.call_count)
-        # This was called only once because the monitor was cached
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
+        model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
         self.assertEqual(MatrixWorkspaceTableViewModel.MONITOR_ROW_TOOLTIP, output)
@@ -299,7 +335,7 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         output = model.data(index, Qt.ToolTipRole)
 
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
@@ -308,9 +344,8 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         # Doing the same thing a second time should hit the cache, so no additional calls will have been made
         output = model.data(index, Qt.ToolTipRole)
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
-        self.assertEqual(2, model.ws_spectrum_info.isMasked.call_count)
-        # This was called only once because the monitor was cached
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
+        model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
         self.assertEqual(
@@ -329,7 +364,7 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         output = model.data(index, Qt.ToolTipRole)
 
-        model.ws_spectrum_info.hasDetectors.assert_has_calls([call.do_work(row), call.do_work(row)])
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
         model.ws_spectrum_info.isMasked.assert_called_once_with(row)
         model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
 
@@ -337,10 +372,10 @@ class MatrixWorkspaceDisplayTableViewModelTest(unittest.TestCase):
 
         # Doing the same thing a second time should hit the cache, so no additional calls will have been made
         output = model.data(index, Qt.ToolTipRole)
-        self.assertEqual(4, model.ws_spectrum_info.hasDetectors.call_count)
-        self.assertEqual(2, model.ws_spectrum_info.isMasked.call_count)
-        self.assertEqual(2, model.ws_spectrum_info.isMonitor.call_count)
-        # This was called only once because the monitor was cached
+        model.ws_spectrum_info.hasDetectors.assert_called_once_with(row)
+        model.ws_spectrum_info.isMasked.assert_called_once_with(row)
+        model.ws_spectrum_info.isMonitor.assert_called_once_with(row)
+        # This was called only once because the masked bins were cached
         ws.hasMaskedBins.assert_called_once_with(row)
         ws.maskedBinsIndices.assert_called_once_with(row)
 
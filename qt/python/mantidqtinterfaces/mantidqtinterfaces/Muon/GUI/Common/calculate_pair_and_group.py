@@ -4,7 +4,11 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import numpy as np
+
+from mantid.api import WorkspaceFactory
 import mantidqtinterfaces.Muon.GUI.Common.utilities.algorithm_utils as algorithm_utils
+from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.ADS_calls import add_ws_to_ads, retrieve_ws
 from mantidqtinterfaces.Muon.GUI.Common.utilities.run_string_utils import run_list_to_string
 from mantidqtinterfaces.Muon.GUI.Common.muon_pair import MuonPair
 from typing import Iterable
@@ -21,6 +25,66 @@ def calculate_group_data(context, group, run, workspace_name, periods):
     return group_data
 
 
+def calculate_groups_data(context, groups, run, workspace_names, period):
+    """
+    Calculates the counts of several groups from a single period of the pre-processed data. The counts of all the
+    groups are summed in one pass by applying a grouping matrix to the spectra of the period, which gives the same
+    workspaces as running MuonGroupingCounts for each group. Returns the list of calculated workspace names.
+    """
+    processed_data = retrieve_ws(get_pre_process_workspace_name(run, context.data_context.instrument))
+    period_workspace = processed_data.getItem(period - 1)
+
+    group_indices = [list(period_workspace.getIndicesFromDetectorIDs(list(group.detectors))) for group in groups]
+    batched = [not period_workspace.isRaggedWorkspace() and len(indices) == len(group.detectors)
+               for group, indices in zip(groups, group_indices)]
+
+    grouping_matrix = np.zeros((len(groups), period_workspace.getNumberHistograms()))
+    for row, indices in enumerate(group_indices):
+        if batched[row]:
+            np.add.at(grouping_matrix[row], indices, 1.0)
+    counts = grouping_matrix @ period_workspace.extractY()
+    errors = np.sqrt(grouping_matrix @ period_workspace.extractE() ** 2)
+
+    group_data = []
+    for row, (group, indices, workspace_name) in enumerate(zip(groups, group_indices, workspace_names)):
+        if not batched[row]:
+            # MuonGroupingCounts reports detectors missing from the data
+            group_data.append(calculate_group_data(context, group, run, workspace_name, [period]))
+            continue
+        group_workspace = WorkspaceFactory.create(period_workspace, NVectors=1)
+        group_workspace.setX(0, period_workspace.readX(indices[0]))
+        group_workspace.setY(0, counts[row])
+        group_workspace.setE(0, errors[row])
+
+        spectrum = group_workspace.getSpectrum(0)
+        spectrum.clearDetectorIDs()
+        for index in indices:
+            for detector_id in period_workspace.getSpectrum(index).getDetectorIDs():
+                spectrum.addDetectorID(detector_id)
+        spectrum.setSpectrumNo(1)
+
+        _add_grouping_sample_logs(group_workspace, group, [period])
+        add_ws_to_ads(workspace_name, group_workspace)
+        group_data.append(workspace_name)
+
+    return group_data
+
+
+def rebin_group_data(context, run, workspace_name, rebinned_workspace_name):
+    """
+    Rebins the counts of a group with the rebin options of the GUI. As grouping and rebinning commute, this gives the
+    same workspace as grouping the rebinned pre-processed data.
+    """
+    rebin_options = {}
+    _setup_rebin_options(context, rebin_options, run)
+    rebin_args = str(rebin_options["RebinArgs"])
+
+    algorithm_utils.run_rebin(workspace_name, rebinned_workspace_name, rebin_args)
+    retrieve_ws(rebinned_workspace_name).mutableRun().addProperty("analysis_rebin_args", rebin_args, True)
+
+    return rebinned_workspace_name
+
+
 def calculate_pair_data(pair: MuonPair, forward_group: str, backward_group: str, output_workspace_name: str):
     params = _get_MuonPairingAsymmetry_parameters(pair, forward_group, backward_group)
     pair_data = algorithm_utils.run_MuonPairingAsymmetry(params, output_workspace_name)
@@ -115,6 +179,14 @@ def _get_MuonGroupingCounts_parameters(group, periods):
     return params
 
 
+def _add_grouping_sample_logs(workspace, group, periods):
+    run = workspace.mutableRun()
+    run.addProperty("analysis_group_name", group.name, True)
+    run.addProperty("analysis_group", ",".join([str(i) for i in group.detectors]), True)
+    run.addProperty("analysis_periods_summed", ",".join([str(i) for i in periods]), True)
+    run.addProperty("analysis_periods_subtracted", "", True)
+
+
 def _get_EstimateMuonAsymmetryFromCounts_parameters(context, group, run, periods):
     params = {}
 
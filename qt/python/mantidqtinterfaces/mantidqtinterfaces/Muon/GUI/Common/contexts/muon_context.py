@@ -11,13 +11,13 @@ from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.workspace_naming import (get_
                                                                             get_deadtime_data_workspace_name,
                                                                             get_pair_phasequad_name,
                                                                             add_phasequad_extensions, get_diff_asymmetry_name)
-from mantidqtinterfaces.Muon.GUI.Common.calculate_pair_and_group import calculate_group_data, calculate_pair_data, \
-    estimate_group_asymmetry_data, run_pre_processing
+from mantidqtinterfaces.Muon.GUI.Common.calculate_pair_and_group import calculate_group_data, calculate_groups_data, \
+    calculate_pair_data, estimate_group_asymmetry_data, rebin_group_data, run_pre_processing
 from mantidqtinterfaces.Muon.GUI.Common.utilities.run_string_utils import run_list_to_string, run_string_to_list
 from mantidqtinterfaces.Muon.GUI.Common.utilities.algorithm_utils import run_PhaseQuad, split_phasequad, rebin_ws, apply_deadtime, \
     run_minus, run_crop_workspace, run_create_workspace, run_convert_to_points, run_convert_to_histogram, run_divide
 import mantidqtinterfaces.Muon.GUI.Common.ADSHandler.workspace_naming as wsName
-from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.ADS_calls import retrieve_ws, delete_ws
+from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.ADS_calls import check_if_workspace_exist, retrieve_ws, delete_ws
 from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.workspace_group_definition import add_to_group
 from mantidqtinterfaces.Muon.GUI.Common.contexts.muon_group_pair_context import get_default_grouping
 from mantidqtinterfaces.Muon.GUI.Common.contexts.muon_context_ADS_observer import MuonContextADSObserver
@@ -27,6 +27,7 @@ from mantidqtinterfaces.Muon.GUI.Common.muon_base import MuonRun
 from mantidqtinterfaces.Muon.GUI.Common.muon_pair import MuonPair
 from mantidqtinterfaces.Muon.GUI.Common.muon_diff import MuonDiff
 from typing import List
+from collections import defaultdict
 
 
 class MuonContext(object):
@@ -203,15 +204,61 @@ class MuonContext(object):
 
     def _calculate_all_counts(self, rebin):
         for run in self._data_context.current_runs:
-            run_pre_processing(context=self, run=run, rebin=rebin)
+            if rebin:
+                counts_workspaces = self._calculate_all_rebinned_counts_for_run(run)
+            else:
+                run_pre_processing(context=self, run=run, rebin=False)
+                counts_workspaces = self._calculate_all_counts_for_run(run)
+
             for group in self._group_pair_context.groups:
-                counts_workspace = self.calculate_counts(run, group, rebin)
+                counts_workspace = counts_workspaces.get(group.name)
 
                 if not counts_workspace:
                     continue
 
                 self.group_pair_context[group.name].update_counts_workspace(MuonRun(run), counts_workspace, rebin)
 
+    def _calculate_all_counts_for_run(self, run):
+        """Calculates the counts workspaces of all the groups for the given run. The groups summing a single period
+        are calculated together from the pre-processed data of that period."""
+        run_as_string = run_list_to_string(run)
+        counts_workspaces = {}
+        groups_for_period = defaultdict(list)
+        for group in self._group_pair_context.groups:
+            periods = [period for period in group.periods if period <= self.num_periods(run)]
+            if len(periods) == 1:
+                groups_for_period[periods[0]].append(group)
+            else:
+                counts_workspaces[group.name] = self.calculate_counts(run, group, rebin=False)
+
+        for period, groups in groups_for_period.items():
+            output_names = [get_group_data_workspace_name(self, group.name, run_as_string,
+                                                          run_list_to_string(group.periods), rebin=False)
+                            for group in groups]
+            group_names = [group.name for group in groups]
+            counts_workspaces.update(zip(group_names, calculate_groups_data(self, groups, run, output_names, period)))
+
+        return counts_workspaces
+
+    def _calculate_all_rebinned_counts_for_run(self, run):
+        """Calculates the rebinned counts workspaces of all the groups for the given run by rebinning their counts
+        workspaces, rather than grouping the pre-processed data again."""
+        run_as_string = run_list_to_string(run)
+        counts_workspaces = {}
+        for group in self._group_pair_context.groups:
+            if not any(period <= self.num_periods(run) for period in group.periods):
+                continue
+
+            periods_as_string = run_list_to_string(group.periods)
+            counts_name = get_group_data_workspace_name(self, group.name, run_as_string, periods_as_string, rebin=False)
+            if not check_if_workspace_exist(counts_name):
+                continue
+
+            rebinned_name = get_group_data_workspace_name(self, group.name, run_as_string, periods_as_string, rebin=True)
+            counts_workspaces[group.name] = rebin_group_data(self, run, counts_name, rebinned_name)
+
+        return counts_workspaces
+
     def calculate_asymmetry_for(self, run, group, rebin):
         asymmetry_workspaces = self.calculate_asymmetry(run, group, rebin)
 
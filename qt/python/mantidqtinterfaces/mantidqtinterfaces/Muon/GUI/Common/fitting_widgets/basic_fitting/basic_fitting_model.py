@@ -5,6 +5,7 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 from mantid import AlgorithmManager, logger
+from mantidqt.utils.observer_pattern import GenericObservable
 from mantid.api import CompositeFunction, IAlgorithm, IFunction
 from mantid.simpleapi import CopyLogs, EvaluateFunction
 from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.workspace_group_definition import add_list_to_group
@@ -31,12 +32,15 @@ from mantidqtinterfaces.Muon.GUI.Common.utilities.workspace_utils import StaticW
 import math
 import numpy as np
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
 from typing import List, NamedTuple
 
 DEFAULT_CHI_SQUARED = 0.0
 DEFAULT_FIT_STATUS = None
 DEFAULT_SINGLE_FIT_FUNCTION = None
 DEFAULT_START_X = 0.0
+MAX_CONCURRENT_FITS = 4
 
 
 def get_function_name_for_composite(composite: CompositeFunction) -> str:
@@ -67,6 +71,11 @@ class BasicFittingModel:
         self.context = context
         self.fitting_context = fitting_context
 
+        # Notified on the fitting thread with (row index, function, fit status, chi squared) after each fit of a
+        # sequential fit, so subscribers must not update widgets directly
+        self.sequential_fit_row_finished_notifier = GenericObservable()
+        self._fit_results_lock = Lock()
+
     @property
     def current_dataset_index(self) -> int:
         """Returns the index of the currently selected dataset."""
@@ -748,17 +757,21 @@ class BasicFittingModel:
         parameter_table_name, _ = create_parameter_table_name(input_workspace_name, function_name)
         covariance_matrix_name, _ = create_covariance_matrix_name(input_workspace_name, function_name)
 
-        self._add_workspace_to_ADS(output_workspace, output_workspace_name, directory)
-        self._add_workspace_to_ADS(parameters_table, parameter_table_name, directory)
-        self._add_workspace_to_ADS(covariance_matrix, covariance_matrix_name, directory)
+        # Fits of a sequential fit may finish concurrently, so their results are added one at a time
+        with self._fit_results_lock:
+            self._add_workspace_to_ADS(output_workspace, output_workspace_name, directory)
+            self._add_workspace_to_ADS(parameters_table, parameter_table_name, directory)
+            self._add_workspace_to_ADS(covariance_matrix, covariance_matrix_name, directory)
 
-        output_workspace_wrap = StaticWorkspaceWrapper(output_workspace_name, retrieve_ws(output_workspace_name))
-        parameter_workspace_wrap = StaticWorkspaceWrapper(parameter_table_name, retrieve_ws(parameter_table_name))
-        covariance_workspace_wrap = StaticWorkspaceWrapper(covariance_matrix_name, retrieve_ws(covariance_matrix_name))
+            output_workspace_wrap = StaticWorkspaceWrapper(output_workspace_name, retrieve_ws(output_workspace_name))
+            parameter_workspace_wrap = StaticWorkspaceWrapper(parameter_table_name, retrieve_ws(parameter_table_name))
+            covariance_workspace_wrap = StaticWorkspaceWrapper(covariance_matrix_name,
+                                                               retrieve_ws(covariance_matrix_name))
 
-        self._add_workspaces_to_group([output_workspace_name, parameter_table_name, covariance_matrix_name], directory[:-1])
-        self._add_fit_to_context([input_workspace_name], [output_workspace_wrap], parameter_workspace_wrap,
-                                 covariance_workspace_wrap)
+            self._add_workspaces_to_group([output_workspace_name, parameter_table_name, covariance_matrix_name],
+                                          directory[:-1])
+            self._add_fit_to_context([input_workspace_name], [output_workspace_wrap], parameter_workspace_wrap,
+                                     covariance_workspace_wrap)
 
     def _add_fit_to_context(self, input_workspace_names: list, output_workspaces: list,
                             parameter_workspace: StaticWorkspaceWrapper, covariance_workspace: StaticWorkspaceWrapper) -> None:
@@ -1016,10 +1029,12 @@ class BasicFittingModel:
         self._set_fit_function_parameter_values(single_fit_function, parameter_values)
         return single_fit_function
 
-    @staticmethod
-    def _evaluate_sequential_fit(fitting_func, workspace_names: list, parameter_values: list,
+    def _evaluate_sequential_fit(self, fitting_func, workspace_names: list, parameter_values: list,
                                  use_initial_values: bool = False):
         """Evaluates a sequential fit using the provided fitting func. The workspace_names is either a 1D or 2D list."""
+        if use_initial_values and len(workspace_names) > 1:
+            return self._evaluate_independent_fits(fitting_func, workspace_names, parameter_values)
+
         functions, fit_statuses, chi_squared_list = [], [], []
 
         for row_index, row_workspaces in enumerate(workspace_names):
@@ -1029,6 +1044,35 @@ class BasicFittingModel:
             functions.append(function)
             fit_statuses.append(fit_status)
             chi_squared_list.append(chi_squared)
+            self.sequential_fit_row_finished_notifier.notify_subscribers((row_index, function, fit_status,
+                                                                          chi_squared))
+
+        return functions, fit_statuses, chi_squared_list
+
+    def _evaluate_independent_fits(self, fitting_func, workspace_names: list, parameter_values: list):
+        """Evaluates a sequential fit where every fit starts from its initial values. The fits do not depend on each
+        other, so they are run concurrently and the subscribers are notified as each one finishes."""
+        number_of_fits = len(workspace_names)
+        functions, fit_statuses, chi_squared_list = [None] * number_of_fits, [None] * number_of_fits, \
+            [None] * number_of_fits
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FITS) as executor:
+            fits = {executor.submit(fitting_func, row_index, row_workspaces, parameter_values[row_index], [], True):
+                    row_index for row_index, row_workspaces in enumerate(workspace_names)}
+            try:
+                for fit in as_completed(fits):
+                    row_index = fits[fit]
+                    function, fit_status, chi_squared = fit.result()
+
+                    functions[row_index] = function
+                    fit_statuses[row_index] = fit_status
+                    chi_squared_list[row_index] = chi_squared
+                    self.sequential_fit_row_finished_notifier.notify_subscribers((row_index, function, fit_status,
+                                                                                  chi_squared))
+            except Exception:
+                for fit in fits:
+                    fit.cancel()
+                raise
 
         return functions, fit_statuses, chi_squared_list
 
@@ -363,22 +363,27 @@ class GeneralFittingModel(BasicFittingModel):
         """Adds the results of a simultaneous fit to the ADS and fitting context."""
         function_name = self.fitting_context.function_name
 
-        output_workspace_wraps, directory = self._create_output_workspace_wraps(input_workspace_names, function_name,
-                                                                                output_group_workspace)
-
-        parameter_table_name, _ = create_parameter_table_name(input_workspace_names[0] + "+ ...", function_name)
-        covariance_matrix_name, _ = create_covariance_matrix_name(input_workspace_names[0] + "+ ...", function_name)
-
-        self._add_workspace_to_ADS(parameter_table, parameter_table_name, directory)
-        self._add_workspace_to_ADS(covariance_matrix, covariance_matrix_name, directory)
-
-        parameter_workspace_wrap = StaticWorkspaceWrapper(parameter_table_name, retrieve_ws(parameter_table_name))
-        covariance_workspace_wrap = StaticWorkspaceWrapper(covariance_matrix_name, retrieve_ws(covariance_matrix_name))
-        # the directory returns with a slash, so lets remove it
-        self._add_workspaces_to_group([parameter_table_name, covariance_matrix_name], directory[:-1])
-
-        self._add_fit_to_context(input_workspace_names, output_workspace_wraps, parameter_workspace_wrap,
-                                 covariance_workspace_wrap, global_parameters)
+        # Fits of a sequential fit may finish concurrently, so their results are added one at a time
+        with self._fit_results_lock:
+            output_workspace_wraps, directory = self._create_output_workspace_wraps(input_workspace_names,
+                                                                                    function_name,
+                                                                                    output_group_workspace)
+
+            parameter_table_name, _ = create_parameter_table_name(input_workspace_names[0] + "+ ...", function_name)
+            covariance_matrix_name, _ = create_covariance_matrix_name(input_workspace_names[0] + "+ ...",
+                                                                      function_name)
+
+            self._add_workspace_to_ADS(parameter_table, parameter_table_name, directory)
+            self._add_workspace_to_ADS(covariance_matrix, covariance_matrix_name, directory)
+
+            parameter_workspace_wrap = StaticWorkspaceWrapper(parameter_table_name, retrieve_ws(parameter_table_name))
+            covariance_workspace_wrap = StaticWorkspaceWrapper(covariance_matrix_name,
+                                                               retrieve_ws(covariance_matrix_name))
+            # the directory returns with a slash, so lets remove it
+            self._add_workspaces_to_group([parameter_table_name, covariance_matrix_name], directory[:-1])
+
+            self._add_fit_to_context(input_workspace_names, output_workspace_wraps, parameter_workspace_wrap,
+                                     covariance_workspace_wrap, global_parameters)
 
     def _add_fit_to_context(self, input_workspace_names: list, output_workspaces: list,
                             parameter_workspace: StaticWorkspaceWrapper, covariance_workspace: StaticWorkspaceWrapper,
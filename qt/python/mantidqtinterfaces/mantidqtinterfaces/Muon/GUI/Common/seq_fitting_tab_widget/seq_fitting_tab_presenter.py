@@ -8,13 +8,17 @@ from mantidqtinterfaces.Muon.GUI.Common.fitting_widgets.basic_fitting.basic_fitt
 from mantidqt.utils.observer_pattern import GenericObserver, GenericObserverWithArgPassing, GenericObservable
 from mantidqtinterfaces.Muon.GUI.Common.thread_model_wrapper import ThreadModelWrapperWithOutput
 from mantidqtinterfaces.Muon.GUI.Common import thread_model
+from qtpy.QtCore import QObject, Qt, Signal, Slot
 
 import functools
 
 
-class SeqFittingTabPresenter(object):
+# This is a QObject so that fit table rows finished on the fitting thread can be filled in on the GUI thread
+class SeqFittingTabPresenter(QObject):
+    sequential_fit_row_finished = Signal(object)
 
     def __init__(self, view, model, context):
+        super(SeqFittingTabPresenter, self).__init__()
         self.view = view
         self.model = model
         self.context = context
@@ -38,6 +42,9 @@ class SeqFittingTabPresenter(object):
         self.fit_parameter_updated_observer = GenericObserver(self.handle_fit_function_parameter_changed)
         self.fit_parameter_changed_in_view = GenericObserverWithArgPassing(self.handle_updated_fit_parameter_in_table)
         self.selected_sequential_fit_notifier = GenericObservable()
+        self.sequential_fit_row_finished_observer = GenericObserverWithArgPassing(
+            self.handle_sequential_fit_row_finished)
+        self.sequential_fit_row_finished.connect(self._update_fit_table_row_for_finished_fit, Qt.QueuedConnection)
         self.disable_tab_observer = GenericObserver(lambda: self.view.
                                                     setEnabled(False))
         self.enable_tab_observer = GenericObserver(lambda: self.view.
@@ -125,9 +132,7 @@ class SeqFittingTabPresenter(object):
         fit_functions, fit_statuses, fit_chi_squareds = self.fitting_calculation_model.result
         for fit_function, fit_status, fit_chi_squared, row in zip(fit_functions, fit_statuses, fit_chi_squareds,
                                                                   self.selected_rows):
-            parameter_values = self.model.get_all_fit_function_parameter_values_for(fit_function)
-            self.view.fit_table.set_parameter_values_for_row(row, parameter_values)
-            self.view.fit_table.set_fit_quality(row, fit_status, fit_chi_squared)
+            self._update_fit_table_row(row, fit_function, fit_status, fit_chi_squared)
 
         self.view.seq_fit_button.setEnabled(True)
         self.view.fit_selected_button.setEnabled(True)
@@ -141,6 +146,22 @@ class SeqFittingTabPresenter(object):
 
         self.sequential_fit_finished_notifier.notify_subscribers()
 
+    def handle_sequential_fit_row_finished(self, fit_result):
+        """Fills in a row of the fit table as soon as its fit has finished, while the sequential fit is running. This
+        is called on the fitting thread, so the table is updated on the GUI thread through a queued signal."""
+        self.sequential_fit_row_finished.emit(fit_result)
+
+    @Slot(object)
+    def _update_fit_table_row_for_finished_fit(self, fit_result):
+        row_index, fit_function, fit_status, fit_chi_squared = fit_result
+        if row_index < len(self.selected_rows):
+            self._update_fit_table_row(self.selected_rows[row_index], fit_function, fit_status, fit_chi_squared)
+
+    def _update_fit_table_row(self, row, fit_function, fit_status, fit_chi_squared):
+        parameter_values = self.model.get_all_fit_function_parameter_values_for(fit_function)
+        self.view.fit_table.set_parameter_values_for_row(row, parameter_values)
+        self.view.fit_table.set_fit_quality(row, fit_status, fit_chi_squared)
+
     def handle_updated_fit_parameter_in_table(self, index):
         copy_param = self.view.copy_values_for_fits()
         if copy_param:
@@ -40,3 +40,5 @@ class SeqFittingTabWidget(object):
             self.seq_fitting_tab_view.fit_table.hide_workspace_column()
 
         context.deleted_plots_notifier.add_subscriber(self.seq_fitting_tab_presenter.selected_workspaces_observer)
+        self.seq_fitting_tab_model.sequential_fit_row_finished_notifier.add_subscriber(
+            self.seq_fitting_tab_presenter.sequential_fit_row_finished_observer)
@@ -303,6 +303,18 @@ def rebin_ws(ws, params):
     return alg.getProperty("OutputWorkspace").valueAsStr
 
 
+def run_rebin(ws, output_name, params):
+    alg = mantid.AlgorithmManager.create("Rebin")
+    alg.initialize()
+    alg.setAlwaysStoreInADS(True)
+    alg.setProperty("InputWorkspace", ws)
+    alg.setProperty("OutputWorkspace", output_name)
+    alg.setProperty("Params", params)
+    alg.setProperty("FullBinsOnly", False)
+    alg.execute()
+    return output_name
+
+
 def split_phasequad(name):
     Re_name = copy(name).replace(PHASEQUAD_IM, "")
     Im_name = copy(name).replace(PHASEQUAD_RE, "")
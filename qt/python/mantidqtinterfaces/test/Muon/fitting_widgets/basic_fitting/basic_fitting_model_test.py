@@ -9,6 +9,7 @@ from unittest import mock
 
 from mantid.api import AnalysisDataService, FrameworkManager, FunctionFactory
 from mantid.simpleapi import CreateEmptyTableWorkspace, CreateSampleWorkspace
+from mantidqt.utils.observer_pattern import GenericObserverWithArgPassing
 
 from mantidqtinterfaces.Muon.GUI.Common.contexts.fitting_contexts.basic_fitting_context import (X_FROM_FIT_RANGE,
                                                                                                 X_FROM_DATA_RANGE,
@@ -878,6 +879,38 @@ class BasicFittingModelTest(unittest.TestCase):
 
         self.assertEqual(message, "No data or fit function selected for fitting.")
 
+    def test_that_evaluate_sequential_fit_passes_the_previous_functions_on_when_not_using_initial_values(self):
+        fitting_func = mock.Mock(side_effect=lambda row_index, *_: ("function" + str(row_index), "success", row_index))
+        workspaces = ["ws1", "ws2", "ws3"]
+        parameter_values = [[0.1], [0.2], [0.3]]
+
+        functions, fit_statuses, chi_squared = self.model._evaluate_sequential_fit(
+            fitting_func, workspaces, parameter_values, False)
+
+        self.assertEqual(functions, ["function0", "function1", "function2"])
+        self.assertEqual(fit_statuses, ["success"] * 3)
+        self.assertEqual(chi_squared, [0, 1, 2])
+        fitting_func.assert_called_with(2, "ws3", [0.3], functions, False)
+
+    def test_that_evaluate_sequential_fit_runs_independent_fits_when_using_initial_values(self):
+        fitting_func = mock.Mock(side_effect=lambda row_index, *_: ("function" + str(row_index), "success", row_index))
+        workspaces = ["ws1", "ws2", "ws3"]
+        parameter_values = [[0.1], [0.2], [0.3]]
+        fit_finished_observer = mock.Mock()
+        self.model.sequential_fit_row_finished_notifier.add_subscriber(GenericObserverWithArgPassing(
+            fit_finished_observer))
+
+        functions, fit_statuses, chi_squared = self.model._evaluate_sequential_fit(
+            fitting_func, workspaces, parameter_values, True)
+
+        self.assertEqual(functions, ["function0", "function1", "function2"])
+        self.assertEqual(fit_statuses, ["success"] * 3)
+        self.assertEqual(chi_squared, [0, 1, 2])
+        fitting_func.assert_has_calls([mock.call(row_index, workspaces[row_index], parameter_values[row_index], [],
+                                                 True) for row_index in range(3)], any_order=True)
+        fit_finished_observer.assert_has_calls([mock.call((row_index, "function" + str(row_index), "success",
+                                                           row_index)) for row_index in range(3)], any_order=True)
+
     @mock.patch('mantidqtinterfaces.Muon.GUI.Common.fitting_widgets.basic_fitting.basic_fitting_model.make_group')
     @mock.patch('mantidqtinterfaces.Muon.GUI.Common.fitting_widgets.basic_fitting.basic_fitting_model.add_list_to_group')
     @mock.patch('mantidqtinterfaces.Muon.GUI.Common.fitting_widgets.basic_fitting.basic_fitting_model.check_if_workspace_exist')
@@ -10,6 +10,7 @@ from collections import Counter
 
 from mantid.api import AnalysisDataService, FileFinder
 from mantid import ConfigService
+from mantid.simpleapi import MuonGroupingCounts
 from mantidqt.utils.qt.testing import start_qapplication
 from mantidqtinterfaces.Muon.GUI.Common.calculate_pair_and_group import run_pre_processing
 from mantidqtinterfaces.Muon.GUI.Common.utilities.load_utils import load_workspace_from_filename
@@ -214,6 +215,38 @@ class MuonContextTest(unittest.TestCase):
                                   'EMU19489; Group; bwd; Counts; MA', 'EMU19489; Group; fwd; Asymmetry; MA',
                                   'EMU19489; Group; fwd; Counts; MA'])
 
+    def test_calculate_all_counts_gives_the_counts_of_MuonGroupingCounts(self):
+        self.context.calculate_all_counts()
+
+        for group in self.group_pair_context.groups:
+            expected = MuonGroupingCounts(InputWorkspace='__EMU19489_pre_processed_data', GroupName=group.name,
+                                          Grouping=group.detectors, SummedPeriods=[1], StoreInADS=False)
+            counts = AnalysisDataService.retrieve(self.group_pair_context[group.name].get_counts_workspace_for_run(
+                self.run_list, False))
+            self._assert_counts_equal(expected, counts)
+            self.assertEqual(expected.getSpectrum(0).getDetectorIDs(), counts.getSpectrum(0).getDetectorIDs())
+            self.assertEqual(group.name, counts.getRun().getLogData('analysis_group_name').value)
+
+    def test_calculate_all_counts_rebins_the_counts_of_each_group(self):
+        self.gui_context['RebinType'] = 'Fixed'
+        self.gui_context['RebinFixed'] = 2
+
+        self.context.calculate_all_counts()
+        run_pre_processing(self.context, [self.run_number], rebin=True)
+
+        for group in self.group_pair_context.groups:
+            expected = MuonGroupingCounts(InputWorkspace='__EMU19489_pre_processed_data', GroupName=group.name,
+                                          Grouping=group.detectors, SummedPeriods=[1], StoreInADS=False)
+            counts = AnalysisDataService.retrieve(self.group_pair_context[group.name].get_counts_workspace_for_run(
+                self.run_list, True))
+            self._assert_counts_equal(expected, counts)
+
+    def _assert_counts_equal(self, expected, counts):
+        self.assertEqual(1, counts.getNumberHistograms())
+        self.assertTrue((expected.readX(0) == counts.readX(0)).all())
+        self.assertTrue(abs(expected.readY(0) - counts.readY(0)).max() < 1e-8)
+        self.assertTrue(abs(expected.readE(0) - counts.readE(0)).max() < 1e-8)
+
     def test_that_show_all_calculates_and_shows_all_groups_with_rebin(self):
         self.gui_context['RebinType'] = 'Fixed'
         self.gui_context['RebinFixed'] = 2
@@ -4,6 +4,7 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import threading
 import unittest
 import time
 from unittest import mock
@@ -144,6 +145,36 @@ class SeqFittingTabPresenterTest(unittest.TestCase):
         self.view.fit_table.set_fit_quality.assert_called_once_with(2, 'Success', 1.07)
         self.view.fit_selected_button.setEnabled.assert_called_once_with(True)
 
+    def test_handle_sequential_fit_row_finished_updates_the_row_of_the_fit(self):
+        fit_values = [0.6, 0.9, 0.1, 1]
+        fit_function = self._setup_test_fit_function(fit_values)
+        self.model.get_all_fit_function_parameter_values_for = mock.Mock(return_value=fit_values)
+        self.presenter.selected_rows = [1, 4, 5]
+
+        self.presenter.handle_sequential_fit_row_finished((1, fit_function, 'Success', 1.07))
+        # the row is filled in by a queued signal, so only once the GUI thread processes its events
+        self.view.fit_table.set_parameter_values_for_row.assert_not_called()
+        QApplication.sendPostedEvents()
+
+        self.view.fit_table.set_parameter_values_for_row.assert_called_once_with(4, fit_values)
+        self.view.fit_table.set_fit_quality.assert_called_once_with(4, 'Success', 1.07)
+
+    def test_handle_sequential_fit_row_finished_updates_the_table_on_the_gui_thread(self):
+        fit_values = [0.6, 0.9, 0.1, 1]
+        fit_function = self._setup_test_fit_function(fit_values)
+        self.model.get_all_fit_function_parameter_values_for = mock.Mock(return_value=fit_values)
+        self.presenter.selected_rows = [1, 4, 5]
+        update_threads = []
+        self.view.fit_table.set_fit_quality.side_effect = lambda *args: update_threads.append(threading.current_thread())
+
+        fitting_thread = threading.Thread(target=self.presenter.handle_sequential_fit_row_finished,
+                                          args=((0, fit_function, 'Success', 1.07),))
+        fitting_thread.start()
+        fitting_thread.join()
+        QApplication.sendPostedEvents()
+
+        self.assertEqual([threading.main_thread()], update_threads)
+
     @mock.patch('mantidqtinterfaces.Muon.GUI.Common.seq_fitting_tab_widget.seq_fitting_tab_presenter.functools')
     def test_handle_sequential_fit_correctly_sets_up_fit(self, mock_function_tools):
         workspaces = ["EMU20884; Group; fwd; Asymmetry"]
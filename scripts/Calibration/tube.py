@@ -378,12 +378,16 @@ def calibrate(ws, tubeSet, knownPositions, funcForm, **kwargs):
                outputPeak=peakTable)
       # now, peakTable has information for tube[1] and tube[2]
 
+    :param workers: Number of tubes whose peaks are fitted at the same time. The tubes are still added to the \
+    calibration and peak tables in the order of **rangeList**. Default = 1.
+
     :rtype: calibrationTable, a TableWorkspace with two columns DetectorID(int) and DetectorPositions(V3D).
 
     """
     # Legacy code requires kwargs to contain only the list of parameters specify below. Thus, we pop other
     # arguments into temporary variables, such as `parameters_table_group`
     parameters_table_group = kwargs.pop('parameters_table_group') if 'parameters_table_group' in kwargs else None
+    workers = kwargs.pop('workers') if 'workers' in kwargs else 1
 
     FITPAR = 'fitPar'
     MARGIN = 'margin'
@@ -443,7 +447,7 @@ def calibrate(ws, tubeSet, knownPositions, funcForm, **kwargs):
 
     getCalibration(ws, tubeSet, calib_table, fit_par, ideal_tube, output_peak,
                    override_peaks, exclude_short_tubes, plot_tube, range_list, polin_fit,
-                   parameters_table_group=parameters_table_group)
+                   parameters_table_group=parameters_table_group, workers=workers)
 
     if delete_peak_table_after:
         DeleteWorkspace(str(output_peak))
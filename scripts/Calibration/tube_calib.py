@@ -17,6 +17,8 @@ Users should not need to directly call any other function other than :func:`getC
 ## Author: Karl palmen ISIS and for readPeakFile Gesner Passos ISIS
 
 # Standard and third-party
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import copy
 import numpy
 import os
@@ -131,7 +133,55 @@ def fit_edges(fit_par, index, ws, output_ws):
     return 1  # peakIndex (center) -> parameter B of EndERFC
 
 
-def fit_gaussian(fit_par, index, ws, output_ws):
+def initial_gaussian_parameters(tube_counts, centre, margin):
+    """
+    Estimate the starting parameters of the fit of a peak, or trough, in many tubes at once
+
+    :param tube_counts: 2D array with the integrated counts of one tube on each row. All tubes have the same length
+    :param centre: expected centre of the peak, in pixels
+    :param margin: number of pixels either side of the expected centre in which to look for the peak
+
+    :rtype: 2D array with the background, height, centre and width of the peak of one tube on each row
+    """
+    right_limit = tube_counts.shape[1]
+    min_index = max(int(centre - margin), 0)
+    max_index = min(int(centre + margin), right_limit)
+    values = tube_counts[:, min_index:max_index]
+
+    max_value = numpy.max(values, axis=1)
+    min_value = numpy.min(values, axis=1)
+    half = (max_value - min_value) * 2 / 3 + min_value
+    above_half_line = numpy.count_nonzero(values > half[:, numpy.newaxis], axis=1)
+    beyond_half_line = values.shape[1] - above_half_line
+    # few values above the midle means that it is a peak, many values means that it is a trough
+    is_peak = above_half_line < beyond_half_line
+    centres = numpy.where(is_peak, numpy.argmax(values, axis=1), numpy.argmin(values, axis=1)) + min_index
+    background = numpy.where(is_peak, min_value, max_value)
+    height = numpy.where(is_peak, max_value - min_value, min_value - max_value)  # negative for a trough
+    # the fit starts from a width of a single pixel
+    width = numpy.ones(len(values))
+    return numpy.column_stack((background, height, centres, width))
+
+
+def find_initial_peaks(tube_counts, func_forms, fit_par):
+    """
+    Estimate the starting parameters of the fits of the slits in many tubes at once, for the automatic mode
+
+    :param tube_counts: 2D array with the integrated counts of one tube on each row. All tubes have the same length
+    :param func_forms: array of function form 1=slit/bar, 2=edge
+    :param fit_par: a TubeCalibFitParams object contain the fit parameters
+
+    :rtype: 3D array with the background, height, centre and width of each slit of one tube on each row.
+        The parameters of edges are NaN.
+    """
+    guesses = numpy.full((len(tube_counts), len(func_forms), 4), numpy.nan)
+    for index, (func_form, centre) in enumerate(zip(func_forms, fit_par.getPeaks())):
+        if func_form != 2:
+            guesses[:, index, :] = initial_gaussian_parameters(tube_counts, centre, fit_par.getMargin())
+    return guesses
+
+
+def fit_gaussian(fit_par, index, ws, output_ws, guess=None, prefix=''):
     # find the peak position
     centre = fit_par.getPeaks()[index]
     margin = fit_par.getMargin()
@@ -141,30 +191,12 @@ def fit_gaussian(fit_par, index, ws, output_ws):
 
     right_limit = len(all_values)
 
-    min_index = max(int(centre - margin), 0)
-    max_index = min(int(centre + margin), right_limit)
-    values = all_values[min_index:max_index]
-
     # find the peak position
     if fit_par.getAutomatic():
-        # find the parameters for fit dynamically
-        max_value = numpy.max(values)
-        min_value = numpy.min(values)
-        half = (max_value - min_value) * 2 / 3 + min_value
-        above_half_line = len(numpy.where(values > half)[0])
-        beyond_half_line = len(values) - above_half_line
-        if above_half_line < beyond_half_line:
-            # means that there are few values above the midle, so it is a peak
-            centre = numpy.argmax(values) + min_index
-            background = min_value
-            height = max_value - background
-            width = len(numpy.where(values > height / 2 + background))
-        else:
-            # means that there are many values above the midle, so it is a trough
-            centre = numpy.argmin(values) + min_index
-            background = max_value
-            height = min_value - max_value  # negative value
-            width = len(numpy.where(values < min_value + height / 2))
+        # find the parameters for fit dynamically, unless they were found for many tubes at once
+        if guess is None:
+            guess = initial_gaussian_parameters(numpy.array([all_values]), centre, margin)[0]
+        background, height, centre, width = guess
 
         start = max(centre - margin, 0)
         end = min(centre + margin, right_limit)
@@ -188,11 +220,11 @@ def fit_gaussian(fit_par, index, ws, output_ws):
         # it was seen that the best result for static general fitParamters,
         # is to divide the values in two fitting steps
         Fit(InputWorkspace=ws, Function='name=LinearBackground,A0=%f' % background,
-            StartX=str(start), EndX=str(end), Output='Z1')
-        Fit(InputWorkspace='Z1_Workspace',
+            StartX=str(start), EndX=str(end), Output=prefix + 'Z1')
+        Fit(InputWorkspace=prefix + 'Z1_Workspace',
             Function='name=Gaussian,Height=%f,PeakCentre=%f,Sigma=%f' % (height, centre, width),
             WorkspaceIndex=2, StartX=str(start), EndX=str(end), Output=output_ws)
-        CloneWorkspace(output_ws + '_Workspace', OutputWorkspace='gauss_' + str(index))
+        CloneWorkspace(output_ws + '_Workspace', OutputWorkspace=prefix + 'gauss_' + str(index))
         peak_index = 1
 
     return peak_index
@@ -218,13 +250,30 @@ def getPoints(integrated_ws, func_forms, fit_params, which_tube, show_plot=False
 
     """
 
-    # Create input workspace for fitting
     # get all the counts for the integrated workspace inside the tube
     counts_y = numpy.array([integrated_ws.dataY(i)[0] for i in which_tube])
+    return _get_points(counts_y, func_forms, fit_params, show_plot)
+
+
+def _get_points(counts_y, func_forms, fit_params, show_plot=False, guesses=None, prefix=''):
+    """
+    Get the centres of N slits or edges for calibration from the integrated counts of one tube
+
+    :param counts_y: array of the integrated counts of each pixel of the tube
+    :param func_forms: array of function form 1=slit/bar, 2=edge
+    :param fit_params: a TubeCalibFitParams object contain the fit parameters
+    :param show_plot: show plot for this tube
+    :param guesses: the starting parameters of each slit, as found by find_initial_peaks. If None, they are
+        found while fitting each slit
+    :param prefix: prefix to the names of the workspaces created, so that tubes can be fitted at the same time
+
+    :rtype: array of the slit/edge positions (-1.0 indicates failed to find position)
+    """
     if len(counts_y) == 0:
         return
-    get_points_ws = CreateWorkspace(range(len(counts_y)), counts_y, OutputWorkspace='TubePlot')
-    calib_points_ws = 'CalibPoint'
+    # Create input workspace for fitting
+    get_points_ws = CreateWorkspace(range(len(counts_y)), counts_y, OutputWorkspace=prefix + 'TubePlot')
+    calib_points_ws = prefix + 'CalibPoint'
     results = []
     fitt_y_values = []
     fitt_x_values = []
@@ -235,7 +284,8 @@ def getPoints(integrated_ws, func_forms, fit_params, which_tube, show_plot=False
             # find the edge position
             peak_index = fit_edges(fit_params, i, get_points_ws, calib_points_ws)
         else:
-            peak_index = fit_gaussian(fit_params, i, get_points_ws, calib_points_ws)
+            guess = None if guesses is None else guesses[i]
+            peak_index = fit_gaussian(fit_params, i, get_points_ws, calib_points_ws, guess, prefix)
         peak_centre = tuple(ADS.retrieve(calib_points_ws + '_Parameters').row(peak_index).items())[1][1]
         results.append(peak_centre)
 
@@ -245,7 +295,7 @@ def getPoints(integrated_ws, func_forms, fit_params, which_tube, show_plot=False
             fitt_x_values.append(copy.copy(ws.dataX(1)))
 
     if show_plot:
-        CreateWorkspace(OutputWorkspace='FittedData',
+        CreateWorkspace(OutputWorkspace=prefix + 'FittedData',
                         DataX=numpy.hstack(fitt_x_values),
                         DataY=numpy.hstack(fitt_y_values))
     return results
@@ -509,7 +559,8 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
                    range_list: Optional[List[int]] = None,
                    polinFit: int = 2,
                    peaksTestMode: bool = False,
-                   parameters_table_group: Optional[str] = None) -> None:
+                   parameters_table_group: Optional[str] = None,
+                   workers: int = 1) -> None:
     """
     Get the results the calibration and put them in the calibration table provided.
 
@@ -535,6 +586,9 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
         holds the goodness-of-fit, chi-square value. The name of each individual TableWorkspace is the string
         `parameters_table_group` plus the suffix `_I`, where `I` is the tube index as given by list `range_list`.
         If `None`, no group workspace is generated.
+    :param workers: number of tubes whose peaks are fitted at the same time. The calibration table and the peaks
+        table are filled in the order of `range_list` whatever the number of workers. Default 1, the tubes are
+        fitted one after the other.
 
     This is the main method called from :func:`~tube.calibrate` to perform the calibration.
     """
@@ -546,8 +600,9 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
         range_list = range(n_tubes)
 
     all_skipped = set()
+    func_forms = iTube.getFunctionalForms()
 
-    parameters_tables = list()  # hold the names of all the fit parameter tables
+    tubes = list()  # index and workspace indices of the tubes to calibrate
     for i in range_list:
 
         # Deal with (i+1)st tube specified
@@ -565,41 +620,59 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
         if tubeSet.getTubeLength(i) <= excludeShortTubes:
             # skip this tube
             continue
-
-        ##############################
-        # Define Peak Position session
-        ##############################
-
+        tubes.append((i, wht))
+
+    ##############################
+    # Define Peak Position session
+    ##############################
+
+    # integrated counts of every spectrum
+    all_counts = ws.extractY()[:, 0]
+
+    # find the starting parameters of the fits of all the tubes with the same length at once
+    guesses = dict()
+    if fitPar.getAutomatic():
+        tubes_by_length = defaultdict(list)
+        for i, wht in tubes:
+            if i not in overridePeaks:
+                tubes_by_length[len(wht)].append((i, wht))
+        for same_length_tubes in tubes_by_length.values():
+            tube_counts = numpy.array([all_counts[wht] for _, wht in same_length_tubes])
+            guesses.update(zip([i for i, _ in same_length_tubes], find_initial_peaks(tube_counts, func_forms, fitPar)))
+
+    def find_tube_points(tube):
+        i, wht = tube
         # if this tube is to be override, get the peaks positions for this tube.
         if i in overridePeaks:
-            actual_tube = overridePeaks[i]
-        else:
-            # find the peaks positions
-            plot_this_tube = i in plotTube
-            actual_tube = getPoints(ws, iTube.getFunctionalForms(), fitPar, wht, show_plot=plot_this_tube)
-            if plot_this_tube:
-                RenameWorkspace('FittedData', OutputWorkspace='FittedTube%d' % (i))
-                RenameWorkspace('TubePlot', OutputWorkspace='TubePlot%d' % (i))
-
-        # Set the peak positions at the peakTable
-        peaksTable.addRow([tubeSet.getTubeName(i)] + list(actual_tube))
-
-        ##########################################
-        # Define the correct position of detectors
-        ##########################################
-        if parameters_table_group is None:
-            parameters_table = None
-        else:
-            parameters_table = f'{parameters_table_group}_{i}'
-            parameters_tables.append(parameters_table)
-        det_id_list, det_position_list = getCalibratedPixelPositions(ws, actual_tube, iTube.getArray(), wht,
-                                                                     peaksTestMode, polinFit,
-                                                                     parameters_table=parameters_table)
-        # save the detector positions to calibTable
-        if len(det_id_list) == len(wht):  # We have corrected positions
-            for j in range(len(wht)):
-                next_row = {'Detector ID': det_id_list[j], 'Detector Position': det_position_list[j]}
-                calibTable.addRow(next_row)
+            return overridePeaks[i]
+        # workspaces of tubes fitted at the same time must have different names
+        prefix = '__tube_calib_{0}_'.format(i) if workers > 1 else ''
+        return _fit_tube_points(all_counts[wht], func_forms, fitPar, i, i in plotTube, guesses.get(i), prefix)
+
+    parameters_tables = list()  # hold the names of all the fit parameter tables
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        # the peaks of the next tubes are fitted while the positions of the detectors of a tube are found
+        all_tube_points = executor.map(find_tube_points, tubes) if workers > 1 else map(find_tube_points, tubes)
+        for (i, wht), actual_tube in zip(tubes, all_tube_points):
+            # Set the peak positions at the peakTable
+            peaksTable.addRow([tubeSet.getTubeName(i)] + list(actual_tube))
+
+            ##########################################
+            # Define the correct position of detectors
+            ##########################################
+            if parameters_table_group is None:
+                parameters_table = None
+            else:
+                parameters_table = f'{parameters_table_group}_{i}'
+                parameters_tables.append(parameters_table)
+            det_id_list, det_position_list = getCalibratedPixelPositions(ws, actual_tube, iTube.getArray(), wht,
+                                                                         peaksTestMode, polinFit,
+                                                                         parameters_table=parameters_table)
+            # save the detector positions to calibTable
+            if len(det_id_list) == len(wht):  # We have corrected positions
+                for j in range(len(wht)):
+                    next_row = {'Detector ID': det_id_list[j], 'Detector Position': det_position_list[j]}
+                    calibTable.addRow(next_row)
 
     if len(all_skipped) > 0:
         print("%i histogram(s) were excluded from the calibration since they did not have an assigned detector." % len(
@@ -621,6 +694,37 @@ def getCalibration(input_workspace: Union[str, Workspace2D],
             pass
 
 
+def _fit_tube_points(counts_y, func_forms, fit_par, tube_index, show_plot, guesses, prefix):
+    """
+    Find the peaks positions of one tube for getCalibration
+
+    The plot workspaces of the tube are renamed after the tube index. When a prefix is given,
+    the other workspaces created for the fits are deleted.
+
+    :param counts_y: array of the integrated counts of each pixel of the tube
+    :param func_forms: array of function form 1=slit/bar, 2=edge
+    :param fit_par: a TubeCalibFitParams object contain the fit parameters
+    :param tube_index: index of the tube in the TubeSpec
+    :param show_plot: keep the plot workspaces of this tube
+    :param guesses: the starting parameters of each slit, as found by find_initial_peaks, or None
+    :param prefix: prefix to the names of the workspaces created for the fits
+
+    :rtype: array of the slit/edge positions
+    """
+    actual_tube = _get_points(counts_y, func_forms, fit_par, show_plot, guesses, prefix)
+    if show_plot:
+        RenameWorkspace(prefix + 'FittedData', OutputWorkspace='FittedTube%d' % (tube_index))
+        RenameWorkspace(prefix + 'TubePlot', OutputWorkspace='TubePlot%d' % (tube_index))
+    if prefix:
+        fit_names = [prefix + fit + suffix for fit in ('CalibPoint', 'Z1')
+                     for suffix in ('_NormalisedCovarianceMatrix', '_Parameters', '_Workspace')]
+        gauss_names = [prefix + 'gauss_' + str(index) for index in range(len(func_forms))]
+        for ws_name in [prefix + 'TubePlot'] + fit_names + gauss_names:
+            if ADS.doesExist(ws_name):
+                ADS.remove(ws_name)
+    return actual_tube
+
+
 def getCalibrationFromPeakFile(ws, calibTable, iTube, PeakFile):
     """
        Get the results the calibration and put them in the calibration table provided.
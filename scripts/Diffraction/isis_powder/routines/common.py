@@ -6,6 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import collections
 import copy
+import os
 import warnings
 
 import mantid.kernel as kernel
@@ -517,6 +518,32 @@ def generate_summed_runs(empty_sample_ws_string, instrument, scale_factor=None):
     return empty_sample
 
 
+def load_or_generate_summed_runs(empty_sample_ws_string, instrument, summed_file_path, scale_factor=None):
+    """
+    Loads the summed empty runs from the file they were saved to by an earlier call. If they have not
+    been saved yet they are generated as by generate_summed_runs and saved, so that focusing further
+    runs against the same empty runs does not load and sum them again.
+    :param empty_sample_ws_string: The empty run numbers to sum
+    :param instrument: The instrument object these runs belong to
+    :param summed_file_path: The path of the file holding the summed runs
+    :param scale_factor: The percentage to scale the summed runs by
+    :return: The summed and normalised empty runs
+    """
+    if os.path.isfile(summed_file_path):
+        kernel.logger.warning('Pre-summed empty instrument workspace found at ' + summed_file_path)
+        empty_sample = mantid.LoadNexus(Filename=summed_file_path)
+    else:
+        empty_sample = generate_summed_runs(empty_sample_ws_string=empty_sample_ws_string, instrument=instrument)
+        try:
+            mantid.SaveNexus(Filename=summed_file_path, InputWorkspace=empty_sample)
+        except (RuntimeError, ValueError) as exc:
+            kernel.logger.warning('Could not save the summed empty runs to ' + summed_file_path + ': ' + str(exc))
+    if scale_factor:
+        empty_sample = mantid.Scale(InputWorkspace=empty_sample, OutputWorkspace=empty_sample, Factor=scale_factor,
+                                    Operation="Multiply")
+    return empty_sample
+
+
 def subtract_summed_runs(ws_to_correct, empty_sample):
     """
     Subtracts the list of empty runs specified by the empty_sample_ws_string
@@ -6,7 +6,6 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 from mantid.api import WorkspaceGroup
 import mantid.simpleapi as mantid
-from mantid.kernel import logger
 
 import isis_powder.routines.common as common
 from isis_powder.routines.common_enums import INPUT_BATCHING
@@ -26,8 +25,47 @@ def focus(run_number_string, instrument, perform_vanadium_norm, absorb, sample_d
         raise ValueError("Input batching not passed through. Please contact development team.")
 
 
+class _FocusingCalibration(object):
+    """
+    Holds the calibration and grouping workspaces used to focus runs, so that a range of runs reads each calibration
+    and grouping file once rather than once per run. As the calibration depends on the instrument geometry the
+    workspaces are kept for each instrument definition the runs use.
+    """
+
+    def __init__(self):
+        self._workspaces = {}
+
+    def get_calibration_ws(self, input_workspace, offset_file_path):
+        key = self._get_key("cal", input_workspace, offset_file_path)
+        if key not in self._workspaces:
+            ws_name = "focusing_calibration_{}".format(len(self._workspaces))
+            mantid.LoadDiffCal(InputWorkspace=input_workspace, Filename=offset_file_path, MakeGroupingWorkspace=False,
+                               MakeMaskWorkspace=False, WorkspaceName=ws_name)
+            self._workspaces[key] = mantid.mtd[ws_name + "_cal"]
+        return self._workspaces[key]
+
+    def get_grouping_ws(self, input_workspace, grouping_file_path):
+        key = self._get_key("group", input_workspace, grouping_file_path)
+        if key not in self._workspaces:
+            ws_name = "focusing_grouping_{}".format(len(self._workspaces))
+            self._workspaces[key] = mantid.CreateGroupingWorkspace(InputWorkspace=input_workspace,
+                                                                   OldCalFilename=grouping_file_path,
+                                                                   OutputWorkspace=ws_name)
+        return self._workspaces[key]
+
+    def remove_workspaces(self):
+        for ws in self._workspaces.values():
+            common.remove_intermediate_workspace(ws)
+        self._workspaces.clear()
+
+    @staticmethod
+    def _get_key(ws_type, input_workspace, file_path):
+        instrument = input_workspace.getInstrument()
+        return ws_type, file_path, instrument.getName(), str(instrument.getValidFromDate())
+
+
 def _focus_one_ws(input_workspace, run_number, instrument, perform_vanadium_norm, absorb, sample_details,
-                  vanadium_path):
+                  vanadium_path, focusing_calibration):
     run_details = instrument._get_run_details(run_number_string=run_number)
     if perform_vanadium_norm:
         _test_splined_vanadium_exists(instrument, run_details)
@@ -37,17 +75,15 @@ def _focus_one_ws(input_workspace, run_number, instrument, perform_vanadium_norm
     is_run_empty = common.runs_overlap(run_number, run_details.empty_runs)
     summed_empty = None
     if not is_run_empty and instrument.should_subtract_empty_inst() and not run_details.sample_empty:
-        if os.path.isfile(run_details.summed_empty_file_path):
-            logger.warning('Pre-summed empty instrument workspace found at ' + run_details.summed_empty_file_path)
-            summed_empty = mantid.LoadNexus(Filename=run_details.summed_empty_file_path)
-        else:
-            summed_empty = common.generate_summed_runs(empty_sample_ws_string=run_details.empty_runs,
-                                                       instrument=instrument)
+        summed_empty = common.load_or_generate_summed_runs(empty_sample_ws_string=run_details.empty_runs,
+                                                           instrument=instrument,
+                                                           summed_file_path=run_details.summed_empty_file_path)
     elif run_details.sample_empty:
         # Subtract a sample empty if specified
-        summed_empty = common.generate_summed_runs(empty_sample_ws_string=run_details.sample_empty,
-                                                   instrument=instrument,
-                                                   scale_factor=instrument._inst_settings.sample_empty_scale)
+        summed_empty = common.load_or_generate_summed_runs(empty_sample_ws_string=run_details.sample_empty,
+                                                           instrument=instrument,
+                                                           summed_file_path=run_details.summed_sample_empty_file_path,
+                                                           scale_factor=instrument._inst_settings.sample_empty_scale)
     if summed_empty is not None:
         input_workspace = common.subtract_summed_runs(ws_to_correct=input_workspace,
                                                       empty_sample=summed_empty)
@@ -66,7 +102,8 @@ def _focus_one_ws(input_workspace, run_number, instrument, perform_vanadium_norm
                              Material=common.generate_sample_material(sample_details))
     # Align
     mantid.ApplyDiffCal(InstrumentWorkspace=input_workspace,
-                        CalibrationFile=run_details.offset_file_path)
+                        CalibrationWorkspace=focusing_calibration.get_calibration_ws(input_workspace,
+                                                                                     run_details.offset_file_path))
     aligned_ws = mantid.ConvertUnits(InputWorkspace=input_workspace, Target="dSpacing")
 
     solid_angle = instrument.get_solid_angle_corrections(run_details.vanadium_run_numbers, run_details)
@@ -76,7 +113,8 @@ def _focus_one_ws(input_workspace, run_number, instrument, perform_vanadium_norm
 
     # Focus the spectra into banks
     focused_ws = mantid.DiffractionFocussing(InputWorkspace=aligned_ws,
-                                             GroupingFileName=run_details.grouping_file_path)
+                                             GroupingWorkspace=focusing_calibration.get_grouping_ws(
+                                                 aligned_ws, run_details.grouping_file_path))
 
     instrument.apply_calibration_to_focused_data(focused_ws)
 
@@ -135,10 +173,15 @@ def _batched_run_focusing(instrument, perform_vanadium_norm, run_number_string,
         else:
             vanadium_splines = mantid.mtd[van]
     output = None
-    for ws in read_ws_list:
-        output = _focus_one_ws(input_workspace=ws, run_number=run_number_string, instrument=instrument,
-                               perform_vanadium_norm=perform_vanadium_norm, absorb=absorb,
-                               sample_details=sample_details, vanadium_path=vanadium_splines)
+    focusing_calibration = _FocusingCalibration()
+    try:
+        for ws in read_ws_list:
+            output = _focus_one_ws(input_workspace=ws, run_number=run_number_string, instrument=instrument,
+                                   perform_vanadium_norm=perform_vanadium_norm, absorb=absorb,
+                                   sample_details=sample_details, vanadium_path=vanadium_splines,
+                                   focusing_calibration=focusing_calibration)
+    finally:
+        focusing_calibration.remove_workspaces()
     if instrument.get_instrument_prefix() == "PEARL" and vanadium_splines is not None :
         if hasattr(vanadium_splines, "OutputWorkspace"):
             vanadium_splines = vanadium_splines.OutputWorkspace
@@ -192,11 +235,15 @@ def _individual_run_focusing(instrument, perform_vanadium_norm, run_number, abso
             vanadium_splines = mantid.mtd[van]
 
     output = None
-    for run in run_numbers:
-        ws = common.load_current_normalised_ws_list(run_number_string=run, instrument=instrument)
-        output = _focus_one_ws(input_workspace=ws[0], run_number=run, instrument=instrument, absorb=absorb,
-                               perform_vanadium_norm=perform_vanadium_norm, sample_details=sample_details,
-                               vanadium_path=vanadium_splines)
+    focusing_calibration = _FocusingCalibration()
+    try:
+        for run in run_numbers:
+            ws = common.load_current_normalised_ws_list(run_number_string=run, instrument=instrument)
+            output = _focus_one_ws(input_workspace=ws[0], run_number=run, instrument=instrument, absorb=absorb,
+                                   perform_vanadium_norm=perform_vanadium_norm, sample_details=sample_details,
+                                   vanadium_path=vanadium_splines, focusing_calibration=focusing_calibration)
+    finally:
+        focusing_calibration.remove_workspaces()
     return output
 
 
@@ -73,6 +73,8 @@ def create_run_details_object(run_number_string, inst_settings, is_vanadium_run,
     unsplined_van_path = os.path.join(van_paths, unsplined_van_name)
     van_absorb_path = os.path.join(calibration_dir, van_abs_file_name) if van_abs_file_name else None
     summed_empty_path = os.path.join(van_paths, summed_empty_name)
+    summed_sample_empty_path = os.path.join(van_paths, common.generate_summed_empty_name(
+        sample_empty, new_splined_list)) if sample_empty else None
 
     return _RunDetails(empty_run_number=empty_run_number, file_extension=file_extension,
                        run_number=run_number, output_run_string=output_run_string, label=label,
@@ -80,7 +82,7 @@ def create_run_details_object(run_number_string, inst_settings, is_vanadium_run,
                        splined_vanadium_path=splined_van_path, vanadium_run_number=vanadium_string,
                        sample_empty=sample_empty, vanadium_abs_path=van_absorb_path,
                        unsplined_vanadium_path=unsplined_van_path, output_suffix=suffix,van_paths=van_paths,
-                       summed_empty_path=summed_empty_path)
+                       summed_empty_path=summed_empty_path, summed_sample_empty_path=summed_sample_empty_path)
 
 
 def get_cal_mapping_dict(run_number_string, cal_mapping_path):
@@ -99,7 +101,7 @@ class _RunDetails(object):
     def __init__(self, empty_run_number, file_extension, run_number, output_run_string, label,
                  offset_file_path, grouping_file_path, splined_vanadium_path, vanadium_run_number,
                  sample_empty, vanadium_abs_path, unsplined_vanadium_path, output_suffix,van_paths,
-                 summed_empty_path):
+                 summed_empty_path, summed_sample_empty_path):
 
         # Essential attribute
         self.empty_runs = empty_run_number
@@ -119,6 +121,7 @@ class _RunDetails(object):
         # Optional
         self.file_extension = str(file_extension) if file_extension else None
         self.sample_empty = sample_empty
+        self.summed_sample_empty_file_path = summed_sample_empty_path
         self.vanadium_absorption_path = vanadium_abs_path
         self.output_suffix = output_suffix
         self.van_paths = van_paths
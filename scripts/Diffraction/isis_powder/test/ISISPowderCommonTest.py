@@ -5,6 +5,8 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import mantid.simpleapi as mantid  # Have to import Mantid to setup paths
+import os
+import tempfile
 import unittest
 
 from isis_powder.routines import common, common_enums, SampleDetails
@@ -570,6 +572,34 @@ class ISISPowderCommonTest(unittest.TestCase):
         mantid.DeleteWorkspace(original_ws)
         mantid.DeleteWorkspace(scaled_ws)
 
+    def test_load_or_generate_summed_runs_saves_unscaled_runs(self):
+        sample_empty_number = "100"
+        original_ws = mantid.Load("POL" + sample_empty_number)
+        original_y = original_ws.readY(0)
+        scale_factor = 0.75
+
+        with tempfile.TemporaryDirectory() as calibration_dir:
+            summed_file_path = os.path.join(calibration_dir, common.generate_summed_empty_name(sample_empty_number))
+            scaled_ws = common.load_or_generate_summed_runs(empty_sample_ws_string=sample_empty_number,
+                                                            instrument=ISISPowderMockInst(),
+                                                            summed_file_path=summed_file_path,
+                                                            scale_factor=scale_factor)
+            self.assertTrue(os.path.isfile(summed_file_path))
+            self.assertAlmostEqual(scaled_ws.readY(0)[4], original_y[4] * scale_factor)
+
+            saved_ws = mantid.LoadNexus(Filename=summed_file_path)
+            self.assertAlmostEqual(saved_ws.readY(0)[4], original_y[4])
+
+            # The saved runs are used rather than loading the runs again
+            unscaled_ws = common.load_or_generate_summed_runs(empty_sample_ws_string="not a run number",
+                                                              instrument=ISISPowderMockInst(),
+                                                              summed_file_path=summed_file_path)
+            self.assertAlmostEqual(unscaled_ws.readY(0)[4], original_y[4])
+
+        for ws in (original_ws, scaled_ws, saved_ws, unscaled_ws):
+            if mantid.mtd.doesExist(ws.name()):
+                mantid.DeleteWorkspace(ws)
+
     def test_subtract_summed_runs(self):
         # Load a vanadium workspace for this test
         sample_empty_number = "100"
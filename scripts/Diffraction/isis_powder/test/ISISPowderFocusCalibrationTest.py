@@ -0,0 +1,61 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import tempfile
+import unittest
+
+import mantid.simpleapi as mantid
+from isis_powder.routines import focus
+
+
+class ISISPowderFocusCalibrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self._cal_dir = tempfile.TemporaryDirectory()
+        self.cal_file_path = os.path.join(self._cal_dir.name, "offsets.cal")
+        self.input_ws = mantid.CreateSampleWorkspace(NumBanks=2, BankPixelWidth=2, OutputWorkspace="focus_cal_input")
+        grouping_ws = mantid.CreateGroupingWorkspace(InputWorkspace=self.input_ws, GroupDetectorsBy="bank",
+                                                     OutputWorkspace="focus_cal_grouping")
+        mantid.SaveCalFile(Filename=self.cal_file_path, GroupingWorkspace=grouping_ws)
+        mantid.DeleteWorkspace(grouping_ws)
+        self.focusing_calibration = focus._FocusingCalibration()
+
+    def tearDown(self):
+        self.focusing_calibration.remove_workspaces()
+        mantid.DeleteWorkspace(self.input_ws)
+        self._cal_dir.cleanup()
+
+    def test_calibration_ws_is_loaded_once(self):
+        cal_ws = self.focusing_calibration.get_calibration_ws(self.input_ws, self.cal_file_path)
+        clone_ws = mantid.CloneWorkspace(InputWorkspace=self.input_ws, OutputWorkspace="focus_cal_clone")
+
+        self.assertIs(cal_ws, self.focusing_calibration.get_calibration_ws(clone_ws, self.cal_file_path))
+        self.assertEqual(8, cal_ws.rowCount())
+        mantid.DeleteWorkspace(clone_ws)
+
+    def test_grouping_ws_matches_grouping_file(self):
+        grouping_ws = self.focusing_calibration.get_grouping_ws(self.input_ws, self.cal_file_path)
+
+        self.assertIs(grouping_ws, self.focusing_calibration.get_grouping_ws(self.input_ws, self.cal_file_path))
+        aligned_ws = mantid.ConvertUnits(InputWorkspace=self.input_ws, Target="dSpacing")
+        focused_ws = mantid.DiffractionFocussing(InputWorkspace=aligned_ws, GroupingWorkspace=grouping_ws)
+        self.assertEqual(2, focused_ws.getNumberHistograms())
+        mantid.DeleteWorkspace(aligned_ws)
+        mantid.DeleteWorkspace(focused_ws)
+
+    def test_remove_workspaces_removes_them_from_ads(self):
+        self.focusing_calibration.get_calibration_ws(self.input_ws, self.cal_file_path)
+        self.focusing_calibration.get_grouping_ws(self.input_ws, self.cal_file_path)
+
+        self.focusing_calibration.remove_workspaces()
+
+        self.assertFalse(mantid.mtd.doesExist("focusing_calibration_0_cal"))
+        self.assertFalse(mantid.mtd.doesExist("focusing_grouping_1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -72,6 +72,8 @@ class ISISPowderInstrumentRunDetailsTest(unittest.TestCase):
                          os.path.join(mock_inst.calibration_dir, expected_label,
                                       common.generate_summed_empty_name(expected_empty_runs,
                                                                         expected_offset_file_name)))
+        # No sample empty is set on the mock instrument settings
+        self.assertIsNone(output_obj.summed_sample_empty_file_path)
 
     def test_create_run_details_object_when_van_cal(self):
         # When we are running the vanadium calibration we expected the run number to take the vanadium
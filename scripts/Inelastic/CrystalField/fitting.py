@@ -4,9 +4,9 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
-from mantid.api import IFunction, AlgorithmManager, mtd
+from mantid.api import IFunction, AlgorithmManager, WorkspaceFactory, mtd
 from mantid.kernel import logger
-from mantid.simpleapi import CalculateChiSquared, FunctionFactory, plotSpectrum
+from mantid.simpleapi import FunctionFactory, plotSpectrum
 from .function import PeaksFunction, PhysicalProperties, ResolutionModel, Background, Function
 from .energies import energies
 from .normalisation import split2range, ionname2Nre
@@ -14,6 +14,7 @@ from .CrystalFieldMultiSite import CrystalFieldMultiSite
 from scipy.constants import physical_constants
 import numpy as np
 import re
+from concurrent.futures import ThreadPoolExecutor
 import scipy.optimize as sp
 import warnings
 # RegEx pattern matching a composite function parameter name, eg f2.Sigma.
@@ -1212,6 +1213,45 @@ class CrystalFieldSite(object):
         return ties, fixes
 
 
+class ChiSquaredObjective(object):
+    """
+    Chi squared of a function as a function of some of its parameters, e.g. to be minimised by scipy.optimize.minimize.
+    The function is parsed and the input workspaces are bound once, so that each evaluation only
+    sets the values of the parameters and runs CalculateChiSquared.
+    """
+
+    def __init__(self, function, input_workspace, parameter_names, output='ChiSquaredDividedByDOF'):
+        """
+        @param function: the function string
+        @param input_workspace: a workspace or a list of workspaces, one for each domain of the function
+        @param parameter_names: the names of the parameters set by each evaluation
+        @param output: the output property of CalculateChiSquared to return
+        """
+        alg = AlgorithmManager.createUnmanaged('CalculateChiSquared')
+        alg.initialize()
+        alg.setChild(True)
+        alg.setLogging(False)
+        alg.setProperty('Function', function)
+        workspaces = input_workspace if isinstance(input_workspace, list) else [input_workspace]
+        alg.setProperty('InputWorkspace', workspaces[0])
+        for i, workspace in enumerate(workspaces[1:], 1):
+            alg.setProperty('InputWorkspace_%s' % i, workspace)
+        self._alg = alg
+        self._output = output
+        self._function = alg.getProperty('Function').value
+        self._parameter_indices = [self._function.getParameterIndex(name) for name in parameter_names]
+
+    def __call__(self, x):
+        """
+        Calculate the chi squared for values of the parameters.
+        @param x: a sequence with the values of the parameters
+        """
+        for index, value in zip(self._parameter_indices, x):
+            self._function.setParameter(index, float(value))
+        self._alg.execute()
+        return self._alg.getProperty(self._output).value
+
+
 #pylint: disable=too-few-public-methods
 class CrystalFieldFit(object):
     """
@@ -1248,13 +1288,19 @@ class CrystalFieldFit(object):
         else:
             return self._fit_single()
 
-    def monte_carlo(self, **kwargs):
+    def monte_carlo(self, Workers=1, **kwargs):
+        """
+        Estimate the parameters with the EstimateFitParameters algorithm.
+        Args:
+            Workers: The number of independent searches to run in parallel threads.
+            **kwargs: Properties of the algorithm.
+        """
         fix_all_peaks = self.model.FixAllPeaks
         self.model.FixAllPeaks = True
-        if isinstance(self._input_workspace, list):
-            self._monte_carlo_multi(**kwargs)
+        if Workers > 1:
+            self._monte_carlo_parallel(Workers, **kwargs)
         else:
-            self._monte_carlo_single(**kwargs)
+            self._monte_carlo_serial(**kwargs)
         self.model.FixAllPeaks = fix_all_peaks
 
     def two_step_fit(self, OverwriteMaxIterations: list = None, OverwriteMinimizers: list = None, Iterations: int = 20) -> None:
@@ -1408,49 +1454,111 @@ class CrystalFieldFit(object):
             if self._function is not None:
                 self._function.setParameter(name, value)
 
-    def _monte_carlo_single(self, **kwargs):
+    def _monte_carlo_serial(self, **kwargs):
         """
-        Call EstimateFitParameters algorithm in a single spectrum case.
+        Call EstimateFitParameters algorithm.
         Args:
             **kwargs: Properties of the algorithm.
         """
-        fun = self.model.makeSpectrumFunction()
-        if 'CrystalFieldMultiSpectrum' in fun:
-            # Hack to ensure that 'PhysicalProperties' attribute is first
-            # otherwise it won't set up other attributes properly
-            fun = re.sub(r'(name=.*?,)(.*?)(PhysicalProperties=\(.*?\),)',r'\1\3\2', fun)
-        alg = AlgorithmManager.createUnmanaged('EstimateFitParameters')
-        alg.initialize()
-        alg.setProperty('Function', fun)
-        alg.setProperty('InputWorkspace', self._input_workspace)
-        for param in kwargs:
-            alg.setProperty(param, kwargs[param])
+        alg = self._create_estimate_algorithm(self._monte_carlo_function(), kwargs)
         alg.execute()
         function = alg.getProperty('Function').value
         self.model.update(function)
         self._function = function
 
-    def _monte_carlo_multi(self, **kwargs):
+    def _monte_carlo_parallel(self, workers, **kwargs):
         """
-        Call EstimateFitParameters algorithm in a multi-spectrum case.
+        Call EstimateFitParameters algorithm in several threads, each with its own seed, and keep the
+        best parameters found by any of them. A Monte Carlo search shares the samples between the threads,
+        each cross entropy search uses all of them.
         Args:
+            workers: The number of threads.
             **kwargs: Properties of the algorithm.
         """
-        fun = self.model.makeMultiSpectrumFunction()
+        fun = self._monte_carlo_function()
+        is_monte_carlo = kwargs.get('Type', 'Monte Carlo') == 'Monte Carlo'
+        n_samples = kwargs.get('NSamples', 100)
+        # The random number generator of the algorithm uses its default seed when Seed is 0
+        seed = kwargs.get('Seed', 0) or 5489
+        output_workspace = kwargs.get('OutputWorkspace', '').strip() if is_monte_carlo else ''
+        worker_properties = []
+        for i in range(workers):
+            properties = dict(kwargs, Seed=seed + i)
+            if is_monte_carlo:
+                properties['NSamples'] = n_samples // workers + (1 if i < n_samples % workers else 0)
+            worker_properties.append(properties)
+        algs = [self._create_estimate_algorithm(fun, properties, child=True) for properties in worker_properties]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda alg: alg.execute(), algs))
+
+        # Rank the parameter sets of all the searches by their chi squared
+        candidates = []
+        for alg in algs:
+            function = alg.getProperty('Function').value
+            if output_workspace:
+                table = alg.getProperty('OutputWorkspace').value
+                names = table.column(0)
+                parameter_sets = [table.column(i) for i in range(1, table.columnCount())]
+            else:
+                names = []
+                parameter_sets = [[]]
+            chi_squared = ChiSquaredObjective(self._chi_squared_function(function), self._input_workspace, names,
+                                              'ChiSquaredWeighted')
+            for values in parameter_sets:
+                candidates.append((chi_squared(values), function, dict(zip(names, values))))
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        _, function, best_parameters = candidates[0]
+        for name, value in best_parameters.items():
+            function.setParameter(name, value)
+        if output_workspace:
+            table = WorkspaceFactory.createTable()
+            table.addColumn('str', 'Name', 6)
+            best_candidates = candidates[:kwargs.get('NOutputs', 10)]
+            for i in range(len(best_candidates)):
+                table.addColumn('double', str(i + 1), 2)
+            for name in best_parameters:
+                table.addRow([name] + [parameters.get(name, best_parameters[name]) for _, _, parameters in best_candidates])
+            mtd.addOrReplace(output_workspace, table)
+        self.model.update(function)
+        self._function = function
+
+    def _monte_carlo_function(self):
+        """
+        Make the function string passed to EstimateFitParameters.
+        """
+        if isinstance(self._input_workspace, list):
+            return self.model.makeMultiSpectrumFunction()
+        fun = self.model.makeSpectrumFunction()
+        if 'CrystalFieldMultiSpectrum' in fun:
+            # Hack to ensure that 'PhysicalProperties' attribute is first
+            # otherwise it won't set up other attributes properly
+            fun = re.sub(r'(name=.*?,)(.*?)(PhysicalProperties=\(.*?\),)',r'\1\3\2', fun)
+        return fun
+
+    def _create_estimate_algorithm(self, fun, properties, child=False):
+        """
+        Create an EstimateFitParameters algorithm for the input workspaces.
+        Args:
+            fun: The function string.
+            properties: Other properties of the algorithm.
+            child: If True the algorithm does not store its output workspace in the ADS.
+        """
         alg = AlgorithmManager.createUnmanaged('EstimateFitParameters')
         alg.initialize()
+        alg.setChild(child)
         alg.setProperty('Function', fun)
-        alg.setProperty('InputWorkspace', self._input_workspace[0])
-        i = 1
-        for workspace in self._input_workspace[1:]:
-            alg.setProperty('InputWorkspace_%s' % i, workspace)
-            i += 1
-        for param in kwargs:
-            alg.setProperty(param, kwargs[param])
-        alg.execute()
-        function = alg.getProperty('Function').value
-        self.model.update(function)
-        self._function = function
+        if isinstance(self._input_workspace, list):
+            alg.setProperty('InputWorkspace', self._input_workspace[0])
+            i = 1
+            for workspace in self._input_workspace[1:]:
+                alg.setProperty('InputWorkspace_%s' % i, workspace)
+                i += 1
+        else:
+            alg.setProperty('InputWorkspace', self._input_workspace)
+        for param in properties:
+            alg.setProperty(param, properties[param])
+        return alg
 
     def _fit_single(self):
         """
@@ -1526,7 +1634,8 @@ class CrystalFieldFit(object):
             opt = Options
         for (x, pos) in zip(x0, self._free_cef_parameters):
             fun.removeTie(pos)
-            res = sp.minimize(self._evaluate_cf, [x], args=(fun, pos), method=Solver, options=opt)
+            objective = ChiSquaredObjective(self._chi_squared_function(fun), self._input_workspace, [fun.getParamName(pos)])
+            res = sp.minimize(objective, [x], method=Solver, options=opt)
             fun.fixParameter(pos)
             if res.success:
                 if self._function is not None:
@@ -1536,26 +1645,21 @@ class CrystalFieldFit(object):
                         fun.setParameter(pos, float(res.x))
         self.model.update(fun)
 
-    def _evaluate_cf(self, x0: float, fun: IFunction, cef_pos: int) -> float:
-        fun.setParameter(cef_pos, x0[0])
-        if isinstance(self._input_workspace, list):
-            ws_kwargs = {}
-            ws_kwargs['InputWorkspace'] = self._input_workspace[0]
-            i = 1
-            for workspace in self._input_workspace[1:]:
-                ws_kwargs['InputWorkspace_{}'.format(i)] = workspace
-                i += 1
-            # clean up multispectrum function to prevent problems during evaluation
-            # e.g. remove FWHMX0/FWHMY0 and FWHMX1/FWHMY1
-            fun_str = re.sub(r'FWHM[X|Y]\d+=\(\),', '', str(fun))
-            # move Temperature and PhysicalProperties settings to front
-            fun_str = re.sub(r'(name=.*?,)(.*?)(Temperatures=\(.*?\),)',r'\1\3\2', fun_str)
-            fun_str = re.sub(r'(name=.*?,)(.*?)(PhysicalProperties=\(.*?\),)',r'\1\3\2', fun_str)
-            # remove peaks above MaxPeakCount
-            fun_str = re.sub(r'f[0-9]+\.f(['+str(fun.getAttributeValue("MaxPeakCount"))+r'-9]|[1-9][0-9])\.\w+=.*?,','', fun_str)
-            return CalculateChiSquared(fun_str, **ws_kwargs)[1]
-        else:
-            return CalculateChiSquared(str(fun), self._input_workspace)[1]
+    def _chi_squared_function(self, fun: IFunction) -> str:
+        """
+        Make the string of the function passed to CalculateChiSquared.
+        """
+        if not isinstance(self._input_workspace, list):
+            return str(fun)
+        # clean up multispectrum function to prevent problems during evaluation
+        # e.g. remove FWHMX0/FWHMY0 and FWHMX1/FWHMY1
+        fun_str = re.sub(r'FWHM[X|Y]\d+=\(\),', '', str(fun))
+        # move Temperature and PhysicalProperties settings to front
+        fun_str = re.sub(r'(name=.*?,)(.*?)(Temperatures=\(.*?\),)',r'\1\3\2', fun_str)
+        fun_str = re.sub(r'(name=.*?,)(.*?)(PhysicalProperties=\(.*?\),)',r'\1\3\2', fun_str)
+        # remove peaks above MaxPeakCount
+        fun_str = re.sub(r'f[0-9]+\.f(['+str(fun.getAttributeValue("MaxPeakCount"))+r'-9]|[1-9][0-9])\.\w+=.*?,','', fun_str)
+        return fun_str
 
     def _set_fit_properties(self, alg):
         for prop in self._fit_properties.items():
@@ -22,6 +22,7 @@ import Direct.diagnostics      as diagnostics
 from Direct.PropertyManager  import PropertyManager
 from Direct.RunDescriptor    import RunDescriptor
 from Direct.ReductionHelpers import extract_non_system_names,process_prop_list
+from Direct.WhiteBeamCache   import get_white_beam_cache
 
 
 def setup_reducer(inst_name,reload_instrument=False):
@@ -210,24 +211,37 @@ class DirectEnergyConversion(object):
             # build hard mask
             diag_mask = white.get_masking(1)
             if diag_mask is None:
-                # in this peculiar way we can obtain working mask which
-                # accounts for initial data grouping in the
-                # data file.  SNS or 1 to 1 maps may probably avoid this
-                # stuff and can load masks directly
-                white_data = white.get_ws_clone('white_ws_clone')
+                cache = get_white_beam_cache()
+                cache_key = None
                 if self.prop_man.mapmask_ref_ws is None:
-                    ref_ws = white.get_workspace()
+                    cache_key = self._white_cache_key(cache,'hard_mask',white,[self.hard_mask_file],[])
+                if cache_key is not None and cache.load(cache_key,'hard_mask_ws') is not None:
+                    self.prop_man.log("*** Using hard mask cached for white beam run: {0}".format(white.run_number()),
+                                      'notice')
+                    white.add_masked_ws('hard_mask_ws')
+                    DeleteWorkspace(Workspace='hard_mask_ws')
+                    diag_mask = white.get_masking(1)
                 else:
-                    ref_ws = self.prop_man.mapmask_ref_ws
-                idf_file = api.ExperimentInfo.getInstrumentFilename(self.instr_name)
-                diag_mask = LoadMask(Instrument=idf_file,InputFile=self.hard_mask_file,
-                                     OutputWorkspace='hard_mask_ws',RefWorkspace = ref_ws)
-                #
-                MaskDetectors(Workspace=white_data, MaskedWorkspace=diag_mask)
-                white.add_masked_ws(white_data)
-                DeleteWorkspace(Workspace='white_ws_clone')
-                DeleteWorkspace(Workspace='hard_mask_ws')
-                diag_mask = white.get_masking(1)
+                    # in this peculiar way we can obtain working mask which
+                    # accounts for initial data grouping in the
+                    # data file.  SNS or 1 to 1 maps may probably avoid this
+                    # stuff and can load masks directly
+                    white_data = white.get_ws_clone('white_ws_clone')
+                    if self.prop_man.mapmask_ref_ws is None:
+                        ref_ws = white.get_workspace()
+                    else:
+                        ref_ws = self.prop_man.mapmask_ref_ws
+                    idf_file = api.ExperimentInfo.getInstrumentFilename(self.instr_name)
+                    diag_mask = LoadMask(Instrument=idf_file,InputFile=self.hard_mask_file,
+                                         OutputWorkspace='hard_mask_ws',RefWorkspace = ref_ws)
+                    #
+                    MaskDetectors(Workspace=white_data, MaskedWorkspace=diag_mask)
+                    white.add_masked_ws(white_data)
+                    DeleteWorkspace(Workspace='white_ws_clone')
+                    DeleteWorkspace(Workspace='hard_mask_ws')
+                    diag_mask = white.get_masking(1)
+                    if cache_key is not None:
+                        cache.save(cache_key,diag_mask)
             if out_ws_name is not None:
                 dm = CloneWorkspace(diag_mask,OutputWorkspace=out_ws_name)
                 return dm
@@ -1876,7 +1890,6 @@ class DirectEnergyConversion(object):
            workspace in question or using cashed value
         """
         run = self.get_run_descriptor(run)
-        white_ws = run.get_workspace()
         # This both integrates the workspace into one bin spectra and sets up
         # common bin boundaries for all spectra
         done_Log = 'DET_EFFICIENCY_calculated'
@@ -1904,6 +1917,23 @@ class DirectEnergyConversion(object):
         #end
         done_log_VAL = self._build_white_tag()
 
+        # Check if the work has been done in an earlier session
+        cache = get_white_beam_cache()
+        cache_key = self._white_cache_key(cache,'integrals',run,[],
+                                          [done_log_VAL,self.prop_man.mon1_norm_spec,
+                                           self.prop_man.norm_mon_integration_range])
+        if cache_key is not None:
+            targ_ws = cache.load(cache_key,new_ws_name)
+            if targ_ws is not None:
+                self.prop_man.log("*** Using white beam integrals cached for run: {0}".format(run.run_number()),
+                                  'notice')
+                run.synchronize_ws(targ_ws)
+                if self._keep_wb_workspace:
+                    result = run.get_ws_clone()
+                else:
+                    result = run.get_workspace()
+                return result
+
         # Normalize
         self.__in_white_normalization = True
         white_ws = self.normalise(run, self.normalise_method,0.0)
@@ -1926,7 +1956,9 @@ class DirectEnergyConversion(object):
         # Why aren't we doing this...-> because integration does not work properly for event workspaces
         #Integration(white_ws, white_ws, RangeLower=low, RangeUpper=upp)
         AddSampleLog(white_ws,LogName = done_Log,LogText=done_log_VAL,LogType='String')
-        run.synchronize_ws(white_ws)
+        white_ws = run.synchronize_ws(white_ws)
+        if cache_key is not None:
+            cache.save(cache_key,white_ws)
         if self._keep_wb_workspace:
             result = run.get_ws_clone()
         else:
@@ -1934,6 +1966,29 @@ class DirectEnergyConversion(object):
         return result
 #-------------------------------------------------------------------------------
 
+    def _white_cache_key(self,cache,kind,run,other_files,settings):
+        """Build the key of the white beam cache entry for a workspace produced from
+           the run, the files and the settings provided.
+
+           Returns None if the cache is disabled or the workspace can not be cached, e.g. because
+           the run is a workspace rather than a file or a workspace is used for calibration.
+        """
+        if cache is None or run.run_number() is None or run.is_existing_ws() or len(run.get_run_list()) > 1:
+            return None
+        ok,run_file = run.find_file(self.prop_man,be_quet=True)
+        if not ok:
+            return None
+        files = [run_file] + other_files
+        det_cal_file = self.prop_man.det_cal_file
+        if isinstance(det_cal_file,api.Workspace):
+            return None
+        if det_cal_file is not None:
+            ok,det_cal_file = PropertyManager.det_cal_file.find_file(self.prop_man)
+            if not ok:
+                return None
+            files.append(det_cal_file)
+        return cache.get_key(kind,files,[self.instr_name] + settings)
+
     def _build_white_tag(self):
         """build tag indicating wb-integration ranges """
         low,upp = self.wb_integr_range
@@ -13,8 +13,10 @@ from Direct.PropertyManager import PropertyManager
 # this import is used by children
 from Direct.DirectEnergyConversion import DirectEnergyConversion
 from types import MethodType  # noqa
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
+import threading
 import time
 try:
     import h5py
@@ -26,6 +28,25 @@ except ImportError:
 from abc import abstractmethod
 
 
+# size of the blocks run files are read in by _read_run_file
+_READ_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _read_run_file(file_name, stop_reading):
+    """ Read through a run file, so that it is in the file system cache
+        when the reduction loads it. Errors are ignored, as the
+        reduction reports missing or unreadable files itself.
+        Reading stops early once the stop_reading event is set.
+    """
+    try:
+        file_path = FileFinder.findRuns(file_name)[0]
+        with open(file_path, 'rb') as run_file:
+            while not stop_reading.is_set() and run_file.read(_READ_BLOCK_SIZE):
+                pass
+    except (RuntimeError, IndexError, OSError):
+        pass
+
+
 # R0921 abstract class not referenced -- wrong, client references it.
 # pylint: disable=too-many-instance-attributes, R0921
 
@@ -71,6 +92,8 @@ class ReductionWrapper(object):
         """
         # internal variable, indicating if we should try to wait for input files to appear
         self._wait_for_file = False
+        # internal variable, indicating if the next run file is read while the current run is reduced
+        self._read_next_run_file = False
         # The property defines the run number, to validate. If defined, switches reduction wrapper from
         # reduction to validation mode
         self._run_number_to_validate = None
@@ -118,6 +141,21 @@ class ReductionWrapper(object):
         else:
             self._wait_for_file = False
 
+    @property
+    def read_next_run_file(self):
+        """ If this variable is True, when a list of runs is reduced one by one
+            the next run file is read in the background while the current run
+            is reduced, so that loading it does not wait for the disk or the
+            data archive. This needs memory for the file system cache of the
+            next file, and competes with the reduction for the disk, so it is
+            off by default.
+        """
+        return self._read_next_run_file
+
+    @read_next_run_file.setter
+    def read_next_run_file(self, value):
+        self._read_next_run_file = bool(value)
+
     #
 
     def save_web_variables(self, FileName=None):
@@ -704,14 +742,13 @@ class ReductionWrapper(object):
             # --------### reduce list of runs one by one ----------------------------###
             runfiles = PropertyManager.sample_run.get_run_file_list()
             if out_ws_name is None:
-                for file_name in runfiles:
-                    self.reduce(file_name)
+                for _ in self._reduce_run_files(runfiles):
+                    pass
                 return None
             else:
                 results = []
                 nruns = len(runfiles)
-                for num, file_name in enumerate(runfiles):
-                    red_ws = self.reduce(file_name)
+                for num, red_ws in enumerate(self._reduce_run_files(runfiles)):
                     if isinstance(red_ws, list):
                         for ws in red_ws:
                             results.append(ws)
@@ -734,6 +771,32 @@ class ReductionWrapper(object):
             # end if
         # end
 
+    def _reduce_run_files(self, runfiles):
+        """ Reduce the run files one by one, yielding the result of each reduction.
+
+            If read_next_run_file is set, the next run file is read in the background
+            while a run is reduced. The white beam, monovanadium and diagnostics results
+            are kept by the reducer between runs, so only the sample runs are processed again.
+        """
+        if not self._read_next_run_file:
+            for file_name in runfiles:
+                yield self.reduce(file_name)
+            return
+
+        nruns = len(runfiles)
+        stop_reading = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            for num, file_name in enumerate(runfiles):
+                # files which have not appeared yet are waited for by reduce
+                if num + 1 < nruns and self._wait_for_file <= 0:
+                    executor.submit(_read_run_file, runfiles[num + 1], stop_reading)
+                yield self.reduce(file_name)
+        finally:
+            # do not wait for a read that is no longer needed, e.g. if a reduction failed
+            stop_reading.set()
+            executor.shutdown(wait=False)
+
 
 def MainProperties(main_prop_definition):
     """ Decorator stores properties dedicated as main and sets these properties
@@ -0,0 +1,153 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+""" A disk cache for the white beam integrals and hard masks used in direct inelastic reduction
+
+The normalised white beam integrals are kept in the ADS only as long as the reduction session lasts.
+This cache keeps them, and the masks built from hard mask files, on disk as processed Nexus files,
+so that every new reduction session using the same white beam run does not have to load, normalise
+and integrate it again.
+
+An entry is identified by the files used to produce it (their path, modification time and size),
+the settings affecting it and the Mantid version. The least recently used entries are removed once
+the cache grows beyond its size limit.
+
+The cache is enabled by setting direct.white_cache.directory in the Mantid properties.
+"""
+import hashlib
+import json
+import os
+
+import mantid
+from mantid.api import FileFinder
+from mantid.kernel import config, logger
+from mantid.simpleapi import LoadNexusProcessed, SaveNexusProcessed
+
+CACHE_DIRECTORY_KEY = 'direct.white_cache.directory'
+CACHE_SIZE_KEY = 'direct.white_cache.max_size_mb'
+DEFAULT_CACHE_SIZE_MB = 2000
+ENTRY_SUFFIX = '.nxs'
+PARTIAL_PREFIX = 'partial_'
+
+
+def file_identity(file_name):
+    """Return the path, modification time and size of a file, found either
+       directly or on the Mantid data search path.
+
+       Raises OSError if the file can not be found.
+    """
+    full_path = file_name if os.path.isfile(file_name) else FileFinder.getFullPath(file_name)
+    if not full_path:
+        raise OSError('Can not find file {0}'.format(file_name))
+    stat = os.stat(full_path)
+    return [os.path.abspath(full_path), stat.st_mtime_ns, stat.st_size]
+
+
+class WhiteBeamCache(object):
+    """Stores one workspace per entry in a directory. An entry is written under a temporary
+       name and renamed when complete, so that a partially written entry is never used.
+       The modification time of an entry records when the entry was last used.
+    """
+
+    def __init__(self, directory, max_size_bytes):
+        self._directory = directory
+        self._max_size_bytes = max_size_bytes
+
+    def get_key(self, kind, files, settings):
+        """Build the key of an entry.
+
+           kind     -- the type of the workspace stored, e.g. 'integrals' or 'hard_mask'
+           files    -- the list of files the workspace is produced from
+           settings -- a list of values of the settings affecting the workspace, which
+                       have to be convertible to strings
+
+           Returns None if any of the files can not be found.
+        """
+        try:
+            identity = [mantid.__version__, kind, [file_identity(file_name) for file_name in files],
+                        [str(value) for value in settings]]
+        except OSError:
+            return None
+        return hashlib.sha1(json.dumps(identity).encode('utf-8')).hexdigest()
+
+    def load(self, key, ws_name):
+        """Load the workspace of an entry into the ADS under the name provided.
+
+           Returns the workspace or None if there is no such entry.
+        """
+        entry_path = self._get_entry_path(key)
+        if not os.path.isfile(entry_path):
+            return None
+        try:
+            workspace = LoadNexusProcessed(Filename=entry_path, OutputWorkspace=ws_name)
+            # Mark the entry as recently used
+            os.utime(entry_path)
+        except (OSError, RuntimeError, ValueError):
+            return None
+        return workspace
+
+    def save(self, key, workspace):
+        """Save a workspace as the entry with the key provided, unless it has already been saved.
+
+           Returns True if the entry is present in the cache.
+        """
+        entry_path = self._get_entry_path(key)
+        if os.path.exists(entry_path):
+            return True
+        partial_path = os.path.join(self._directory, PARTIAL_PREFIX + key + ENTRY_SUFFIX)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            SaveNexusProcessed(InputWorkspace=workspace, Filename=partial_path)
+            os.replace(partial_path, entry_path)
+        except (OSError, RuntimeError, ValueError) as error:
+            logger.warning('Can not add workspace {0} to the white beam cache in {1}: {2}'.
+                           format(workspace.name(), self._directory, str(error)))
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return False
+        self.remove_least_recently_used()
+        return True
+
+    def remove_least_recently_used(self):
+        """Remove the least recently used entries until the cache is within its size limit"""
+        entries = []
+        total_size = 0
+        for file_name in os.listdir(self._directory):
+            if file_name.startswith(PARTIAL_PREFIX) or not file_name.endswith(ENTRY_SUFFIX):
+                continue
+            entry_path = os.path.join(self._directory, file_name)
+            try:
+                size = os.path.getsize(entry_path)
+                entries.append((os.path.getmtime(entry_path), entry_path, size))
+            except OSError:
+                continue
+            total_size += size
+
+        for _, entry_path, size in sorted(entries):
+            if total_size <= self._max_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total_size -= size
+
+    def _get_entry_path(self, key):
+        return os.path.join(self._directory, key + ENTRY_SUFFIX)
+
+
+def get_white_beam_cache():
+    """Return WhiteBeamCache for the directory set in the Mantid properties,
+       or None if the cache is not enabled
+    """
+    directory = config.getString(CACHE_DIRECTORY_KEY).strip()
+    if not directory:
+        return None
+    try:
+        max_size_mb = float(config.getString(CACHE_SIZE_KEY) or DEFAULT_CACHE_SIZE_MB)
+    except ValueError:
+        max_size_mb = DEFAULT_CACHE_SIZE_MB
+    return WhiteBeamCache(directory, int(max_size_mb * 1024 * 1024))
@@ -5,7 +5,7 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import numpy as np
-from Muon.MaxentTools.chosol import  CHOSOL
+from Muon.MaxentTools.chosol import CHOSOL, CHOSOL_MANY
 
 # translation of chinow.for
 """
@@ -23,3 +23,16 @@ def CHINOW(ax, SPACE_c1, SPACE_c2, SPACE_s1, SPACE_s2, mylog):
     z = np.dot(SPACE_c2, SPACE_beta)
     w = np.sum(SPACE_beta * (SPACE_c1 + 0.5 * z))
     return 1. + w, SPACE_beta
+
+
+# CHINOW for many runs at once, with ax (runs), SPACE_c1, SPACE_s1 (runs, 3) and SPACE_c2, SPACE_s2 (runs, 3, 3)
+
+
+def CHINOW_MANY(ax, SPACE_c1, SPACE_c2, SPACE_s1, SPACE_s2, mylog):
+    bx = 1. - ax
+    a = bx[:, np.newaxis, np.newaxis] * SPACE_c2 - ax[:, np.newaxis, np.newaxis] * SPACE_s2
+    b = -(bx[:, np.newaxis] * SPACE_c1 - ax[:, np.newaxis] * SPACE_s1)
+    SPACE_beta = CHOSOL_MANY(a, b, mylog)
+    z = np.matmul(SPACE_c2, SPACE_beta[..., np.newaxis])[..., 0]
+    w = np.sum(SPACE_beta * (SPACE_c1 + 0.5 * z), axis=-1)
+    return 1. + w, SPACE_beta
@@ -81,3 +81,16 @@ def CHOSOL(a, b, mylog):
     for i in range(n - 1, -1, -1):
         x[i] = (bl[i] - np.dot(L[:, i], x)) / L[i, i]
     return x
+
+
+# CHOSOL for many runs at once, with a (runs, n, n) and b (runs, n)
+# falls back to CHOSOL for each run if any of the matrices is not positive definite
+
+
+def CHOSOL_MANY(a, b, mylog):
+    try:
+        L = np.linalg.cholesky(a)
+    except np.linalg.LinAlgError:
+        return np.array([CHOSOL(a_k, b_k, mylog) for a_k, b_k in zip(a, b)])
+    bl = np.linalg.solve(L, b[..., np.newaxis])
+    return np.linalg.solve(np.swapaxes(L, -1, -2), bl)[..., 0]
@@ -9,5 +9,6 @@ import numpy as np
 
 # inner loop Z=sum_L(S2(K,L)*beta_L)
 # outer loop W=sum(beta(k)*Z(k))
+# also for many runs, with SPACE_beta (runs, 3) and SPACE_s2 (runs, 3, 3)
 def DIST(SPACE_beta, SPACE_s2):
-    return -np.dot(SPACE_beta, np.dot(SPACE_s2, SPACE_beta))
+    return -np.sum(SPACE_beta * np.matmul(SPACE_s2, SPACE_beta[..., np.newaxis])[..., 0], axis=-1)
@@ -9,7 +9,7 @@ import math
 from Muon.MaxentTools.opus import OPUS
 from Muon.MaxentTools.tropus import TROPUS
 from Muon.MaxentTools.project import PROJECT
-from Muon.MaxentTools.move import MOVE
+from Muon.MaxentTools.move import MOVE, MOVE_MANY
 
 # translated from MAXENT.for
 """
@@ -92,8 +92,8 @@ def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, M
         if(sumfix):
             PROJECT(0, MAXPAGE_n, xi)
             PROJECT(1, MAXPAGE_n, xi)
-        eta[:,:, 0] = OPUS(xi[:, 0], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
-        eta[:,:, 1] = OPUS(xi[:, 1], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        # both directions in one transform
+        eta[:,:, :2] = np.moveaxis(OPUS(xi[:, :2].T, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e), 0, -1)
         warningMsg(eta[:,:, 0],"eta[,,0]",mylog)
         warningMsg(eta[:,:, 1],"eta[,,1]",mylog)
         ox = eta[:,:, 1]/(sigma**2)
@@ -140,3 +140,129 @@ def MAXENT(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, M
         prog.report("chisq="+str(SPACE_chisq))
 
     return (sigma, base, HERITAGE_iter, MAXPAGE_f, FAC_factor, FAC_facfake)
+
+
+def symmetricFromLower(values):
+    lower = np.tril(values)
+    return lower + np.swapaxes(np.tril(values, -1), -1, -2)
+
+
+# MAXENT for many runs at once, e.g. a temperature scan.
+# The arguments which differ between runs are stacked with the run as the first axis:
+# datum and sigma are (runs, npts, ngroups), base, MAXPAGE_f and PULSESHAPE_convol are (runs, MAXPAGE_n),
+# DETECT_a and DETECT_b are (runs, ngroups), DETECT_e is (runs, npts), FAC_factor and FAC_facfake are (runs).
+# The runs are iterated together, each one stopping once it has converged, and the results are stacked in the same way.
+def MAXENT_MANY(datum, sigma, flat, base, itermax, sumfix, SAVETIME_ngo, MAXPAGE_n, MAXPAGE_f, PULSESHAPE_convol,
+                DETECT_a, DETECT_b, DETECT_e, FAC_factor, FAC_facfake, SAVETIME_i2, mylog, prog):
+    nruns, npts, ngroups = datum.shape
+    p = npts*ngroups
+    sigma = np.array(sigma, dtype=float)
+    FAC_factor = np.array(FAC_factor, dtype=float)
+    FAC_facfake = np.array(FAC_facfake, dtype=float)
+    #
+    if(flat != 0):
+        base = np.full([nruns, MAXPAGE_n], float(flat))
+        SPACE_blank = np.full([nruns], float(flat))
+    else:
+        SPACE_blank = np.mean(base, axis=1)
+    SPACE_chizer = float(p)
+    SPACE_chtarg = np.full([nruns], SPACE_chizer)
+    iteration = 0
+    if(SAVETIME_ngo > 0):
+        iteration = 1
+        MAXPAGE_f = np.array(MAXPAGE_f, dtype=float)
+    else:
+        MAXPAGE_f = np.array(base)
+    HERITAGE_iter = np.full([nruns], iteration)
+    test = np.full([nruns], 99.)  # temporary for 1st test
+    SPACE_chisq = np.full([nruns], SPACE_chizer*2.)  # temporary for 1st test
+    converging = np.ones([nruns], dtype=bool)
+    while(iteration <= itermax):
+        if(iteration > 1):
+            converging &= ~((test < 0.02) & (np.abs(SPACE_chisq/SPACE_chizer-1) < 0.01))
+        active = np.flatnonzero(converging)
+        if(active.size == 0):
+            break
+        mylog.debug("start loop, iter={} ngo={} runs={}".format(iteration, SAVETIME_ngo, active.size))
+        f = MAXPAGE_f[active]
+        sigma2 = sigma[active]**2
+        blank = SPACE_blank[active]
+        convol = PULSESHAPE_convol[active]
+        a_det = DETECT_a[active]
+        b_det = DETECT_b[active]
+        e_det = DETECT_e[active]
+        ox = OPUS(f, SAVETIME_i2, convol, a_det, b_det, e_det)
+        warningMsg(ox, 'ox', mylog)
+        a = ox - datum[active]
+        chisq = np.sum(a**2/sigma2, axis=(1, 2))
+        ox = 2*a/sigma2
+        cgrad = TROPUS(ox, SAVETIME_i2, convol, a_det, b_det, e_det)
+        warningMsg(cgrad, 'cgrad', mylog)
+        xsum = np.sum(f, axis=1)
+        sgrad = -np.log(f/base[active])/blank[:, np.newaxis]
+        warningMsg(sgrad, 'sgrad', mylog)
+        snorm = np.sqrt(np.sum(sgrad**2*f, axis=1))
+        cnorm = np.sqrt(np.sum(cgrad**2*f, axis=1))
+        tnorm = np.sum(sgrad*cgrad*f, axis=1)
+        c = 1./cnorm
+        if(iteration != 0):
+            t = np.sqrt(0.5*np.abs(1.-tnorm/(snorm*cnorm)))
+            # also eliminate NaNs!
+            t = np.where((t < 1.E-7) | ~np.isfinite(t), 1.E-7, t)
+            a = 1./(snorm*2.*t)
+            b = 1./(cnorm*2.*t)
+        else:
+            t = np.zeros([active.size])
+            a = np.ones([active.size])
+            b = 1./cnorm
+        if(np.any(np.isnan(a) | np.isnan(b) | np.isnan(c))):
+            raise ValueError("invalid value: a={} b={} c={}".format(a, b, c))
+        xi = np.zeros([active.size, MAXPAGE_n, 3])
+        xi[:, :, 0] = f*c[:, np.newaxis]*cgrad
+        xi[:, :, 1] = f*(a[:, np.newaxis]*sgrad-b[:, np.newaxis]*cgrad)
+        warningMsg(xi[:, :, :2], 'xi[,,:2]', mylog)
+        if(sumfix):
+            xi[:, :, :2] -= np.mean(xi[:, :, :2], axis=1, keepdims=True)
+        eta = np.zeros([active.size, npts, ngroups, 3])
+        eta[..., :2] = np.moveaxis(OPUS(np.swapaxes(xi[:, :, :2], 1, 2), SAVETIME_i2, convol[:, np.newaxis],
+                                        a_det[:, np.newaxis], b_det[:, np.newaxis], e_det[:, np.newaxis]), 1, -1)
+        warningMsg(eta[..., :2], "eta[,,,:2]", mylog)
+        ox = eta[..., 1]/sigma2
+        xi[:, :, 2] = TROPUS(ox, SAVETIME_i2, convol, a_det, b_det, e_det)
+        warningMsg(xi[:, :, 2], "xi[,,2]", mylog)
+        a = 1./np.sqrt(np.sum(xi[:, :, 2]**2*f, axis=1))
+        xi[:, :, 2] = xi[:, :, 2]*f*a[:, np.newaxis]
+        if(sumfix):
+            xi[:, :, 2] -= np.mean(xi[:, :, 2], axis=1, keepdims=True)
+        eta[..., 2] = OPUS(xi[:, :, 2], SAVETIME_i2, convol, a_det, b_det, e_det)
+        warningMsg(eta[..., 2], "eta[,,,2]", mylog)
+        SPACE_s1 = np.matmul(sgrad[:, np.newaxis, :], xi)[:, 0]
+        SPACE_c1 = np.matmul(cgrad[:, np.newaxis, :], xi)[:, 0]/chisq[:, np.newaxis]
+        SPACE_s2 = -np.matmul(np.swapaxes(xi, 1, 2), xi/f[:, :, np.newaxis])/blank[:, np.newaxis, np.newaxis]
+        eta = eta.reshape([active.size, p, 3])
+        SPACE_c2 = np.matmul(np.swapaxes(eta, 1, 2), eta/sigma2.reshape([active.size, p, 1]))*2./chisq[:, np.newaxis, np.newaxis]
+        SPACE_s2 = symmetricFromLower(SPACE_s2)
+        SPACE_c2 = symmetricFromLower(SPACE_c2)
+        s = -np.sum(f*np.log(f/(base[active]*math.e)), axis=1)/(blank*math.e)
+        for k, run in enumerate(active):
+            mylog.information("{:3} {:3}    {:10.4}  {:10.4}  {:10.4}  {:10.4}  {:10.4}".format(run, iteration,
+                              t[k], s[k], SPACE_chtarg[run], chisq[k], xsum[k]))
+        SPACE_beta = np.zeros([active.size, 3])
+        SPACE_beta[:, 0] = -0.5*SPACE_c1[:, 0]/SPACE_c2[:, 0, 0]
+        warningMsg(SPACE_beta, "SPACE_beta", mylog)
+        if(iteration != 0):
+            (sigma[active], SPACE_chtarg[active], SPACE_beta, FAC_factor[active], FAC_facfake[active]) = MOVE_MANY(
+                    sigma[active], chisq, SPACE_chizer, xsum, SPACE_c1, SPACE_c2, SPACE_s1,
+                    SPACE_s2, blank, FAC_factor[active], FAC_facfake[active], mylog)
+        f += np.matmul(xi, SPACE_beta[:, :, np.newaxis])[:, :, 0]
+        f = np.where(f < 0, 1.E-3*blank[:, np.newaxis], f)
+        if(sumfix):
+            f /= np.sum(f, axis=1, keepdims=True)
+        MAXPAGE_f[active] = f
+        SPACE_chisq[active] = chisq
+        test[active] = t
+        iteration += 1
+        HERITAGE_iter[active] = iteration
+        prog.report("runs converging="+str(active.size))
+
+    return (sigma, base, HERITAGE_iter, MAXPAGE_f, FAC_factor, FAC_facfake)
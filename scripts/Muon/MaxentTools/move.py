@@ -6,7 +6,9 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import math
 
-from Muon.MaxentTools.chinow import CHINOW
+import numpy as np
+
+from Muon.MaxentTools.chinow import CHINOW, CHINOW_MANY
 from Muon.MaxentTools.dist import DIST
 
 
@@ -68,3 +70,65 @@ def MOVE(
             math.sqrt(0.1 * SPACE_xsum / (SPACE_blank * w))
     SPACE_chtarg = ctarg * SPACE_chisq
     return sigma, SPACE_chtarg, SPACE_beta, FAC_factor, FAC_facfake
+
+
+# MOVE for many runs at once, with the arguments stacked with the run as the first axis,
+# except for SPACE_chizer which is the same for all the runs.
+# The bisection carries on until every run has converged or got stuck.
+
+def MOVE_MANY(
+     sigma,
+     SPACE_chisq,
+     SPACE_chizer,
+     SPACE_xsum,
+     SPACE_c1,
+     SPACE_c2,
+     SPACE_s1,
+     SPACE_s2,
+     SPACE_blank,
+     FAC_factor,
+     FAC_facfake,
+     mylog):
+    nruns = SPACE_chisq.shape[0]
+    sigma = np.array(sigma)
+    FAC_factor = np.array(FAC_factor, dtype=float)
+    FAC_facfake = np.array(FAC_facfake, dtype=float)
+    (cmin, SPACE_beta) = CHINOW_MANY(np.zeros([nruns]), SPACE_c1,
+                                     SPACE_c2, SPACE_s1, SPACE_s2, mylog)
+    ctarg = np.where(cmin * SPACE_chisq > SPACE_chizer, 0.5 * (1. + cmin), SPACE_chizer / SPACE_chisq)
+    a1 = np.zeros([nruns])
+    a2 = np.ones([nruns])
+    jtest = np.zeros([nruns], dtype=int)
+    f1 = cmin - ctarg
+    (f2, SPACE_beta) = CHINOW_MANY(np.ones([nruns]), SPACE_c1,
+                                   SPACE_c2, SPACE_s1, SPACE_s2, mylog)
+    f2 = f2 - ctarg
+    searching = np.arange(nruns)
+    while(searching.size > 0):
+        anew = 0.5 * (a1[searching] + a2[searching])
+        (fx, SPACE_beta[searching]) = CHINOW_MANY(anew, SPACE_c1[searching], SPACE_c2[searching],
+                                                  SPACE_s1[searching], SPACE_s2[searching], mylog)
+        fx = fx - ctarg[searching]
+        lower = f1[searching] * fx > 0
+        a1[searching[lower]] = anew[lower]
+        f1[searching[lower]] = fx[lower]
+        upper = f2[searching] * fx > 0
+        a2[searching[upper]] = anew[upper]
+        f2[searching[upper]] = fx[upper]
+        loose = np.abs(fx) >= 1.E-3
+        jtest[searching[loose]] += 1
+        stuck = loose & (jtest[searching] > 10000)
+        for run in searching[stuck]:
+            mylog.notice(' stuck in MOVE : chi**2 not tight enough')
+            sigma[run] = sigma[run] * 0.99
+            FAC_factor[run] = FAC_factor[run] * 0.99
+            FAC_facfake[run] = FAC_facfake[run] * 0.99
+            mylog.notice(
+                ' tightening looseness factor by 1 % to: {0}'.format(FAC_factor[run]))
+        searching = searching[loose & ~stuck]
+    w = DIST(SPACE_beta, SPACE_s2)
+    too_far = w > 0.1 * SPACE_xsum / SPACE_blank
+    SPACE_beta[too_far] = SPACE_beta[too_far] * \
+        np.sqrt(0.1 * SPACE_xsum[too_far] / (SPACE_blank[too_far] * w[too_far]))[:, np.newaxis]
+    SPACE_chtarg = ctarg * SPACE_chisq
+    return sigma, SPACE_chtarg, SPACE_beta, FAC_factor, FAC_facfake
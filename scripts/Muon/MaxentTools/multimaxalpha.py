@@ -9,7 +9,7 @@ import numpy as np
 from Muon.MaxentTools.input import INPUT
 from Muon.MaxentTools.start import START
 from Muon.MaxentTools.back import BACK
-from Muon.MaxentTools.maxent import MAXENT
+from Muon.MaxentTools.maxent import MAXENT, MAXENT_MANY
 from Muon.MaxentTools.deadfit import DEADFIT
 from Muon.MaxentTools.modbak import MODBAK
 from Muon.MaxentTools.modamp import MODAMP
@@ -83,3 +83,91 @@ def MULTIMAX(
                             MISSCHANNELS_mm, RUNDATA_fnorm, RUNDATA_hists, MAXPAGE_f, FAC_factor, FAC_facfake, FAC_ratio,
                             DETECT_a, DETECT_b, DETECT_c, DETECT_d, DETECT_e, PULSESHAPE_convol, SENSE_taud, FASE_phase, SAVETIME_ngo,
                             AMPS_amp, SENSE_phi, OUTSPEC_test, OUTSPEC_guess)
+
+
+# MULTIMAX for many runs at once, e.g. the runs of a temperature scan, with the MaxEnt iterations
+# of all the runs done together on stacked arrays.
+# CHANNELS_itzero, CHANNELS_i1stgood, CHANNELS_itotal, RUNDATA_frames, DATALL_rdata, FAC_factor, SENSE_taud,
+# filePHASE and TZERO_fine are lists with an entry for each run. The other arguments are shared by all of the runs,
+# which must have the same binning and grouping.
+# Returns a list with the values MULTIMAX returns for each run.
+def MULTIMAX_MANY(
+      POINTS_nhists, POINTS_ngroups, POINTS_npts, CHANNELS_itzero, CHANNELS_i1stgood, CHANNELS_itotal, RUNDATA_res, RUNDATA_frames,
+      GROUPING_group, DATALL_rdata, FAC_factor, SENSE_taud, MAXPAGE_n, filePHASE,
+      PULSES_def, PULSES_npulse, FLAGS_fitdead, FLAGS_fixphase, SAVETIME_i2,
+      OuterIter, InnerIter, mylog, prog, TZERO_fine):
+    #
+    nruns = len(DATALL_rdata)
+    base = np.zeros([nruns, MAXPAGE_n])
+    datum = np.zeros([nruns, POINTS_npts, POINTS_ngroups])
+    sigma = np.zeros([nruns, POINTS_npts, POINTS_ngroups])
+    DETECT_a = np.zeros([nruns, POINTS_ngroups])
+    DETECT_b = np.zeros([nruns, POINTS_ngroups])
+    DETECT_e = np.zeros([nruns, POINTS_npts])
+    PULSESHAPE_convol = np.zeros([nruns, MAXPAGE_n], dtype=complex)
+    FAC_factor = np.array(FAC_factor, dtype=float)
+    FAC_facfake = np.zeros([nruns])
+    SENSE_taud = list(SENSE_taud)
+    corr, datt, MISSCHANNELS_mm, RUNDATA_fnorm, RUNDATA_hists, FAC_ratio = [], [], [], [], [], []
+    DETECT_c, DETECT_d, FASE_phase, SENSE_phi, AMPS_amp = [None] * nruns, [], [], [None] * nruns, [None] * nruns
+    for r in range(nruns):
+        (datum[r], sigma[r], corr_r, datt_r, mm_r, fnorm_r, hists_r, FAC_facfake[r], ratio_r) = INPUT(
+            POINTS_nhists, POINTS_ngroups, POINTS_npts, CHANNELS_itzero[r], CHANNELS_i1stgood[r], CHANNELS_itotal[r],
+            RUNDATA_res, RUNDATA_frames[r], GROUPING_group, DATALL_rdata[r], FAC_factor[r], SENSE_taud[r], mylog)
+        corr.append(corr_r)
+        datt.append(datt_r)
+        MISSCHANNELS_mm.append(mm_r)
+        RUNDATA_fnorm.append(fnorm_r)
+        RUNDATA_hists.append(hists_r)
+        FAC_ratio.append(ratio_r)
+
+        (DETECT_e[r], PULSESHAPE_convol[r]) = START(
+            POINTS_npts, PULSES_npulse, RUNDATA_res, MAXPAGE_n, TZERO_fine[r], mylog)
+
+        (datum[r], DETECT_a[r], DETECT_b[r], DETECT_d_r, FASE_phase_r) = BACK(
+            RUNDATA_hists[r], datum[r], sigma[r], DETECT_e[r], filePHASE[r], mylog)
+        DETECT_d.append(DETECT_d_r)
+        FASE_phase.append(FASE_phase_r)
+    SAVETIME_ngo = -1
+    MAXPAGE_f = None
+    for j in range(OuterIter):  # outer "alpha chop" iterations?
+        SAVETIME_ngo = SAVETIME_ngo + 1
+        mylog.information("CYCLE NUMBER=" + str(SAVETIME_ngo))
+        (sigma, base, HERITAGE_iter, MAXPAGE_f, FAC_factor, FAC_facfake) = MAXENT_MANY(
+            datum, sigma, PULSES_def, base, InnerIter, False,
+            SAVETIME_ngo, MAXPAGE_n, MAXPAGE_f, PULSESHAPE_convol, DETECT_a,
+            DETECT_b, DETECT_e, FAC_factor, FAC_facfake, SAVETIME_i2, mylog, prog)
+
+        for r in range(nruns):
+            if(FLAGS_fitdead):
+                (datum[r], corr[r], DETECT_c[r], DETECT_d[r], SENSE_taud[r]) = DEADFIT(
+                    datum[r], sigma[r], datt[r], DETECT_a[r], DETECT_b[r], DETECT_d[r], DETECT_e[r], RUNDATA_res,
+                    RUNDATA_frames[r], RUNDATA_fnorm[r], RUNDATA_hists[r], MAXPAGE_n, MAXPAGE_f[r], PULSESHAPE_convol[r],
+                    SAVETIME_i2, mylog)
+            else:
+                (DETECT_c[r], DETECT_d[r]) = MODBAK(RUNDATA_hists[r], datum[r], sigma[r], DETECT_a[r], DETECT_b[r],
+                                                    DETECT_e[r], DETECT_d[r], MAXPAGE_f[r], PULSESHAPE_convol[r],
+                                                    SAVETIME_i2, mylog)
+
+            if(FLAGS_fixphase):
+                (SENSE_phi[r], DETECT_a[r], DETECT_b[r], AMPS_amp[r]) = MODAMP(
+                    RUNDATA_hists[r], datum[r], sigma[r], MISSCHANNELS_mm[r], FASE_phase[r], MAXPAGE_f[r],
+                    PULSESHAPE_convol[r], DETECT_e[r], SAVETIME_i2, mylog)
+            else:
+                (SENSE_phi[r], DETECT_a[r], DETECT_b[r], AMPS_amp[r]) = MODAB(
+                    RUNDATA_hists[r], datum[r], sigma[r], MISSCHANNELS_mm[r], MAXPAGE_f[r], PULSESHAPE_convol[r],
+                    DETECT_e[r], SAVETIME_i2, mylog)
+
+        prog.report((j + 1) * InnerIter, "")
+        # finished outer loop, jump progress bar
+
+    results = []
+    for r in range(nruns):
+        (OUTSPEC_test, OUTSPEC_guess) = OUTSPEC(datum[r], MAXPAGE_f[r], sigma[r], datt[r], CHANNELS_itzero[r],
+                                                CHANNELS_itotal[r], PULSESHAPE_convol[r], FAC_ratio[r], DETECT_a[r],
+                                                DETECT_b[r], DETECT_d[r], DETECT_e[r], SAVETIME_i2, RUNDATA_fnorm[r], mylog)
+        results.append((
+            MISSCHANNELS_mm[r], RUNDATA_fnorm[r], RUNDATA_hists[r], MAXPAGE_f[r], FAC_factor[r], FAC_facfake[r],
+            FAC_ratio[r], DETECT_a[r], DETECT_b[r], DETECT_c[r], DETECT_d[r], DETECT_e[r], PULSESHAPE_convol[r],
+            SENSE_taud[r], FASE_phase[r], SAVETIME_ngo, AMPS_amp[r], SENSE_phi[r], OUTSPEC_test, OUTSPEC_guess))
+    return results
@@ -7,12 +7,12 @@
 import numpy as np
 
 
+# x may have leading axes for many runs, e.g. (runs, n), with the other arrays stacked in the same way
 def OPUS(x, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e):
-    npts = DETECT_e.shape[0]
-    n = x.shape[0]
-    y = np.zeros([SAVETIME_i2], dtype=np.complex_)
-    y[:n] = x * PULSESHAPE_convol
-    y2 = np.fft.ifft(y) * SAVETIME_i2  # SN=+1, inverse FFT without the 1/N
-    ox = (np.outer(np.real(y2[:npts]), DETECT_a) + np.outer(
-        np.imag(y2[:npts]), DETECT_b)) * DETECT_e[:, np.newaxis]
+    npts = DETECT_e.shape[-1]
+    # the transform is zero padded to SAVETIME_i2 points
+    y2 = np.fft.ifft(x * PULSESHAPE_convol, n=SAVETIME_i2)[..., :npts] * SAVETIME_i2  # SN=+1, inverse FFT without the 1/N
+    # scale by DETECT_e before the outer products, which are the largest arrays here
+    ox = (np.real(y2) * DETECT_e)[..., :, np.newaxis] * DETECT_a[..., np.newaxis, :] + \
+        (np.imag(y2) * DETECT_e)[..., :, np.newaxis] * DETECT_b[..., np.newaxis, :]
     return ox
@@ -7,16 +7,13 @@
 import numpy as np
 
 
+# ox may have leading axes for many runs, e.g. (runs, npts, ngroups), with the other arrays stacked in the same way
 def TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e):
-    npts, ngroups = ox.shape
-    n = PULSESHAPE_convol.shape[0]
-    y = np.zeros([SAVETIME_i2], dtype=np.complex_)
-    y[:npts] = np.dot(
-        ox,
-        DETECT_a) * DETECT_e + 1.j * np.dot(ox,
-                                            DETECT_b) * DETECT_e
-    y2 = np.fft.fft(y)  # SN=-1 meaning forward fft, scale is OK
-    x = np.real(y2)[:n] * np.real(PULSESHAPE_convol) + \
-        np.imag(y2)[:n] * np.imag(PULSESHAPE_convol)
+    n = PULSESHAPE_convol.shape[-1]
+    y = np.matmul(ox, DETECT_a[..., np.newaxis])[..., 0] * DETECT_e + \
+        1.j * np.matmul(ox, DETECT_b[..., np.newaxis])[..., 0] * DETECT_e
+    y2 = np.fft.fft(y, n=SAVETIME_i2)  # SN=-1 meaning forward fft, scale is OK, zero padded to SAVETIME_i2 points
+    x = np.real(y2)[..., :n] * np.real(PULSESHAPE_convol) + \
+        np.imag(y2)[..., :n] * np.imag(PULSESHAPE_convol)
 
     return x
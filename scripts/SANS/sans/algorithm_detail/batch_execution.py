@@ -4,7 +4,10 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from itertools import count
 
 from mantid.api import AnalysisDataService, WorkspaceGroup
 from mantid.dataobjects import Workspace2D
@@ -25,6 +28,19 @@ from sans.gui_logic.plotting import get_plotting_module
 from sans.state.Serializer import Serializer
 from sans.state.StateObjects.StateData import StateData
 
+WORKSPACE_TO_NAME = {SANSDataType.SAMPLE_SCATTER: "SampleScatterWorkspace",
+                     SANSDataType.SAMPLE_TRANSMISSION: "SampleTransmissionWorkspace",
+                     SANSDataType.SAMPLE_DIRECT: "SampleDirectWorkspace",
+                     SANSDataType.CAN_SCATTER: "CanScatterWorkspace",
+                     SANSDataType.CAN_TRANSMISSION: "CanTransmissionWorkspace",
+                     SANSDataType.CAN_DIRECT: "CanDirectWorkspace"}
+
+WORKSPACE_TO_MONITOR = {SANSDataType.SAMPLE_SCATTER: "SampleScatterMonitorWorkspace",
+                        SANSDataType.CAN_SCATTER: "CanScatterMonitorWorkspace"}
+
+# Gives each reduction its own name for the shift and scale factors workspace, as reductions can run at the same time
+_shift_and_scale_factors_ids = count()
+
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Functions for the execution of a single batch iteration
@@ -56,7 +72,8 @@ def select_reduction_alg(split_for_event_slices, use_compatibility_mode,
     return event_slice_optimisation, reduction_packages
 
 
-def single_reduction_for_batch(state, use_optimizations, output_mode, plot_results, output_graph, save_can=False):
+def single_reduction_for_batch(state, use_optimizations, output_mode, plot_results, output_graph, save_can=False,
+                               number_of_workers=1):
     """
     Runs a single reduction.
 
@@ -71,21 +88,105 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
                          with event slice compatibility
     :param output_graph: The graph object for plotting workspaces.
     :param save_can: bool. whether or not to save out can workspaces
+    :param number_of_workers: the number of reduction packages which are reduced at the same time.
+    """
+    if number_of_workers > 1:
+        reduce_can_first = _get_can_for_optimizations(state, use_optimizations) is not None
+        with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            batch_reduction = start_reduction_for_batch(state, use_optimizations, save_can, executor,
+                                                        reduce_can_first=reduce_can_first)
+            return finish_reduction_for_batch(batch_reduction, output_mode, plot_results, output_graph, save_can)
+    else:
+        batch_reduction = start_reduction_for_batch(state, use_optimizations, save_can)
+        return finish_reduction_for_batch(batch_reduction, output_mode, plot_results, output_graph, save_can)
+
+
+def reductions_for_batch(states, use_optimizations, output_mode, plot_results, output_graph, save_can=False,
+                         number_of_workers=1):
+    """
+    Runs the reduction for each state, as single_reduction_for_batch does.
+
+    With more than one worker the reduction packages of several states are reduced at the same time. The data is
+    loaded, and the results are published, one state at a time and in order as both use the ADS. While the packages
+    of the earlier states are being reduced the data for up to number_of_workers further states is loaded.
+
+    The reduced can is only added to the ADS when it is published, so with optimizations the first state which uses a
+    can waits for the earlier states to finish, and its first package is reduced on its own before the other packages
+    can reuse the can. Without optimizations the loaded data is deleted once a state is finished, so the states are
+    reduced one after the other, with only their packages reduced at the same time.
+    :param states: a list of SANSState objects
+    :param use_optimizations: if true then the optimizations of child algorithms are enabled.
+    :param output_mode: the output mode
+    :param plot_results: bool. Whether or not workspaces should be plotted as they are reduced.
+    :param output_graph: The graph object for plotting workspaces.
+    :param save_can: bool. whether or not to save out can workspaces
+    :param number_of_workers: the number of reduction packages which are reduced at the same time.
+    :return: a list of the scale factors and a list of the shift factors for each state
+    """
+    out_scale_factors_list = []
+    out_shift_factors_list = []
+
+    def _finish(_batch_reduction):
+        out_scale_factors, out_shift_factors = finish_reduction_for_batch(_batch_reduction, output_mode, plot_results,
+                                                                          output_graph, save_can)
+        out_scale_factors_list.append(out_scale_factors)
+        out_shift_factors_list.append(out_shift_factors)
+
+    if number_of_workers > 1:
+        with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            started_reductions = deque()
+            reduced_cans = set()
+            for state in states:
+                can = _get_can_for_optimizations(state, use_optimizations)
+                reduce_can_first = can is not None and can not in reduced_cans
+                if reduce_can_first or not use_optimizations:
+                    while started_reductions:
+                        _finish(started_reductions.popleft())
+                started_reductions.append(start_reduction_for_batch(state, use_optimizations, save_can, executor,
+                                                                    reduce_can_first=reduce_can_first))
+                reduced_cans.add(can)
+                if reduce_can_first or not use_optimizations or len(started_reductions) > number_of_workers:
+                    _finish(started_reductions.popleft())
+            while started_reductions:
+                _finish(started_reductions.popleft())
+    else:
+        for state in states:
+            _finish(start_reduction_for_batch(state, use_optimizations, save_can))
+    return out_scale_factors_list, out_shift_factors_list
+
+
+def _get_can_for_optimizations(state, use_optimizations):
+    """
+    Gets the can data of a state whose reduced can is reused by later reductions.
+
+    :param state: a SANSState object
+    :param use_optimizations: if true then the optimizations of child algorithms are enabled.
+    :return: a tuple which identifies the can data, or None if the reduced can is not reused
+    """
+    data = state.data
+    if not use_optimizations or data.can_scatter is None:
+        return None
+    return (data.can_scatter, data.can_scatter_period, data.can_transmission, data.can_transmission_period,
+            data.can_direct, data.can_direct_period)
+
+
+def start_reduction_for_batch(state, use_optimizations, save_can=False, executor=None, reduce_can_first=False):
+    """
+    Loads the data for a state and starts the reduction of its reduction packages.
+
+    :param state: a SANSState object
+    :param use_optimizations: if true then the optimizations of child algorithms are enabled.
+    :param save_can: bool. whether or not to save out can workspaces
+    :param executor: optional. A concurrent.futures.Executor on which the reduction packages are reduced. If it is not
+                     given each package is reduced when finish_reduction_for_batch reaches it.
+    :param reduce_can_first: bool. If true the first package is reduced, and published by finish_reduction_for_batch,
+                             before the other packages are started, so that they can reuse its reduced can.
+    :return: a BatchReduction object to pass to finish_reduction_for_batch
     """
     # ------------------------------------------------------------------------------------------------------------------
     # Load the data
     # ------------------------------------------------------------------------------------------------------------------
-    workspace_to_name = {SANSDataType.SAMPLE_SCATTER: "SampleScatterWorkspace",
-                         SANSDataType.SAMPLE_TRANSMISSION: "SampleTransmissionWorkspace",
-                         SANSDataType.SAMPLE_DIRECT: "SampleDirectWorkspace",
-                         SANSDataType.CAN_SCATTER: "CanScatterWorkspace",
-                         SANSDataType.CAN_TRANSMISSION: "CanTransmissionWorkspace",
-                         SANSDataType.CAN_DIRECT: "CanDirectWorkspace"}
-
-    workspace_to_monitor = {SANSDataType.SAMPLE_SCATTER: "SampleScatterMonitorWorkspace",
-                            SANSDataType.CAN_SCATTER: "CanScatterMonitorWorkspace"}
-
-    workspaces, monitors = provide_loaded_data(state, use_optimizations, workspace_to_name, workspace_to_monitor)
+    workspaces, monitors = provide_loaded_data(state, use_optimizations, WORKSPACE_TO_NAME, WORKSPACE_TO_MONITOR)
 
     # ------------------------------------------------------------------------------------------------------------------
     # Get reduction settings
@@ -100,8 +201,39 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
                                                                         reduction_packages)
 
     # ------------------------------------------------------------------------------------------------------------------
-    # Run reductions (one at a time)
+    # Run reductions, each with its own reduction algorithm so that they can run at the same time
     # ------------------------------------------------------------------------------------------------------------------
+    def _reduce(_reduction_package):
+        return reduce_package(_reduction_package, use_optimizations, save_can, event_slice_optimisation)
+
+    def _reduce_concurrently(_reduction_packages):
+        if reduce_can_first and _reduction_packages:
+            yield executor.submit(_reduce, _reduction_packages[0]).result()
+            _reduction_packages = _reduction_packages[1:]
+        futures = [executor.submit(_reduce, _reduction_package) for _reduction_package in _reduction_packages]
+        for future in futures:
+            yield future.result()
+
+    if executor is None:
+        reduced_packages = map(_reduce, reduction_packages)
+    else:
+        reduced_packages = _reduce_concurrently(reduction_packages)
+
+    return BatchReduction(state, use_optimizations, workspaces, monitors, reduction_packages, reduced_packages,
+                          event_slice_optimisation)
+
+
+def reduce_package(reduction_package, use_optimizations, save_can, event_slice_optimisation):
+    """
+    Reduces a single reduction package with a new SANSSingleReduction algorithm. The reduced workspaces and the shift
+    and scale factors are stored on the reduction package, but are not added to the ADS.
+
+    :param reduction_package: a reduction package object
+    :param use_optimizations: if true then the optimizations of child algorithms are enabled.
+    :param save_can: bool. whether or not to save out can workspaces
+    :param event_slice_optimisation: bool. If true then version 2 of SANSSingleReduction is used.
+    :return: the reduction package
+    """
     single_reduction_name = "SANSSingleReduction"
     single_reduction_options = {"UseOptimizations": use_optimizations,
                                 "SaveCan": save_can}
@@ -110,30 +242,53 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
                                                        **single_reduction_options)
     reduction_alg.setChild(False)
     reduction_alg.setAlwaysStoreInADS(False)
-    # Perform the data reduction
-    for reduction_package in reduction_packages:
-        # -----------------------------------
-        # Set the properties on the algorithm
-        # -----------------------------------
-        set_properties_for_reduction_algorithm(reduction_alg, reduction_package,
-                                               workspace_to_name, workspace_to_monitor,
-                                               event_slice_optimisation=event_slice_optimisation)
 
-        # -----------------------------------
-        #  Run the reduction
-        # -----------------------------------
-        reduction_alg.execute()
-
-        # -----------------------------------
-        # Get the output of the algorithm
-        # -----------------------------------
-        _get_ws_from_alg(reduction_alg, reduction_package)
+    # -----------------------------------
+    # Set the properties on the algorithm
+    # -----------------------------------
+    shift_and_scale_factors_name = "ShiftAndScaleFactors_{}".format(next(_shift_and_scale_factors_ids))
+    set_properties_for_reduction_algorithm(reduction_alg, reduction_package,
+                                           WORKSPACE_TO_NAME, WORKSPACE_TO_MONITOR,
+                                           event_slice_optimisation=event_slice_optimisation,
+                                           shift_and_scale_factors_name=shift_and_scale_factors_name)
+
+    # -----------------------------------
+    #  Run the reduction
+    # -----------------------------------
+    reduction_alg.execute()
+
+    # -----------------------------------
+    # Get the output of the algorithm
+    # -----------------------------------
+    _get_ws_from_alg(reduction_alg, reduction_package)
+
+    out_scale_factor, out_shift_factor = get_shift_and_scale_factors_from_algorithm(reduction_alg,
+                                                                                    event_slice_optimisation)
+    reduction_package.out_scale_factor = out_scale_factor
+    reduction_package.out_shift_factor = out_shift_factor
+    reduction_package.shift_and_scale_factors_name = shift_and_scale_factors_name
+    return reduction_package
+
+
+def finish_reduction_for_batch(batch_reduction, output_mode, plot_results, output_graph, save_can=False):
+    """
+    Waits for the reduction packages started by start_reduction_for_batch, then publishes, saves and cleans up the
+    reduced workspaces.
 
+    :param batch_reduction: a BatchReduction object created by start_reduction_for_batch
+    :param output_mode: the output mode
+    :param plot_results: bool. Whether or not workspaces should be plotted as they are reduced. Currently only works
+                         with event slice compatibility
+    :param output_graph: The graph object for plotting workspaces.
+    :param save_can: bool. whether or not to save out can workspaces
+    :return: a list of scale factors and a list of shift factors
+    """
+    event_slice_optimisation = batch_reduction.event_slice_optimisation
+    reduction_packages = batch_reduction.reduction_packages
+    for reduction_package in batch_reduction.reduced_packages:
+        # Workspaces are only removed from the ADS on this thread, as other reductions may be searching it
+        delete_shift_and_scale_factors_workspace(reduction_package)
         set_alg_output_names(reduction_package, event_slice_optimisation)
-        out_scale_factor, out_shift_factor = get_shift_and_scale_factors_from_algorithm(reduction_alg,
-                                                                                        event_slice_optimisation)
-        reduction_package.out_scale_factor = out_scale_factor
-        reduction_package.out_shift_factor = out_shift_factor
 
         if not event_slice_optimisation and plot_results:
             # Plot results is intended to show the result of each workspace/slice as it is reduced
@@ -145,7 +300,7 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
         group_workspaces_if_required(reduction_package, output_mode, save_can,
                                      event_slice_optimisation=event_slice_optimisation)
 
-    data = state.data
+    data = batch_reduction.state.data
     additional_run_numbers = {"SampleTransmissionRunNumber":
                               "" if data.sample_transmission is None else str(data.sample_transmission),
                               "SampleDirectRunNumber":
@@ -175,8 +330,9 @@ def single_reduction_for_batch(state, use_optimizations, output_mode, plot_resul
     # -----------------------------------------------------------------------
     # Clean up other workspaces if the optimizations have not been turned on.
     # -----------------------------------------------------------------------
-    if not use_optimizations:
-        delete_optimization_workspaces(reduction_packages, workspaces, monitors, save_can)
+    if not batch_reduction.use_optimizations:
+        delete_optimization_workspaces(reduction_packages, batch_reduction.workspaces, batch_reduction.monitors,
+                                       save_can)
 
     out_scale_factors = []
     out_shift_factors = []
@@ -214,17 +370,7 @@ def _get_ws_from_alg(reduction_alg, reduction_package):
 
 
 def load_workspaces_from_states(state):
-    workspace_to_name = {SANSDataType.SAMPLE_SCATTER: "SampleScatterWorkspace",
-                         SANSDataType.SAMPLE_TRANSMISSION: "SampleTransmissionWorkspace",
-                         SANSDataType.SAMPLE_DIRECT: "SampleDirectWorkspace",
-                         SANSDataType.CAN_SCATTER: "CanScatterWorkspace",
-                         SANSDataType.CAN_TRANSMISSION: "CanTransmissionWorkspace",
-                         SANSDataType.CAN_DIRECT: "CanDirectWorkspace"}
-
-    workspace_to_monitor = {SANSDataType.SAMPLE_SCATTER: "SampleScatterMonitorWorkspace",
-                            SANSDataType.CAN_SCATTER: "CanScatterMonitorWorkspace"}
-
-    workspaces, monitors = provide_loaded_data(state, True, workspace_to_name, workspace_to_monitor)
+    workspaces, monitors = provide_loaded_data(state, True, WORKSPACE_TO_NAME, WORKSPACE_TO_MONITOR)
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -675,7 +821,8 @@ def get_workspace_for_index(index, workspace_list):
 
 
 def set_properties_for_reduction_algorithm(reduction_alg, reduction_package, workspace_to_name, workspace_to_monitor,
-                                           event_slice_optimisation=False):
+                                           event_slice_optimisation=False,
+                                           shift_and_scale_factors_name="ShiftAndScaleFactors"):
     """
     Sets up everything necessary on the reduction algorithm.
 
@@ -685,6 +832,8 @@ def set_properties_for_reduction_algorithm(reduction_alg, reduction_package, wor
     :param workspace_to_monitor: a workspace to monitor map
     :param event_slice_optimisation: optional bool. If true then using SANSSingleReductionEventSlice algorithm.
                         In this base, names and base names should not include time slice information.
+    :param shift_and_scale_factors_name: optional. The name of the shift and scale factors workspace in event slice
+                                         mode. It is deleted once the factors have been read.
     """
     # Go through the elements of the reduction package and set them on the reduction algorithm
     # Set the SANSState
@@ -714,7 +863,7 @@ def set_properties_for_reduction_algorithm(reduction_alg, reduction_package, wor
     if event_slice_optimisation:
         # In event slice mode, we can have multiple shift and scale factors for one reduction package
         # there we output these as a workspace containing shifts as X data and scales as Y data.
-        reduction_alg.setProperty("OutShiftAndScaleFactor", "ShiftAndScaleFactors")
+        reduction_alg.setProperty("OutShiftAndScaleFactor", shift_and_scale_factors_name)
         # Set properties used to generated names for workspaces within the output workspace groups
         reduction_alg.setProperty("Period", is_part_of_multi_period_reduction)
         reduction_alg.setProperty("WavelengthRange", is_part_of_wavelength_range_reduction)
@@ -909,7 +1058,8 @@ def get_workspace_from_algorithm(alg, output_property_name):
 def get_shift_and_scale_factors_from_algorithm(alg, event_slice_optimisation):
     """
     Retrieve the shift and scale factors from the algorithm. In event slice mode there can be multiple shift
-    and scale factors. These are output as a workspace containing scale and shift as X, Y data, respectively.
+    and scale factors. These are output as a workspace containing scale and shift as X, Y data, respectively. The
+    workspace is left on the ADS, it is deleted by finish_reduction_for_batch.
     :param alg: The SingleReduction algorithm
     :param event_slice_optimisation: bool. If true, then version 2 has been run, otherwise v1.
     :return: a list of shift factors, a list of scale factors
@@ -919,15 +1069,23 @@ def get_shift_and_scale_factors_from_algorithm(alg, event_slice_optimisation):
         if factors_workspace is None:
             return [], []
         else:
-            scales = factors_workspace.readX(0)
-            shifts = factors_workspace.readY(0)
-            delete_alg = create_unmanaged_algorithm("DeleteWorkspace", **{"Workspace": "ShiftAndScaleFactors"})
-            delete_alg.execute()
-            return scales, shifts
+            return factors_workspace.readX(0), factors_workspace.readY(0)
     else:
         return [alg.getProperty("OutScaleFactor").value], [alg.getProperty("OutShiftFactor").value]
 
 
+def delete_shift_and_scale_factors_workspace(reduction_package):
+    """
+    Deletes the shift and scale factors workspace which version 2 of SANSSingleReduction leaves on the ADS.
+
+    :param reduction_package: a reduction package which has been reduced by reduce_package
+    """
+    factors_name = reduction_package.shift_and_scale_factors_name
+    if factors_name and AnalysisDataService.doesExist(factors_name):
+        delete_alg = create_unmanaged_algorithm("DeleteWorkspace", **{"Workspace": factors_name})
+        delete_alg.execute()
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 # Functions for outputs to the ADS and saving the file
 # ----------------------------------------------------------------------------------------------------------------------
@@ -1384,6 +1542,25 @@ class ReducedDataType(object):
         pass
 
 
+class BatchReduction(object):
+    """
+    Holds a state whose reduction packages have been started by start_reduction_for_batch, along with what
+    finish_reduction_for_batch needs to publish the results
+    """
+
+    def __init__(self, state, use_optimizations, workspaces, monitors, reduction_packages, reduced_packages,
+                 event_slice_optimisation):
+        super(BatchReduction, self).__init__()
+        self.state = state
+        self.use_optimizations = use_optimizations
+        self.workspaces = workspaces
+        self.monitors = monitors
+        self.reduction_packages = reduction_packages
+        # An iterator which gives each reduction package, in order, once it has been reduced
+        self.reduced_packages = reduced_packages
+        self.event_slice_optimisation = event_slice_optimisation
+
+
 class ReductionPackage(object):
     """
     The reduction package is a mutable store for
@@ -1456,6 +1633,7 @@ class ReductionPackage(object):
 
         self.out_scale_factor = None
         self.out_shift_factor = None
+        self.shift_and_scale_factors_name = None
 
         self.calculated_transmission = None
         self.calculated_transmission_can = None
@@ -0,0 +1,196 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+""" A disk cache for loaded and calibrated SANS data
+
+The ADS cache used by SANSLoad only lasts as long as the workspaces stay on the ADS. This cache keeps the loaded
+(and, for scatter data, calibrated) workspaces on disk as processed Nexus files, so that runs which are shared by
+many batch rows, e.g. can and direct runs, are only loaded once across sessions.
+
+An entry is identified by the data file, its modification time and size, the selected period and the calibration
+file. The least recently used entries are removed once the cache grows beyond its size limit.
+
+The cache is enabled by setting sans.load.cache.directory in the Mantid properties.
+"""
+import hashlib
+import json
+import os
+
+import mantid
+from mantid.kernel import config, Logger
+from sans.common.constants import EMPTY_NAME
+from sans.common.file_information import find_full_file_path
+from sans.common.general_functions import create_child_algorithm
+
+CACHE_DIRECTORY_KEY = "sans.load.cache.directory"
+CACHE_SIZE_KEY = "sans.load.cache.max_size_mb"
+DEFAULT_CACHE_SIZE_MB = 10000
+ENTRY_SUFFIX = ".json"
+
+sans_logger = Logger("SANS")
+
+
+def _file_identity(file_name):
+    """
+    :param file_name: the full path to a file
+    :return: a list of the path, modification time and size of the file
+    """
+    stat = os.stat(file_name)
+    return [os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size]
+
+
+class SANSLoadCache(object):
+    """
+    Stores the loaded workspaces of each data file in a directory, along with an entry file listing them. The entry
+    file is written last, so that an entry is only used once all of its workspaces have been saved. Its modification
+    time records when the entry was last used.
+    """
+
+    def __init__(self, directory, max_size_bytes):
+        super(SANSLoadCache, self).__init__()
+        self._directory = directory
+        self._max_size_bytes = max_size_bytes
+
+    def get_key(self, file_information, is_transmission, period, calibration_file_name):
+        """
+        Create the key of the entry for a data file
+
+        :param file_information: a SANSFileInformation object.
+        :param is_transmission: true if the workspaces are of transmission type
+        :param period: the selected period.
+        :param calibration_file_name: the name of the calibration file, if any
+        :return: a string key, or None if the data file cannot be found
+        """
+        full_calibration_file_path = find_full_file_path(calibration_file_name) if calibration_file_name else ""
+        try:
+            identity = [mantid.__version__, _file_identity(file_information.get_file_name()),
+                        bool(is_transmission), str(period)]
+            if full_calibration_file_path:
+                identity.append(_file_identity(full_calibration_file_path))
+        except OSError:
+            return None
+        return hashlib.sha1(json.dumps(identity).encode("utf-8")).hexdigest()
+
+    def retrieve(self, key, parent_alg):
+        """
+        Load the workspaces of an entry
+
+        :param key: the key created by get_key
+        :param parent_alg: a handle to the parent algorithm
+        :return: a list of workspaces and a list of monitor workspaces, which are both empty if there is no entry
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path) as entry_file:
+                entry = json.load(entry_file)
+            workspaces = [self._load(file_name, parent_alg) for file_name in entry["workspaces"]]
+            workspace_monitors = [self._load(file_name, parent_alg) for file_name in entry["monitors"]]
+        except (OSError, ValueError, KeyError, RuntimeError):
+            return [], []
+        # Mark the entry as recently used
+        os.utime(entry_path)
+        return workspaces, workspace_monitors
+
+    def store(self, key, workspaces, workspace_monitors, parent_alg):
+        """
+        Save the workspaces of a data file, unless they have already been saved
+
+        :param key: the key created by get_key
+        :param workspaces: a list of workspaces
+        :param workspace_monitors: a list of monitor workspaces
+        :param parent_alg: a handle to the parent algorithm
+        """
+        entry_path = self._get_entry_path(key)
+        if os.path.exists(entry_path):
+            return
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            entry = {"workspaces": [self._save(workspace, "{0}_{1}.nxs".format(key, index), parent_alg)
+                                    for index, workspace in enumerate(workspaces)],
+                     "monitors": [self._save(workspace, "{0}_monitor_{1}.nxs".format(key, index), parent_alg)
+                                  for index, workspace in enumerate(workspace_monitors)]}
+            with open(entry_path, "w") as entry_file:
+                json.dump(entry, entry_file)
+        except (OSError, RuntimeError) as error:
+            sans_logger.warning("Could not add the loaded data to the cache in {0}: {1}".format(self._directory,
+                                                                                                str(error)))
+            self._remove_data_files(key)
+            return
+        self.remove_least_recently_used()
+
+    def remove_least_recently_used(self):
+        """
+        Remove the least recently used entries until the cache is within its size limit
+        """
+        entries = []
+        total_size = 0
+        for file_name in os.listdir(self._directory):
+            if not file_name.endswith(ENTRY_SUFFIX):
+                continue
+            entry_path = os.path.join(self._directory, file_name)
+            try:
+                with open(entry_path) as entry_file:
+                    entry = json.load(entry_file)
+                data_files = [os.path.join(self._directory, name) for name in entry["workspaces"] + entry["monitors"]]
+                size = sum(os.path.getsize(data_file) for data_file in data_files)
+                entries.append((os.path.getmtime(entry_path), entry_path, data_files, size))
+            except (OSError, ValueError, KeyError):
+                continue
+            total_size += size
+
+        for _, entry_path, data_files, size in sorted(entries):
+            if total_size <= self._max_size_bytes:
+                break
+            # Remove the entry file first so that a partially removed entry is never used
+            for file_name in [entry_path] + data_files:
+                try:
+                    os.remove(file_name)
+                except OSError:
+                    pass
+            total_size -= size
+
+    def _remove_data_files(self, key):
+        try:
+            file_names = os.listdir(self._directory)
+        except OSError:
+            return
+        for file_name in file_names:
+            if file_name.startswith(key) and not file_name.endswith(ENTRY_SUFFIX):
+                try:
+                    os.remove(os.path.join(self._directory, file_name))
+                except OSError:
+                    pass
+
+    def _get_entry_path(self, key):
+        return os.path.join(self._directory, key + ENTRY_SUFFIX)
+
+    def _load(self, file_name, parent_alg):
+        load_options = {"Filename": os.path.join(self._directory, file_name),
+                        "OutputWorkspace": EMPTY_NAME}
+        load_alg = create_child_algorithm(parent_alg, "LoadNexusProcessed", **load_options)
+        load_alg.execute()
+        return load_alg.getProperty("OutputWorkspace").value
+
+    def _save(self, workspace, file_name, parent_alg):
+        save_options = {"InputWorkspace": workspace,
+                        "Filename": os.path.join(self._directory, file_name)}
+        save_alg = create_child_algorithm(parent_alg, "SaveNexusProcessed", **save_options)
+        save_alg.execute()
+        return file_name
+
+
+def get_load_cache():
+    """
+    :return: a SANSLoadCache for the directory set in the Mantid properties, or None if the cache is not enabled
+    """
+    directory = config.getString(CACHE_DIRECTORY_KEY).strip()
+    if not directory:
+        return None
+    try:
+        max_size_mb = float(config.getString(CACHE_SIZE_KEY) or DEFAULT_CACHE_SIZE_MB)
+    except ValueError:
+        max_size_mb = DEFAULT_CACHE_SIZE_MB
+    return SANSLoadCache(directory, int(max_size_mb * 1024 * 1024))
@@ -47,6 +47,7 @@ CACHING:
 Adding to the cache(ADS) is supported for the TubeCalibration file.
 Reading from the cache is supported for all files. This avoids data reloads if the correct file is already in the
 cache.
+If sans.load.cache.directory is set then the loaded and calibrated data is also cached on disk, see load_cache.py
 """
 from abc import (ABCMeta, abstractmethod)
 import os
@@ -62,6 +63,7 @@ from sans.common.general_functions import (create_child_algorithm)
 from sans.common.log_tagger import (set_tag, has_tag, get_tag)
 from sans.state.StateObjects.StateData import (StateData)
 from sans.algorithm_detail.calibration import apply_calibration
+from sans.algorithm_detail.load_cache import get_load_cache
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -649,7 +651,7 @@ def get_loader_strategy(file_information):
     return loader
 
 
-def load_isis(data_type, file_information, period, use_cached, calibration_file_name, parent_alg):
+def load_isis(data_type, file_information, period, use_cached, calibration_file_name, parent_alg, load_cache=None):
     """
     Loads workspaces according a SANSFileInformation object for ISIS.
 
@@ -662,6 +664,7 @@ def load_isis(data_type, file_information, period, use_cached, calibration_file_
                                   workspaces and not for loading of calibration files. We just want to make sure that
                                   the potentially cached data has had the correct calibration file applied to it.
     :param parent_alg: a handle to the parent algorithm.
+    :param load_cache: optional. A SANSLoadCache which is searched if the workspaces are not on the ADS.
     :return: a SANSDataType-Workspace map for data workspaces and a SANSDataType-Workspace map for monitor workspaces
     """
     workspace = []
@@ -674,9 +677,18 @@ def load_isis(data_type, file_information, period, use_cached, calibration_file_
         workspace, workspace_monitor = use_cached_workspaces_from_ads(file_information, is_transmission, period,
                                                                       calibration_file_name)
 
+    def _requires_load(_workspace, _workspace_monitor):
+        return len(_workspace) == 0 or (len(_workspace_monitor) == 0 and not is_transmission)
+
+    # Otherwise use the workspaces saved in the disk cache by an earlier load of the same file
+    if load_cache is not None and _requires_load(workspace, workspace_monitor):
+        cache_key = load_cache.get_key(file_information, is_transmission, period, calibration_file_name)
+        if cache_key is not None:
+            workspace, workspace_monitor = load_cache.retrieve(cache_key, parent_alg)
+
     # Load the workspace if required. We need to load it if there is no workspace loaded from the cache or, in the case
     # of scatter, ie. non-trans, there is no monitor workspace. There are several ways to load the data
-    if len(workspace) == 0 or (len(workspace_monitor) == 0 and not is_transmission):
+    if _requires_load(workspace, workspace_monitor):
         loader = get_loader_strategy(file_information)
         workspace, workspace_monitor = loader(file_information, is_transmission, period, parent_alg=parent_alg)
 
@@ -724,6 +736,7 @@ class SANSLoadDataISIS(SANSLoadData):
         workspace_monitors = {}
 
         calibration_file = adjustment_info.calibration if adjustment_info else None
+        load_cache = get_load_cache() if use_cached else None
 
         for key, value in list(file_infos.items()):
             # Loading
@@ -732,7 +745,7 @@ class SANSLoadDataISIS(SANSLoadData):
 
             workspace_pack, workspace_monitors_pack = load_isis(key, value, period_infos[key],
                                                                 use_cached, calibration_file,
-                                                                parent_alg)
+                                                                parent_alg, load_cache=load_cache)
 
             # Add them to the already loaded workspaces
             workspaces.update(workspace_pack)
@@ -745,6 +758,14 @@ class SANSLoadDataISIS(SANSLoadData):
             progress.report(report_message)
             apply_calibration(calibration_file, workspaces, workspace_monitors, use_cached, publish_to_ads, parent_alg)
 
+        # Save the loaded and calibrated data to the disk cache, before the transmission correction which is
+        # applied to the data whichever way it was loaded
+        if load_cache is not None:
+            for key, value in list(file_infos.items()):
+                cache_key = load_cache.get_key(value, is_transmission_type(key), period_infos[key], calibration_file)
+                if cache_key is not None:
+                    load_cache.store(cache_key, workspaces[key], workspace_monitors.get(key, []), parent_alg)
+
         # Apply corrections for transmission workspaces
         transmission_correction = get_transmission_correction(data_info)
         transmission_correction.correct(workspaces, parent_alg)
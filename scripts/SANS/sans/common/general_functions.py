@@ -258,10 +258,16 @@ def get_ads_workspace_references():
     """
     Gets a list of handles of available workspaces on the ADS
 
+    Reductions can run at the same time as workspaces are removed from the ADS, so workspaces which are removed after
+    the names have been read are skipped.
     :return: the workspaces on the ADS.
     """
     for workspace_name in AnalysisDataService.getObjectNames():
-        yield AnalysisDataService.retrieve(workspace_name)
+        try:
+            workspace = AnalysisDataService.retrieve(workspace_name)
+        except KeyError:
+            continue
+        yield workspace
 
 
 def convert_bank_name_to_detector_type_isis(detector_name):
@@ -7,7 +7,7 @@
 # pylint: disable=invalid-name
 """ SANBatchReduction algorithm is the starting point for any new type reduction, event single reduction"""
 from sans.state.AllStates import AllStates
-from sans.algorithm_detail.batch_execution import (single_reduction_for_batch)
+from sans.algorithm_detail.batch_execution import (reductions_for_batch)
 from sans.common.enums import (OutputMode, FindDirectionEnum, DetectorType)
 from sans.algorithm_detail.centre_finder_new import centre_finder_new, centre_finder_mass
 
@@ -17,7 +17,7 @@ class SANSBatchReduction(object):
         super(SANSBatchReduction, self).__init__()
 
     def __call__(self, states, use_optimizations=True, output_mode=OutputMode.PUBLISH_TO_ADS, plot_results = False,
-                 output_graph='', save_can=False):
+                 output_graph='', save_can=False, number_of_workers=1):
         """
         This is the start of any reduction.
 
@@ -27,25 +27,23 @@ class SANSBatchReduction(object):
                             1. PublishToADS
                             2. SaveToFile
                             3. Both
+        :param number_of_workers: The number of reductions which are run at the same time. Periods, event slices
+                                  and the states themselves are reduced concurrently if this is more than 1.
         """
-        self.validate_inputs(states, use_optimizations, output_mode, plot_results, output_graph)
+        self.validate_inputs(states, use_optimizations, output_mode, plot_results, output_graph, number_of_workers)
 
-        return self._execute(states, use_optimizations, output_mode, plot_results, output_graph, save_can=save_can)
+        return self._execute(states, use_optimizations, output_mode, plot_results, output_graph, save_can=save_can,
+                             number_of_workers=number_of_workers)
 
     @staticmethod
-    def _execute(states, use_optimizations, output_mode, plot_results, output_graph, save_can=False):
+    def _execute(states, use_optimizations, output_mode, plot_results, output_graph, save_can=False,
+                 number_of_workers=1):
         # Iterate over each state, load the data and perform the reduction
-        out_scale_factors_list = []
-        out_shift_factors_list = []
-        for state in states:
-            out_scale_factors, out_shift_factors = \
-                single_reduction_for_batch(state, use_optimizations, output_mode, plot_results, output_graph,
-                                           save_can=save_can)
-            out_shift_factors_list.append(out_shift_factors)
-            out_scale_factors_list.append(out_scale_factors)
-        return out_scale_factors_list, out_shift_factors_list
-
-    def validate_inputs(self, states, use_optimizations, output_mode, plot_results, output_graph):
+        return reductions_for_batch(states, use_optimizations, output_mode, plot_results, output_graph,
+                                    save_can=save_can, number_of_workers=number_of_workers)
+
+    def validate_inputs(self, states, use_optimizations, output_mode, plot_results, output_graph,
+                        number_of_workers=1):
         # We are strict about the types here.
         # 1. states has to be a list of sans state objects
         # 2. use_optimizations has to be bool
@@ -70,6 +68,10 @@ class SANSBatchReduction(object):
             raise RuntimeError("The output_graph must be set if plot_results is true. The provided value is"
                                " {0}".format(output_graph))
 
+        if not isinstance(number_of_workers, int) or number_of_workers < 1:
+            raise RuntimeError("The number of workers has to be a positive integer. The provided value is"
+                               " {0}".format(number_of_workers))
+
         if output_mode is not OutputMode.PUBLISH_TO_ADS and output_mode is not OutputMode.SAVE_TO_FILE and\
                         output_mode is not OutputMode.BOTH:  # noqa
             raise RuntimeError("The output mode has to be an enum of type OutputMode. The provided type is"
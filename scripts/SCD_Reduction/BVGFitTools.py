@@ -43,7 +43,7 @@ def get3DPeak(peak, peakNumber, peaks_ws, box, padeCoefficients, qMask, nTheta=1
                     plotResults=plotResults, pp_lambda=pp_lambda, neigh_length_m=neigh_length_m, pplmin_frac=pplmin_frac,
                     pplmax_frac=pplmax_frac, mindtBinWidth=mindtBinWidth, maxdtBinWidth=maxdtBinWidth,
                     peakMaskSize=peakMaskSize, iccFitDict=iccFitDict, fitPenalty=fitPenalty)
-        chiSqTOF = mtd['fit_Parameters'].column(1)[-1]
+        chiSqTOF = mtd[ICCFT.wsName('fit_Parameters')].column(1)[-1]
     else:  # we already did I-C profile, so we'll just read the parameters
         pp_lambda = fICCParams[-1]
         fICC = ICC.IkedaCarpenterConvoluted()
@@ -253,9 +253,9 @@ def fitScaling(n_events, box, YTOF, YBVG, goodIDX=None, neigh_length_m=3):
     scaleLinear.constrain("A1>0")
     scaleX = YJOINT[goodIDX]
     scaleY = n_events[goodIDX]
-    CreateWorkspace(OutputWorkspace='__scaleWS', dataX=scaleX, dataY=scaleY)
-    fitResultsScaling = Fit(Function=scaleLinear, InputWorkspace='__scaleWS',
-                            Output='__scalefit', CostFunction='Unweighted least squares')
+    CreateWorkspace(OutputWorkspace=ICCFT.wsName('__scaleWS'), dataX=scaleX, dataY=scaleY)
+    fitResultsScaling = Fit(Function=scaleLinear, InputWorkspace=ICCFT.wsName('__scaleWS'),
+                            Output=ICCFT.wsName('__scalefit'), CostFunction='Unweighted least squares')
     A0 = fitResultsScaling[3].row(0)['Value']
     A1 = fitResultsScaling[3].row(1)['Value']
     YRET = A1 * YJOINT + A0
@@ -265,22 +265,8 @@ def fitScaling(n_events, box, YTOF, YBVG, goodIDX=None, neigh_length_m=3):
 
 
 def getXTOF(box, peak):
-    from mantid.kernel import V3D
     QX, QY, QZ = ICCFT.getQXQYQZ(box)
-    origQS = peak.getQSampleFrame()
-    tList = np.zeros_like(QX)
-    for i in xrange(QX.shape[0]):
-        for j in xrange(QX.shape[1]):
-            for k in xrange(QX.shape[2]):
-                newQ = V3D(QX[i, j, k], QY[i, j, k], QZ[i, j, k])
-                peak.setQSampleFrame(newQ)
-                flightPath = peak.getL1() + peak.getL2()
-                scatteringHalfAngle = 0.5 * peak.getScattering()
-                # convert to microseconds)
-                tList[i, j, k] = 3176.507 * flightPath * \
-                    np.sin(scatteringHalfAngle) / np.linalg.norm(newQ)
-    peak.setQSampleFrame(origQS)
-    return tList
+    return ICCFT.getTOFFromQ(QX, QY, QZ, peak)
 
 
 def fitTOFCoordinate(box, peak, padeCoefficients, dtSpread=0.03, minFracPixels=0.01,
@@ -312,13 +298,13 @@ def fitTOFCoordinate(box, peak, padeCoefficients, dtSpread=0.03, minFracPixels=0
                                       iccFitDict=iccFitDict, fitPenalty=fitPenalty)
 
     for i, param in enumerate(['A', 'B', 'R', 'T0', 'Scale', 'HatWidth', 'KConv']):
-        fICC[param] = mtd['fit_Parameters'].row(i)['Value']
+        fICC[param] = mtd[ICCFT.wsName('fit_Parameters')].row(i)['Value']
     bgParamsRows = [7 + i for i in range(bgPolyOrder + 1)]
     bgCoeffs = []
     for bgRow in bgParamsRows[::-1]:  # reverse for numpy order
-        bgCoeffs.append(mtd['fit_Parameters'].row(bgRow)['Value'])
+        bgCoeffs.append(mtd[ICCFT.wsName('fit_Parameters')].row(bgRow)['Value'])
     x = tofWS.readX(0)
-    yFit = mtd['fit_Workspace'].readY(1)
+    yFit = mtd[ICCFT.wsName('fit_Workspace')].readY(1)
 
     interpF = interp1d(x, yFit, kind='cubic')
     tofxx = np.linspace(tofWS.readX(0).min(), tofWS.readX(0).max(), 1000)
@@ -328,8 +314,8 @@ def fitTOFCoordinate(box, peak, padeCoefficients, dtSpread=0.03, minFracPixels=0
         plt.clf()
         plt.plot(tofxx, tofyy, label='Interpolated')
         plt.plot(tofWS.readX(0), tofWS.readY(0), 'o', label='Data')
-        plt.plot(mtd['fit_Workspace'].readX(1),
-                 mtd['fit_Workspace'].readY(1), label='Fit')
+        plt.plot(mtd[ICCFT.wsName('fit_Workspace')].readX(1),
+                 mtd[ICCFT.wsName('fit_Workspace')].readY(1), label='Fit')
         plt.title(fitResults.OutputChi2overDoF)
         plt.legend(loc='best')
     ftof = interp1d(tofxx, tofyy, bounds_error=False, fill_value=0.0)
@@ -548,9 +534,9 @@ def doBVGFit(box, nTheta=200, nPhi=200, zBG=1.96, fracBoxToHistogram=1.0, goodID
         m.setAttributeValue('nY', h.shape[1])
         m.setConstraints(boundsDict, penalty=fitPenalty)
         # Do the fit
-        CreateWorkspace(OutputWorkspace='__bvgWS', DataX=pos.ravel(
+        CreateWorkspace(OutputWorkspace=ICCFT.wsName('__bvgWS'), DataX=pos.ravel(
         ), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
-        fitResults = Fit(Function=m, InputWorkspace='__bvgWS', Output='__bvgfit',
+        fitResults = Fit(Function=m, InputWorkspace=ICCFT.wsName('__bvgWS'), Output=ICCFT.wsName('__bvgfit'),
                          Minimizer='Levenberg-MarquardtMD')
 
     elif forceParams is not None:
@@ -609,20 +595,20 @@ def doBVGFit(box, nTheta=200, nPhi=200, zBG=1.96, fracBoxToHistogram=1.0, goodID
         m.setAttributeValue('nY', h.shape[1])
         m.setConstraints(boundsDict, penalty=fitPenalty)
         # Do the fit
-        CreateWorkspace(OutputWorkspace='__bvgWS', DataX=pos.ravel(), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
+        CreateWorkspace(OutputWorkspace=ICCFT.wsName('__bvgWS'), DataX=pos.ravel(), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
         fitFun = m
-        fitResults = Fit(Function=fitFun, InputWorkspace='__bvgWS',
-                         Output='__bvgfit', Minimizer='Levenberg-MarquardtMD')
+        fitResults = Fit(Function=fitFun, InputWorkspace=ICCFT.wsName('__bvgWS'),
+                         Output=ICCFT.wsName('__bvgfit'), Minimizer='Levenberg-MarquardtMD')
     # Recover the result
     m = BivariateGaussian.BivariateGaussian()
     m.init()
-    m['A'] = mtd['__bvgfit_Parameters'].row(0)['Value']
-    m['MuX'] = mtd['__bvgfit_Parameters'].row(1)['Value']
-    m['MuY'] = mtd['__bvgfit_Parameters'].row(2)['Value']
-    m['SigX'] = mtd['__bvgfit_Parameters'].row(3)['Value']
-    m['SigY'] = mtd['__bvgfit_Parameters'].row(4)['Value']
-    m['SigP'] = mtd['__bvgfit_Parameters'].row(5)['Value']
-    m['Bg'] = mtd['__bvgfit_Parameters'].row(6)['Value']
+    m['A'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(0)['Value']
+    m['MuX'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(1)['Value']
+    m['MuY'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(2)['Value']
+    m['SigX'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(3)['Value']
+    m['SigY'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(4)['Value']
+    m['SigP'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(5)['Value']
+    m['Bg'] = mtd[ICCFT.wsName('__bvgfit_Parameters')].row(6)['Value']
 
     m.setAttributeValue('nX', h.shape[0])
     m.setAttributeValue('nY', h.shape[1])
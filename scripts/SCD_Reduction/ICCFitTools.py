@@ -13,10 +13,30 @@ from mantid.simpleapi import *
 from mantid.kernel import V3D
 import ICConvoluted as ICC
 import itertools
+import threading
 from functools import reduce
 from scipy.ndimage.filters import convolve
 plt.ion()
 
+# Holds the prefix of the temporary workspace names used on each thread
+_threadLocal = threading.local()
+
+
+def setWorkspaceNamePrefix(prefix):
+    """
+    setWorkspaceNamePrefix sets a prefix for the names of the temporary workspaces (fits, TOF
+    profiles and MD boxes) created by ICCFitTools and BVGFitTools on the calling thread.  Peaks
+    can then be fit on several threads at once without overwriting each other's workspaces.
+    """
+    _threadLocal.prefix = prefix
+
+
+def wsName(name):
+    """
+    wsName returns the name of a temporary workspace for the calling thread (see setWorkspaceNamePrefix).
+    """
+    return getattr(_threadLocal, 'prefix', '') + name
+
 
 def parseConstraints(peaks_ws):
     """
@@ -48,12 +68,6 @@ def oldScatFun(x, A, k, bg):
 
 
 def calcSomeTOF(box, peak, refitIDX=None, q_frame='sample'):
-    xaxis = box.getXDimension()
-    qx = np.linspace(xaxis.getMinimum(), xaxis.getMaximum(), xaxis.getNBins())
-    yaxis = box.getYDimension()
-    qy = np.linspace(yaxis.getMinimum(), yaxis.getMaximum(), yaxis.getNBins())
-    zaxis = box.getZDimension()
-    qz = np.linspace(zaxis.getMinimum(), zaxis.getMaximum(), zaxis.getNBins())
     QX, QY, QZ = getQXQYQZ(box)
 
     if refitIDX is None:
@@ -66,22 +80,54 @@ def calcSomeTOF(box, peak, refitIDX=None, q_frame='sample'):
     else:
         raise ValueError(
             'ICCFT:calcSomeTOF - q_frame must be either \'lab\' or \'sample\'; %s was provided' % q_frame)
-    PIXELFACTOR = np.ones_like(QX) * (peak.getL1() + peak.getL2()) * np.sin(0.5 * peak.getScattering())
-    for i, x in enumerate(qx):
-        for j, y in enumerate(qy):
-            for k, z in enumerate(qz):
-                if refitIDX[i, j, k]:
-                    qNew = V3D(x, y, z)
-                    peak.setQSampleFrame(qNew)
-                    L = peak.getL1() + peak.getL2()
-                    HALFSCAT = 0.5 * peak.getScattering()
-                    PIXELFACTOR[i, j, k] = L*np.sin(HALFSCAT)
+    tofPeakGeometry = 3176.507 * (peak.getL1() + peak.getL2()) * np.sin(0.5 * peak.getScattering()) \
+        / np.sqrt(QX**2 + QY**2 + QZ**2)
+    tofBox = np.where(refitIDX, getTOFFromQ(QX, QY, QZ, peak), tofPeakGeometry)
     peak.setQSampleFrame(qS0)
-
-    tofBox = 3176.507 * PIXELFACTOR * 1.0/np.sqrt(QX**2 + QY**2 + QZ**2)
     return tofBox
 
 
+def getTOFFromQ(QX, QY, QZ, peak, nLookup=5):
+    """
+    getTOFFromQ - returns the time-of-flight of neutrons elastically scattered to each Q.
+    The wavelength is calculated directly from Q, so all voxels are handled at once.  The
+    flight path changes slowly over the small region around a peak, so the detector is only
+    found by ray tracing on a coarse nLookup*nLookup*nLookup grid spanning the coordinates and the
+    flight path is interpolated between these points.
+    Input:
+        QX, QY, QZ - a*b*c numpy arrays of evenly spaced Q sample frame coordinates (see getQXQYQZ)
+        peak - the peak object providing the instrument and goniometer.  Its Q is left unchanged.
+        nLookup - the number of points along each axis at which the detectors are found.
+    Output:
+        tofBox - a*b*c numpy array with the time-of-flight (units: us) of each voxel
+    """
+    from scipy.interpolate import RegularGridInterpolator
+    # The beam direction in the sample frame; Q along the beam gives the wavelength as
+    # lambda = 4*pi*|Q.beam|/|Q|^2 and tof = 3176.507*L*sin(theta)/|Q| = 3176.507*L*|Q.beam|/|Q|^2
+    beam = np.array(peak.getReferenceFrame().vecPointingAlongBeam())
+    beamSample = np.dot(np.asarray(peak.getGoniometerMatrix()).T, beam)
+    qBeam = np.abs(beamSample[0] * QX + beamSample[1] * QY + beamSample[2] * QZ)
+    qSq = QX**2 + QY**2 + QZ**2
+
+    qS0 = peak.getQSampleFrame()
+    axes = [np.linspace(Q.min(), Q.max(), min(nLookup, n)) for Q, n in zip((QX, QY, QZ), QX.shape)]
+    flightPath = np.empty([len(axis) for axis in axes])
+    try:
+        for idx in itertools.product(*[range(len(axis)) for axis in axes]):
+            peak.setQSampleFrame(V3D(*[axis[i] for axis, i in zip(axes, idx)]))
+            flightPath[idx] = peak.getL1() + peak.getL2()
+    finally:
+        peak.setQSampleFrame(qS0)
+
+    # Axes with a single point can not be interpolated along
+    interpAxes = [i for i, axis in enumerate(axes) if len(axis) > 1]
+    flightPath = flightPath.reshape([len(axes[i]) for i in interpAxes])
+    if interpAxes:
+        points = np.stack([(QX, QY, QZ)[i].ravel() for i in interpAxes], axis=-1)
+        flightPath = RegularGridInterpolator([axes[i] for i in interpAxes], flightPath)(points).reshape(QX.shape)
+    return 3176.507 * flightPath * qBeam / qSq
+
+
 def cart2sph(x, y, z):
     """
     cart2sph takes in spherical coordinates (x,y,z) and returns
@@ -159,8 +205,8 @@ def getQuickTOFWS(box, peak, padeCoefficients, goodIDX=None, dtSpread=0.03, qMas
     h = [tofWS.readY(0), tofWS.readX(0)]
     chiSq = fitResults.OutputChi2overDoF
 
-    r = mtd['fit_Workspace']
-    param = mtd['fit_Parameters']
+    r = mtd[wsName('fit_Workspace')]
+    param = mtd[wsName('fit_Parameters')]
     n_events = box.getNumEventsArray()
 
     iii = fICC.numParams() - 1
@@ -657,9 +703,9 @@ def getTOFWS(box, flightPath, scatteringHalfAngle, tofPeak, peak, qMask, zBG=-1.
 
     if workspaceNumber is None:
         tofWS = CreateWorkspace(
-            OutputWorkspace='__tofWS', DataX=tPoints, DataY=yPoints, DataE=np.sqrt(yPoints))
+            OutputWorkspace=wsName('__tofWS'), DataX=tPoints, DataY=yPoints, DataE=np.sqrt(yPoints))
     else:
-        tofWS = CreateWorkspace(OutputWorkspace='tofWS%i' % workspaceNumber,
+        tofWS = CreateWorkspace(OutputWorkspace=wsName('tofWS%i' % workspaceNumber),
                                 DataX=tPoints, DataY=yPoints, DataE=np.sqrt(yPoints))
     return tofWS, float(pp_lambda)
 
@@ -827,7 +873,7 @@ def getBoxFracHKL(peak, peaks_ws, MDdata, UBMatrix, peakNumber, dQ, dQPixel=0.00
                             + str(Qy-dQ[1, 0])+','+str(Qy+dQ[1, 1])+','+str(nPtsQ[1]),
                 AlignedDim2='Q_%s_z,' % q_frame
                             + str(Qz-dQ[2, 0])+','+str(Qz+dQ[2, 1])+','+str(nPtsQ[2]),
-                OutputWorkspace='MDbox')
+                OutputWorkspace=wsName('MDbox'))
     return Box
 
 
@@ -903,8 +949,8 @@ def doICCFit(tofWS, energy, flightPath, padeCoefficients, constraintScheme=None,
         bg['A'+str(fitOrder-i)] = bgx0[i]
     bg.constrain('-1.0 < A%i < 1.0' % fitOrder)
     fitFun = f + bg
-    fitResults = Fit(Function=fitFun, InputWorkspace='__tofWS',
-                     Output=outputWSName)
+    fitResults = Fit(Function=fitFun, InputWorkspace=wsName('__tofWS'),
+                     Output=wsName(outputWSName))
     return fitResults, fICC
 
 
@@ -979,7 +1025,7 @@ def integrateSample(run, MDdata, peaks_ws, paramList, UBMatrix, dQ, qMask, padeC
                     peak.setIntensity(0)
                     peak.setSigmaIntensity(1)
                     paramLisg.append([i, energy, 0.0, 1.0e10, 1.0e10]
-                                     + [0 for i in range(mtd['fit_parameters'].rowCount())]+[0])
+                                     + [0 for i in range(mtd[wsName('fit_parameters')].rowCount())]+[0])
 
                     mtd.remove('MDbox_'+str(run)+'_'+str(i))
                     continue
@@ -991,16 +1037,16 @@ def integrateSample(run, MDdata, peaks_ws, paramList, UBMatrix, dQ, qMask, padeC
                                                          pplmin_frac=minpplfrac, pplmax_frac=maxpplfrac,
                                                          constraintScheme=constraintScheme, peakMaskSize=peakMaskSize,
                                                          iccFitDict=iccFitDict, fitPenalty=fitPenalty)
-                tofWS = mtd['__tofWS']
+                tofWS = mtd[wsName('__tofWS')]
 
                 fitResults, fICC = doICCFit(
                     tofWS, energy, flightPath, padeCoefficients, fitOrder=bgPolyOrder, constraintScheme=constraintScheme,
                     iccFitDict=iccFitDict, fitPenalty=fitPenalty)
                 chiSq = fitResults.OutputChi2overDoF
 
-                r = mtd['fit_Workspace']
-                param = mtd['fit_Parameters']
-                tofWS = mtd['__tofWS']
+                r = mtd[wsName('fit_Workspace')]
+                param = mtd[wsName('fit_Parameters')]
+                tofWS = mtd[wsName('__tofWS')]
 
                 iii = fICC.numParams() - 1
                 fitBG = [param.row(int(iii+bgIDX+1))['Value']
@@ -103,7 +103,7 @@ class FrequencyPowderGenerator:
             else:
                 previous_coefficients_dim = previous_coefficients.shape[-1]
 
-            coeff[:previous_coefficients_dim] = np.take(a=previous_coefficients, indices=ind[:, 0])
+            coeff[:previous_coefficients_dim] = np.take(a=previous_coefficients, indices=ind[:, 0], axis=0).T
             coeff[previous_coefficients_dim] = np.take(a=fundamentals_coefficients, indices=ind[:, 1])
             coeff = coeff.T
 
@@ -83,7 +83,7 @@ autoconvolution = {
 
 performance = {
     'optimal_size': 5000000,  # this is used to create optimal size of chunk energies for which S is calculated
-    'threads': 4  # number of threads used in parallel calculations
+    'threads': 1  # number of worker processes used to calculate S; values above 1 need the pathos package
     }
 
 # Experimental / debug features
@@ -5,13 +5,14 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 
+from functools import partial
 import numbers
-from typing import Optional, Union, Tuple
+from typing import Dict, Optional, Union, Tuple
 
 import numpy as np
 
 from abins import AbinsData, FrequencyPowderGenerator, SData, SDataByAngle
-from abins.constants import CM1_2_HARTREE, K_2_HARTREE, FLOAT_TYPE, INT_TYPE, MIN_SIZE
+from abins.constants import CM1_2_HARTREE, K_2_HARTREE, FLOAT_TYPE, FUNDAMENTALS, INT_TYPE, MIN_SIZE
 from abins.instruments import Instrument
 import abins.parameters
 from mantid.api import Progress
@@ -92,6 +93,7 @@ class SPowderSemiEmpiricalCalculator:
         # Initialise properties that are set elsewhere
         self._progress_reporter = None
         self._powder_data = None
+        self._pool = None
 
         # Set up caching
         self._clerk = abins.IO(
@@ -214,6 +216,24 @@ class SPowderSemiEmpiricalCalculator:
             raise TypeError("Progress reporter type should be mantid.api.Progress. "
                             "If unavailable, use None.")
 
+    @staticmethod
+    def _get_pool(threads: int):
+        """
+        Get a pool of worker processes for parallel calculation of S
+
+        :param threads: number of worker processes requested
+        :returns: pathos ProcessingPool, or None if threads < 2 or pathos is not available
+        """
+        if threads < 2:
+            return None
+
+        try:
+            from pathos.multiprocessing import ProcessingPool
+        except ImportError:
+            return None
+
+        return ProcessingPool(nodes=threads)
+
     @staticmethod
     def _report_progress(msg: str, reporter: Union[None, Progress] = None, notice: bool = False) -> None:
         """
@@ -283,13 +303,22 @@ class SPowderSemiEmpiricalCalculator:
                                                         or self._autoconvolution)
                                                   else 0))
 
+        self._pool = self._get_pool(abins.parameters.performance['threads'])
+
         sdata_by_angle = []
-        for angle in self._instrument.get_angles():
-            self._report_progress(msg=f'Calculating S for angle: {angle:} degrees',
-                                  reporter=self.progress_reporter)
-            sdata_by_angle.append(self._calculate_s_powder_over_k(angle=angle,
-                                                                  isotropic_fundamentals=isotropic_fundamentals,
-                                                                  autoconvolution=self._autoconvolution))
+        try:
+            for angle in self._instrument.get_angles():
+                self._report_progress(msg=f'Calculating S for angle: {angle:} degrees',
+                                      reporter=self.progress_reporter)
+                sdata_by_angle.append(self._calculate_s_powder_over_k(angle=angle,
+                                                                      isotropic_fundamentals=isotropic_fundamentals,
+                                                                      autoconvolution=self._autoconvolution))
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool.clear()
+                self._pool = None
 
         # Complete set of scattering intensity data including Debye-Waller factors and autocorrelation orders
         sdata_by_angle = SDataByAngle.from_sdata_series(sdata_by_angle, angles=self._instrument.get_angles())
@@ -337,10 +366,14 @@ class SPowderSemiEmpiricalCalculator:
 
         # Collect SData without DW factors
         if isotropic_fundamentals or self._quantum_order_num > 1:
-            for k_index in range(self._num_k):
-                _ = self._calculate_s_powder_over_atoms(k_index=k_index, angle=angle,
-                                                        bins=(self._fine_bins if self._autoconvolution else self._bins),
-                                                        sdata=sdata, min_order=min_order)
+            bins = self._fine_bins if self._autoconvolution else self._bins
+            if self._pool is None:
+                for k_index in range(self._num_k):
+                    _ = self._calculate_s_powder_over_atoms(k_index=k_index, angle=angle,
+                                                            bins=bins, sdata=sdata, min_order=min_order)
+            else:
+                self._calculate_s_powder_over_atoms_and_k_parallel(angle=angle, bins=bins,
+                                                                   sdata=sdata, min_order=min_order)
 
         if autoconvolution:
             max_dw_order = abins.parameters.autoconvolution['max_order']
@@ -460,7 +493,8 @@ class SPowderSemiEmpiricalCalculator:
                                                          a_trace=a_traces[atom_index],
                                                          b_tensor=b_tensors[atom_index],
                                                          b_trace=b_traces[atom_index],
-                                                         include_dw=True)
+                                                         include_dw=True,
+                                                         temperature=self._temperature)
 
                 rebinned_s, _ = np.histogram(frequencies, bins=s_bins,
                                              weights=(s * kpoint.weight), density=False)
@@ -497,6 +531,38 @@ class SPowderSemiEmpiricalCalculator:
             self._calculate_s_powder_one_atom(atom_index=atom_index, k_index=k_index, angle=angle,
                                               sdata=sdata, bins=bins, min_order=min_order)
 
+    def _calculate_s_powder_over_atoms_and_k_parallel(self, *, angle: float,
+                                                      sdata: SData,
+                                                      bins: np.ndarray,
+                                                      min_order: int = 1) -> None:
+        """
+        Evaluates S for all atoms and k-points, distributing the work over the worker pool in self._pool.
+
+        Each (atom, k-point) pair is an independent unit of work; the partial spectra are summed into sdata
+        in the same order as the serial calculation, so results do not depend on the number of workers.
+
+        :param angle: Scattering angle determining energy-q relationship
+        :param sdata: Data container to which results will be summed in-place
+        :param bins: Frequency bins consistent with sdata
+        :param min_order: Lowest quantum order to evaluate. (The max is determined by self._quantum_order_num.)
+        """
+        assert min_order in (1, 2)  # Cannot start higher than 2; need information about combinations
+
+        k_indices, atom_indices = zip(*[(k_index, atom_index)
+                                        for k_index in range(self._num_k)
+                                        for atom_index in range(self._num_atoms)])
+
+        # Only the arrays for each atom and k-point are sent to the worker processes
+        atom_data = [self._get_atom_data(atom_index=atom_index, k_index=k_index)
+                     for atom_index, k_index in zip(atom_indices, k_indices)]
+        calculate_one_atom = partial(_calculate_s_powder_atom_at_k, instrument=self._instrument, angle=angle, bins=bins,
+                                     min_order=min_order, quantum_order_num=self._quantum_order_num)
+        for atom_index, k_index, atom_s in zip(atom_indices, k_indices,
+                                               self._pool.imap(calculate_one_atom, *zip(*atom_data))):
+            self._report_progress(msg=f'Calculated S for atom {atom_index}, k-point {k_index}, {angle} degrees',
+                                  reporter=self.progress_reporter)
+            sdata.add_dict({f'atom_{atom_index}': {'s': atom_s}})
+
     def _calculate_s_powder_one_atom(self, *, atom_index: int, k_index: int, angle: float,
                                      sdata: SData, bins: np.ndarray,
                                      min_order: int = 1) -> None:
@@ -509,48 +575,104 @@ class SPowderSemiEmpiricalCalculator:
         :min_order: Lowest quantum order to evaluate. (The max is determined by self._quantum_order_num.)
 
         """
-        kpoint_weight = self._abins_data.get_kpoints_data()[k_index].weight
+        atom_s = _calculate_s_powder_atom_at_k(*self._get_atom_data(atom_index=atom_index, k_index=k_index),
+                                               instrument=self._instrument, angle=angle, bins=bins,
+                                               min_order=min_order, quantum_order_num=self._quantum_order_num)
+        sdata.add_dict({f'atom_{atom_index}': {'s': atom_s}})
+
+    def _get_atom_data(self, *, atom_index: int, k_index: int) -> Tuple[np.ndarray, Dict[str, np.ndarray], float]:
+        """
+        Get the data needed to calculate S for one atom and one k-point
 
-        fundamentals = self._powder_data.get_frequencies()[k_index]
-        fund_coeff = np.arange(fundamentals.size, dtype=INT_TYPE)
+        :param atom_index: number of atom
+        :param k_index: Index of k-point in phonon data
+        :returns: frequencies of fundamentals, dict of a_tensor, a_trace, b_tensor, b_trace for the atom,
+                  and weight of the k-point
+        """
+        atom_tensors = {'a_tensor': self._powder_data.get_a_tensors()[k_index][atom_index],
+                        'a_trace': self._powder_data.get_a_traces(k_index)[atom_index],
+                        'b_tensor': self._powder_data.get_b_tensors()[k_index][atom_index],
+                        'b_trace': self._powder_data.get_b_traces(k_index)[atom_index]}
 
-        # Initialise with fundamentals regardless of whether starting with order 1 or 2
-        frequencies = np.copy(fundamentals)
-        coefficients = np.copy(fund_coeff)
+        return (self._powder_data.get_frequencies()[k_index], atom_tensors,
+                self._abins_data.get_kpoints_data()[k_index].weight)
 
-        a_tensor = self._powder_data.get_a_tensors()[k_index][atom_index]
-        a_trace = self._powder_data.get_a_traces(k_index)[atom_index]
-        b_tensor = self._powder_data.get_b_tensors()[k_index][atom_index]
-        b_trace = self._powder_data.get_b_traces(k_index)[atom_index]
+    @staticmethod
+    def _calculate_s_powder_order(*, order: int,
+                                  previous_frequencies: np.ndarray, previous_coefficients: np.ndarray,
+                                  fundamentals: np.ndarray, fund_coeff: np.ndarray, atom_tensors: Dict[str, np.ndarray],
+                                  instrument: Instrument, angle: float, bins: np.ndarray,
+                                  kpoint_weight: float,
+                                  quantum_order_num: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate binned S for one atom at one quantum order
+
+        Frequency combinations are generated from blocks of the previous order,
+        sized so that each block yields at most abins.parameters.performance['optimal_size']
+        combinations, so peak memory is bounded by the chunk size rather than by the
+        total number of combinations. Transitions with low intensity are pruned once
+        all blocks have been evaluated, so the result does not depend on the chunk size.
+
+        :param order: quantum order to evaluate
+        :param previous_frequencies: transition frequencies of the previous order (fundamentals for order 1 or 2)
+        :param previous_coefficients: coefficients which correspond to previous_frequencies
+        :param fundamentals: frequencies of fundamentals
+        :param fund_coeff: coefficients of fundamentals
+        :param atom_tensors: dict of a_tensor, a_trace, b_tensor, b_trace for the atom
+        :param instrument: Instrument determining energy-q relationship
+        :param angle: Scattering angle determining energy-q relationship
+        :param bins: Frequency bins for the output spectra
+        :param kpoint_weight: weight of the k-point
+        :param quantum_order_num: highest quantum order to be evaluated
+        :returns: binned spectrum, and the frequencies and coefficients of the transitions passed on to the next order
+        """
+        calculate_order = {1: SPowderSemiEmpiricalCalculator._calculate_order_one,
+                           2: SPowderSemiEmpiricalCalculator._calculate_order_two,
+                           3: SPowderSemiEmpiricalCalculator._calculate_order_three,
+                           4: SPowderSemiEmpiricalCalculator._calculate_order_four}
+
+        if order == FUNDAMENTALS:
+            block_size = max(previous_frequencies.size, 1)
+        else:
+            block_size = max(abins.parameters.performance['optimal_size'] // max(fundamentals.size, 1), 1)
 
-        calculate_order = {1: self._calculate_order_one,
-                           2: self._calculate_order_two,
-                           3: self._calculate_order_three,
-                           4: self._calculate_order_four}
+        spectrum = np.zeros(bins.size - 1, dtype=FLOAT_TYPE)
+        kept_s, kept_frequencies, kept_coefficients = [], [], []
+        num_transitions = 0
 
-        # Chunking to save memory has been removed pending closer examination
-        for order in range(min_order, self._quantum_order_num + 1):
+        for start in range(0, previous_frequencies.size, block_size):
             frequencies, coefficients = FrequencyPowderGenerator.construct_freq_combinations(
-                previous_array=frequencies,
-                previous_coefficients=coefficients,
+                previous_array=previous_frequencies[start:start + block_size],
+                previous_coefficients=previous_coefficients[start:start + block_size],
                 fundamentals_array=fundamentals,
                 fundamentals_coefficients=fund_coeff,
                 quantum_order=order)
-            q2 = self._instrument.calculate_q_powder(input_data=frequencies, angle=angle)
+            q2 = instrument.calculate_q_powder(input_data=frequencies, angle=angle)
 
             scattering_intensities = calculate_order[order](
-                q2=q2, frequencies=frequencies, indices=coefficients,
-                a_tensor=a_tensor, a_trace=a_trace, b_tensor=b_tensor, b_trace=b_trace)
+                q2=q2, frequencies=frequencies, indices=coefficients, **atom_tensors)
             rebinned_spectrum, _ = np.histogram(frequencies, bins=bins,
                                                 weights=(scattering_intensities * kpoint_weight),
                                                 density=False)
-            sdata.add_dict({f'atom_{atom_index}':
-                            {'s': {f'order_{order}': rebinned_spectrum}}})
-
-            # Prune modes with low intensity; these are assumed not to contribute to higher orders
-            frequencies, coefficients = self._calculate_s_over_threshold(scattering_intensities,
-                                                                         freq=frequencies,
-                                                                         coeff=coefficients)
+            spectrum += rebinned_spectrum
+
+            if order < quantum_order_num:
+                # Keep candidates for pruning: the transitions above the threshold and the
+                # leading MIN_SIZE transitions, which are used if too few are above it
+                keep = scattering_intensities > abins.parameters.sampling['s_absolute_threshold']
+                keep[:max(MIN_SIZE - num_transitions, 0)] = True
+                num_transitions += frequencies.size
+                kept_s.append(scattering_intensities[keep])
+                kept_frequencies.append(frequencies[keep])
+                kept_coefficients.append(coefficients[keep])
+
+        if not kept_frequencies:
+            return spectrum, previous_frequencies[:0], previous_coefficients[:0]
+
+        # Prune modes with low intensity; these are assumed not to contribute to higher orders
+        frequencies, coefficients = SPowderSemiEmpiricalCalculator._calculate_s_over_threshold(
+            np.concatenate(kept_s), freq=np.concatenate(kept_frequencies), coeff=np.concatenate(kept_coefficients))
+        return spectrum, frequencies, coefficients
 
     @staticmethod
     def _calculate_s_over_threshold(s=None, freq=None, coeff=None):
@@ -576,10 +698,11 @@ class SPowderSemiEmpiricalCalculator:
 
         return freq, coeff
 
-    def _calculate_order_one(self, *, q2: np.ndarray, frequencies: np.ndarray,
+    @staticmethod
+    def _calculate_order_one(*, q2: np.ndarray, frequencies: np.ndarray,
                              a_tensor=None, a_trace=None,
                              b_tensor=None, b_trace=None,
-                             indices=None, include_dw=False):
+                             indices=None, include_dw=False, temperature=None):
         """
         Calculates S for the first order quantum event for one atom.
         :param q2: squared values of momentum transfer vectors
@@ -590,17 +713,18 @@ class SPowderSemiEmpiricalCalculator:
         :param b_tensor: frequency dependent MSD tensor for the given atom
         :param b_trace: frequency dependent MSD trace for the given atom
         :param include_dw: Include (mode-dependent) Debye-Waller temperature effect
+        :param temperature: temperature in K, needed for the Debye-Waller effect
         :returns: s for the first quantum order event for the given atom
         """
         s = q2 * b_trace / 3.0
 
         if include_dw:
             trace_ba = np.einsum('kli, il->k', b_tensor, a_tensor)
-            if self._temperature < np.finfo(type(self._temperature)).eps:
+            if temperature < np.finfo(type(temperature)).eps:
                 coth = 1.
             else:
                 coth = 1.0 / np.tanh(frequencies * CM1_2_HARTREE
-                                     / (2.0 * self._temperature * K_2_HARTREE))
+                                     / (2.0 * temperature * K_2_HARTREE))
             dw = np.exp(-q2 * (a_trace + 2.0 * trace_ba / b_trace) / 5.0 * coth * coth)
 
             s_with_dw = s * dw
@@ -609,7 +733,8 @@ class SPowderSemiEmpiricalCalculator:
         else:
             return s
 
-    def _calculate_order_two(self, q2=None, frequencies=None, indices=None, a_tensor=None, a_trace=None,
+    @staticmethod
+    def _calculate_order_two(q2=None, frequencies=None, indices=None, a_tensor=None, a_trace=None,
                              b_tensor=None, b_trace=None):
         """
         Calculates S for the second order quantum event for one atom.
@@ -657,7 +782,8 @@ class SPowderSemiEmpiricalCalculator:
         return s
 
     # noinspection PyUnusedLocal,PyUnusedLocal
-    def _calculate_order_three(self, q2=None, frequencies=None, indices=None, a_tensor=None, a_trace=None,
+    @staticmethod
+    def _calculate_order_three(q2=None, frequencies=None, indices=None, a_tensor=None, a_trace=None,
                                b_tensor=None, b_trace=None):
         """
         Calculates S for the third order quantum event for one atom.
@@ -675,7 +801,8 @@ class SPowderSemiEmpiricalCalculator:
         return s
 
     # noinspection PyUnusedLocal
-    def _calculate_order_four(self, q2=None, frequencies=None, indices=None, a_tensor=None, a_trace=None,
+    @staticmethod
+    def _calculate_order_four(q2=None, frequencies=None, indices=None, a_tensor=None, a_trace=None,
                               b_tensor=None, b_trace=None):
         """
         Calculates S for the fourth order quantum event for one atom.
@@ -691,3 +818,40 @@ class SPowderSemiEmpiricalCalculator:
         s = 27.0 / 49250.0 * q2 ** 4 * np.prod(np.take(b_trace, indices=indices), axis=1)
 
         return s
+
+
+def _calculate_s_powder_atom_at_k(fundamentals: np.ndarray, atom_tensors: Dict[str, np.ndarray], kpoint_weight: float, *,
+                                  instrument: Instrument, angle: float, bins: np.ndarray, min_order: int,
+                                  quantum_order_num: int) -> Dict[str, np.ndarray]:
+    """
+    Calculate k-point-weighted S for one atom and one k-point
+
+    This is a module-level function so that only the data of the atom and k-point,
+    and not the whole calculator, is sent to worker processes.
+
+    :param fundamentals: frequencies of fundamentals at the k-point
+    :param atom_tensors: dict of a_tensor, a_trace, b_tensor, b_trace for the atom
+    :param kpoint_weight: weight of the k-point
+    :param instrument: Instrument determining energy-q relationship
+    :param angle: Scattering angle determining energy-q relationship
+    :param bins: Frequency bins for the output spectra
+    :param min_order: Lowest quantum order to evaluate
+    :param quantum_order_num: Highest quantum order to evaluate
+    :returns: spectra by order key, e.g. {'order_1': np.ndarray, 'order_2': np.ndarray}
+    """
+    fund_coeff = np.arange(fundamentals.size, dtype=INT_TYPE)
+
+    atom_s = {}
+
+    # Initialise with fundamentals regardless of whether starting with order 1 or 2
+    frequencies = np.copy(fundamentals)
+    coefficients = np.copy(fund_coeff)
+
+    for order in range(min_order, quantum_order_num + 1):
+        atom_s[f'order_{order}'], frequencies, coefficients = SPowderSemiEmpiricalCalculator._calculate_s_powder_order(
+            order=order, previous_frequencies=frequencies, previous_coefficients=coefficients,
+            fundamentals=fundamentals, fund_coeff=fund_coeff, atom_tensors=atom_tensors,
+            instrument=instrument, angle=angle, bins=bins, kpoint_weight=kpoint_weight,
+            quantum_order_num=quantum_order_num)
+
+    return atom_s
@@ -6,6 +6,8 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
 import json
+import pickle
+from unittest.mock import patch
 import numpy as np
 from numpy.testing import assert_almost_equal
 
@@ -28,11 +30,13 @@ class SCalculatorFactoryPowderTest(unittest.TestCase):
 
     def setUp(self):
         self.default_threads = abins.parameters.performance['threads']
+        self.default_optimal_size = abins.parameters.performance['optimal_size']
         abins.parameters.performance['threads'] = 1
 
     def tearDown(self):
         abins.test_helpers.remove_output_files(list_of_names=["CalculateSPowder"])
         abins.parameters.performance['threads'] = self.default_threads
+        abins.parameters.performance['optimal_size'] = self.default_optimal_size
 
     #     test input
     def test_wrong_input(self):
@@ -76,7 +80,64 @@ class SCalculatorFactoryPowderTest(unittest.TestCase):
     def test_good_case(self):
         self._good_case(name=self._si2)
 
+    def test_parallel_matches_serial(self):
+        serial_data = self._calculate()
+
+        # Use a serial stand-in for the worker pool so the test does not depend on pathos
+        class SerialPool:
+            functions = []
+
+            def imap(self, function, *args):
+                self.functions.append(function)
+                # Send the tasks through pickle as they would be to worker processes
+                function, args = pickle.loads(pickle.dumps((function, args)))
+                return map(function, *args)
+
+            def close(self):
+                pass
+
+            join = clear = close
+
+        pool = SerialPool()
+        abins.parameters.performance['threads'] = 2
+        with patch.object(abins.SPowderSemiEmpiricalCalculator, '_get_pool', return_value=pool) as get_pool:
+            parallel_data = self._calculate()
+        get_pool.assert_called_once_with(2)
+
+        self._check_same_orders(serial_data, parallel_data)
+        # The calculator itself is not sent to the workers
+        for function in pool.functions:
+            self.assertFalse(hasattr(function.func, '__self__'))
+
+    def test_chunked_matches_unchunked(self):
+        for quantum_order_num in (2, 3, 4):
+            with self.subTest(quantum_order_num=quantum_order_num):
+                abins.parameters.performance['optimal_size'] = self.default_optimal_size
+                unchunked_data = self._calculate(quantum_order_num=quantum_order_num)
+
+                # Generate only a few higher-order combinations at a time
+                abins.parameters.performance['optimal_size'] = 10
+                chunked_data = self._calculate(quantum_order_num=quantum_order_num)
+
+                self._check_same_orders(unchunked_data, chunked_data)
+
     # helper functions
+    def _calculate(self, quantum_order_num=2):
+        good_data = self._get_good_data(filename=self._si2)
+        calculator = abins.SCalculatorFactory.init(
+            filename=abins.test_helpers.find_file(filename=self._si2 + ".phonon"), temperature=self._temperature,
+            sample_form=self._sample_form, abins_data=good_data["DFT"], instrument=self._instrument,
+            quantum_order_num=quantum_order_num)
+        return calculator.calculate_data().extract()
+
+    @staticmethod
+    def _check_same_orders(reference_data, data):
+        for atom_key in reference_data:
+            if atom_key == 'frequencies':
+                continue
+            for order_key, s in reference_data[atom_key]['s'].items():
+                assert_almost_equal(data[atom_key]['s'][order_key], s)
+
     def _good_case(self, name=None):
         # calculation of powder data
         good_data = self._get_good_data(filename=name)
@@ -10,7 +10,7 @@ from itertools import product
 import abins
 import numpy as np
 from abins.constants import FIRST_OVERTONE, FUNDAMENTALS, INT_TYPE, FLOAT_TYPE
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 
 
 class FrequencyPowderGeneratorTest(unittest.TestCase):
@@ -186,6 +186,19 @@ class FrequencyPowderGeneratorTest(unittest.TestCase):
                           + fundamentals[double_coeffs[20, 1]]),
                          doubles[20])
 
+        # Calculate some triples and check they decompose into their fundamentals
+        triples, triple_coeffs = (
+            abins.FrequencyPowderGenerator.construct_freq_combinations(
+                previous_array=doubles,
+                previous_coefficients=double_coeffs,
+                fundamentals_array=rand_fundamentals,
+                fundamentals_coefficients=np.arange(len(rand_fundamentals),
+                                                    dtype=INT_TYPE),
+                quantum_order=3))
+
+        self.assertEqual(triple_coeffs.shape, (len(triples), 3))
+        assert_array_almost_equal(np.sum(fundamentals[triple_coeffs], axis=1), triples)
+
 
 if __name__ == '__main__':
     unittest.main()
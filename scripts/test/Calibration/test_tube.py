@@ -48,7 +48,7 @@ class TestTube(unittest.TestCase):
                        }
 
     @classmethod
-    def tearDown(cls) -> None:
+    def tearDownClass(cls) -> None:
         r"""Delete the workspaces associated to the test cases"""
         if len(cls.workspaces_temporary) > 0:
             DeleteWorkspaces(cls.workspaces_temporary)
@@ -73,6 +73,22 @@ class TestTube(unittest.TestCase):
                     self.assertAlmostEqual(expected[row['Name']], row['Value'], delta=1.e-6)
         DeleteWorkspaces(['CalibTable', 'parameters_table_group', 'PeakTable'])
 
+    def test_calibrate_with_workers_matches_serial_calibration(self):
+        data = self.corelli
+        tables = dict()
+        for workers in (1, 4):
+            calibrate(data['workspace'], data['bank_name'], data['wire_positions'],
+                      data['peaks_form'], fitPar=data['fit_parameters'], outputPeak=True, workers=workers)
+            tables[workers] = {'CalibTable': mtd['CalibTable'].toDict(), 'PeakTable': mtd['PeakTable'].toDict()}
+            DeleteWorkspaces(['CalibTable', 'PeakTable'])
+
+        self.assertEqual(tables[1]['CalibTable']['Detector ID'], tables[4]['CalibTable']['Detector ID'])
+        for serial, parallel in zip(tables[1]['CalibTable']['Detector Position'],
+                                    tables[4]['CalibTable']['Detector Position']):
+            self.assertAlmostEqual(0.0, serial.distance(parallel), delta=1.e-9)
+        self.assertEqual(tables[1]['PeakTable'], tables[4]['PeakTable'])
+        self.assertFalse([name for name in AnalysisDataService.getObjectNames() if name.startswith('__tube_calib')])
+
 
 if __name__ == '__main__':
     unittest.main()
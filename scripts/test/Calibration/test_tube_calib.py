@@ -17,7 +17,9 @@ from mantid.api import AnalysisDataService, mtd
 from mantid.simpleapi import DeleteWorkspaces, LoadNexusProcessed
 
 # Calibration imports
-from Calibration.tube_calib import correct_tube_to_ideal_tube, getCalibratedPixelPositions
+from Calibration.tube_calib import (correct_tube_to_ideal_tube, find_initial_peaks, getCalibratedPixelPositions,
+                                    initial_gaussian_parameters)
+from Calibration.tube_calib_fit_params import TubeCalibFitParams
 
 
 class TestTubeCalib(unittest.TestCase):
@@ -128,6 +130,30 @@ class TestTubeCalib(unittest.TestCase):
         DeleteWorkspaces(['parameters', 'PolyFittingWorkspace', 'QF_NormalisedCovarianceMatrix',
                           'QF_Parameters', 'QF_Workspace'])
 
+    def test_initial_gaussian_parameters_of_peak_and_trough(self):
+        pixels = np.arange(64)
+        peak = 10.0 + 100.0 * np.exp(-0.5 * ((pixels - 30) / 2.0)**2)
+        trough = 110.0 - 100.0 * np.exp(-0.5 * ((pixels - 33) / 2.0)**2)
+
+        guesses = initial_gaussian_parameters(np.array([peak, trough]), centre=32, margin=10)
+
+        assert_allclose(guesses[0], [peak.min(), 100.0, 30, 1], atol=0.01)
+        assert_allclose(guesses[1], [trough.max(), -100.0, 33, 1], atol=0.01)
+
+    def test_find_initial_peaks_matches_each_tube(self):
+        counts = np.random.default_rng(42).poisson(100.0, size=(5, 128)).astype(float)
+        fit_par = TubeCalibFitParams([20, 64, 100], margin=8)
+        fit_par.setAutomatic(True)
+
+        guesses = find_initial_peaks(counts, [1, 2, 1], fit_par)
+
+        self.assertEqual((5, 3, 4), guesses.shape)
+        self.assertTrue(np.all(np.isnan(guesses[:, 1])))
+        for tube, tube_counts in enumerate(counts):
+            for index in (0, 2):
+                expected = initial_gaussian_parameters(tube_counts[np.newaxis, :], fit_par.getPeaks()[index], 8)[0]
+                assert_allclose(guesses[tube, index], expected)
+
 
 if __name__ == '__main__':
     unittest.main()
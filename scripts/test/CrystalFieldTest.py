@@ -1339,6 +1339,29 @@ class CrystalFieldFitTest(unittest.TestCase):
         self.assertGreater(cf.chi2, 0.0)
         self.assertLess(cf.chi2, 100.0)
 
+    def test_estimate_parameters_with_workers(self):
+        origin = CrystalField.CrystalField('Ce', 'C2v', B20=0.37737, B22=3.9770, B40=-0.031787, B42=-0.11611, B44=-0.12544,
+                                           Temperature=44.0, FWHM=1.1)
+        x, y = origin.getSpectrum()
+        ws = CrystalField.fitting.makeWorkspace(x, y)
+        cf = CrystalField.CrystalField('Ce', 'C2v', B20=0, B22=0, B40=0, B42=0, B44=0,
+                                       Temperature=44.0, FWHM=1.0)
+        cf.ties(B20=0.37737)
+        fit = CrystalField.CrystalFieldFit(cf, InputWorkspace=ws)
+
+        fit.estimate_parameters(EnergySplitting=50, Parameters=['B22', 'B40', 'B42', 'B44'],
+                                Constraints='20<f1.PeakCentre<45,20<f2.PeakCentre<45', NSamples=100, NOutputs=5,
+                                Seed=123, Workers=4)
+
+        self.assertEqual(fit.get_number_estimates(), 5)
+        estimates = mtd['estimated_parameters']
+        self.assertEqual(estimates.rowCount(), 4)
+        chi_squared = CrystalField.fitting.ChiSquaredObjective(fit._chi_squared_function(fit._function), ws, estimates.column(0),
+                                                               'ChiSquaredWeighted')
+        values = [chi_squared(estimates.column(i)) for i in range(1, 6)]
+        self.assertEqual(values, sorted(values))
+        self.assertAlmostEqual(fit._function.getParameterValue(estimates.cell(0, 0)), estimates.cell(0, 1))
+
     def test_monte_carlo_multi_spectrum(self):
         # Create some crystal field data
         origin = CrystalField.CrystalField('Ce', 'C2v', B20=0.37737, B22=3.9770, B40=-0.031787, B42=-0.11611, B44=-0.12544,
@@ -1625,6 +1648,23 @@ class CrystalFieldFitTest(unittest.TestCase):
         self.assertAlmostEqual(cf.peaks.param[2]['FWHM'], 1.0, 4)
         self.assertAlmostEqual(cf.peaks.param[2]['Amplitude'], 0.397320212226 * c_mbsr, 2)
 
+    def test_chi_squared_objective_matches_CalculateChiSquared(self):
+        origin = CrystalField.CrystalField('Ce', 'C2v', B20=0.37737, B22=3.9770, B40=-0.031787, B42=-0.11611, B44=-0.12544,
+                                           Temperature=44.0, FWHM=1.1)
+        x, y = origin.getSpectrum()
+        ws = CrystalField.fitting.makeWorkspace(x, y)
+        cf = CrystalField.CrystalField('Ce', 'C2v', B20=0.37, B22=3.97, B40=-0.0317, B42=-0.116, B44=-0.12,
+                                       Temperature=44.0, FWHM=1.0)
+        fun = FunctionFactory.createInitialized(cf.makeSpectrumFunction())
+        for name in ['B22', 'B40', 'B42', 'B44']:
+            fun.fixParameter(name)
+
+        objective = CrystalField.fitting.ChiSquaredObjective(str(fun), ws, ['B20'])
+
+        for value in [0.37, 0.38, 0.37737]:
+            fun.setParameter('B20', value)
+            self.assertAlmostEqual(objective([value]), CalculateChiSquared(str(fun), ws)[1], 10)
+
     def test_two_step_fit_sc(self):
         origin = CrystalField.CrystalField('Ce', 'C2v', B20=0.37737, B22=3.9770, B40=-0.031787, B42=-0.11611, B44=-0.12544,
                                            Temperature=44.0, FWHM=1.1)
@@ -0,0 +1,102 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import tempfile
+import time
+import unittest
+
+from Direct.WhiteBeamCache import WhiteBeamCache
+
+from mantid import api
+from mantid.simpleapi import AddSampleLog, CreateSampleWorkspace, ExtractMask, MaskDetectors
+
+
+class DirectWhiteBeamCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self._data_dir = tempfile.TemporaryDirectory()
+        self.cache = WhiteBeamCache(self._cache_dir.name, max_size_bytes=10 * 1024 * 1024)
+
+    def tearDown(self):
+        self._cache_dir.cleanup()
+        self._data_dir.cleanup()
+        api.AnalysisDataService.clear()
+
+    def _data_file(self, file_name='MAR11001.RAW'):
+        full_file_name = os.path.join(self._data_dir.name, file_name)
+        if not os.path.exists(full_file_name):
+            with open(full_file_name, 'w') as data_file:
+                data_file.write(file_name)
+        return full_file_name
+
+    def test_key_depends_on_kind_files_and_settings(self):
+        key = self.cache.get_key('integrals', [self._data_file()], ['NormBy:current'])
+
+        self.assertEqual(key, self.cache.get_key('integrals', [self._data_file()], ['NormBy:current']))
+        self.assertNotEqual(key, self.cache.get_key('hard_mask', [self._data_file()], ['NormBy:current']))
+        self.assertNotEqual(key, self.cache.get_key('integrals', [self._data_file('MAR11002.RAW')], ['NormBy:current']))
+        self.assertNotEqual(key, self.cache.get_key('integrals', [self._data_file()], ['NormBy:monitor-1']))
+
+    def test_key_changes_when_file_is_modified(self):
+        key = self.cache.get_key('integrals', [self._data_file()], [])
+
+        with open(self._data_file(), 'a') as data_file:
+            data_file.write('more data')
+
+        self.assertNotEqual(key, self.cache.get_key('integrals', [self._data_file()], []))
+
+    def test_key_is_none_for_missing_file(self):
+        self.assertIsNone(self.cache.get_key('integrals', ['not_a_file.raw'], []))
+
+    def test_load_returns_saved_workspace(self):
+        key = self.cache.get_key('integrals', [self._data_file()], [])
+        white_ws = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=2, OutputWorkspace='white_ws')
+        AddSampleLog(white_ws, LogName='DET_EFFICIENCY_calculated', LogText='NormBy:current', LogType='String')
+
+        self.assertTrue(self.cache.save(key, white_ws))
+        cached_ws = self.cache.load(key, 'cached_white_ws')
+
+        self.assertEqual('cached_white_ws', cached_ws.name())
+        self.assertEqual(white_ws.getNumberHistograms(), cached_ws.getNumberHistograms())
+        self.assertEqual('NormBy:current', cached_ws.getRun().getLogData('DET_EFFICIENCY_calculated').value)
+
+    def test_load_returns_saved_mask(self):
+        key = self.cache.get_key('hard_mask', [self._data_file()], [])
+        white_ws = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=2, OutputWorkspace='white_ws')
+        MaskDetectors(white_ws, WorkspaceIndexList=[1, 3])
+        mask_ws, _ = ExtractMask(white_ws, OutputWorkspace='mask_ws')
+
+        self.cache.save(key, mask_ws)
+        self.cache.load(key, 'cached_mask_ws')
+        _, masked_detectors = ExtractMask('cached_mask_ws', OutputWorkspace='extracted_mask_ws')
+
+        self.assertEqual(2, len(masked_detectors))
+
+    def test_load_returns_none_without_entry(self):
+        self.assertIsNone(self.cache.load('missing', 'cached_white_ws'))
+
+    def test_least_recently_used_entries_are_removed_when_full(self):
+        keys = [self.cache.get_key('integrals', [self._data_file('MAR1100{}.RAW'.format(index))], [])
+                for index in range(3)]
+        white_ws = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=2, OutputWorkspace='white_ws')
+        for key in keys:
+            self.cache.save(key, white_ws)
+        entry_size = os.path.getsize(os.path.join(self._cache_dir.name, keys[0] + '.nxs'))
+        # Use the first entry so that the second is the least recently used
+        time.sleep(0.01)
+        self.cache.load(keys[0], 'cached_white_ws')
+
+        self.cache._max_size_bytes = int(2.5 * entry_size)
+        self.cache.remove_least_recently_used()
+
+        self.assertIsNotNone(self.cache.load(keys[0], 'cached_white_ws'))
+        self.assertIsNone(self.cache.load(keys[1], 'cached_white_ws'))
+        self.assertIsNotNone(self.cache.load(keys[2], 'cached_white_ws'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+
+import numpy as np
+from mantid.kernel import V3D
+from mantid.simpleapi import (CreateSampleWorkspace, MoveInstrumentComponent, PredictPeaks, RotateInstrumentComponent,
+                              SetGoniometer, SetUB, mtd)
+
+import ICCFitTools as ICCFT
+
+
+def _perVoxelTOF(QX, QY, QZ, peak):
+    # The time-of-flight of each voxel found by moving the peak to it, as getXTOF used to
+    origQS = peak.getQSampleFrame()
+    tList = np.zeros_like(QX)
+    for i in range(QX.shape[0]):
+        for j in range(QX.shape[1]):
+            for k in range(QX.shape[2]):
+                newQ = V3D(QX[i, j, k], QY[i, j, k], QZ[i, j, k])
+                peak.setQSampleFrame(newQ)
+                flightPath = peak.getL1() + peak.getL2()
+                scatteringHalfAngle = 0.5 * peak.getScattering()
+                tList[i, j, k] = 3176.507 * flightPath * np.sin(scatteringHalfAngle) / np.linalg.norm(newQ)
+    peak.setQSampleFrame(origQS)
+    return tList
+
+
+class ICCFitToolsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # A finely pixelated bank at 90 degrees and a rotated sample, so the beam is not along a Q sample axis
+        data = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=100, PixelSpacing=0.0005, BankDistanceFromSample=0.5,
+                                     XUnit='TOF', XMin=3000., XMax=14000., BinWidth=100., OutputWorkspace='data')
+        MoveInstrumentComponent(Workspace=data, ComponentName='bank1', X=0.5, Y=0., Z=0., RelativePosition=False)
+        RotateInstrumentComponent(Workspace=data, ComponentName='bank1', X=0., Y=1., Z=0., Angle=90.,
+                                  RelativeRotation=False)
+        SetGoniometer(Workspace=data, Axis0='30,0,1,0,1')
+        SetUB(Workspace=data, a=20., b=20., c=20., alpha=90., beta=90., gamma=90.)
+        predicted = PredictPeaks(InputWorkspace=data, WavelengthMin=2., WavelengthMax=4., MinDSpacing=1.,
+                                 MaxDSpacing=20., ReflectionCondition='Primitive', OutputWorkspace='predicted')
+        peaks = [predicted.getPeak(index) for index in range(predicted.getNumberPeaks())]
+        peaks = [peak for peak in peaks if 30 <= peak.getRow() < 70 and 30 <= peak.getCol() < 70]
+        cls._peak = peaks[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        mtd.clear()
+
+    def _getQBox(self, halfWidth=0.02, nBins=7):
+        qS = np.array(self._peak.getQSampleFrame())
+        axes = [np.linspace(q - halfWidth, q + halfWidth, nBins) for q in qS]
+        return np.meshgrid(*axes, indexing='ij', copy=False)
+
+    def test_getTOFFromQ_matches_tof_of_each_voxel(self):
+        QX, QY, QZ = self._getQBox()
+
+        tof = ICCFT.getTOFFromQ(QX, QY, QZ, self._peak)
+
+        self.assertEqual(QX.shape, tof.shape)
+        # The per-voxel TOF uses the centre of the pixel each Q hits, which is within 0.5 mrad of the Q direction
+        np.testing.assert_allclose(tof, _perVoxelTOF(QX, QY, QZ, self._peak), rtol=5e-4)
+
+    def test_getTOFFromQ_at_peak_is_peak_tof(self):
+        QX, QY, QZ = self._getQBox(nBins=3)
+
+        tof = ICCFT.getTOFFromQ(QX, QY, QZ, self._peak)
+
+        self.assertAlmostEqual(self._peak.getTOF(), tof[1, 1, 1], delta=1e-3 * self._peak.getTOF())
+
+    def test_getTOFFromQ_leaves_peak_unchanged(self):
+        qS = self._peak.getQSampleFrame()
+
+        ICCFT.getTOFFromQ(*self._getQBox(), peak=self._peak)
+
+        np.testing.assert_allclose(np.array(qS), np.array(self._peak.getQSampleFrame()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from Muon.MaxentTools.chosol import CHOSOL, CHOSOL_MANY
+from Muon.MaxentTools.multimaxalpha import MULTIMAX, MULTIMAX_MANY
+from Muon.MaxentTools.opus import OPUS
+from Muon.MaxentTools.tropus import TROPUS
+
+NHISTS = 4
+NPTS = 512
+RES = 0.016
+MAXPAGE_N = 256
+
+
+def _run_data(seed, frequency):
+    rng = np.random.default_rng(seed)
+    t = (np.arange(400) + 0.5) * RES
+    phases = 2. * np.pi * np.arange(NHISTS) / NHISTS
+    counts = 500. * np.exp(-t / 2.197) * (1. + 0.2 * np.cos(2. * np.pi * frequency * t[np.newaxis, :] + phases[:, np.newaxis]))
+    return rng.poisson(counts).astype(float)
+
+
+class MuonMaxentToolsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mylog = mock.Mock()
+        self.prog = mock.Mock()
+        self.shared = dict(POINTS_nhists=NHISTS, POINTS_ngroups=NHISTS, POINTS_npts=NPTS, RUNDATA_res=RES,
+                           GROUPING_group=np.arange(NHISTS), MAXPAGE_n=MAXPAGE_N, PULSES_def=0.1, PULSES_npulse=1,
+                           FLAGS_fitdead=False, FLAGS_fixphase=False, SAVETIME_i2=2 * NPTS, OuterIter=3, InnerIter=5,
+                           mylog=self.mylog, prog=self.prog)
+        self.runs = [dict(CHANNELS_itzero=0, CHANNELS_i1stgood=5, CHANNELS_itotal=400, RUNDATA_frames=1000.,
+                          DATALL_rdata=_run_data(seed, frequency), FAC_factor=1.04, SENSE_taud=np.zeros(NHISTS),
+                          filePHASE=np.zeros(NHISTS), TZERO_fine=0.008)
+                     for seed, frequency in enumerate([1.0, 1.5, 2.5])]
+
+    def test_OPUS_with_many_runs_matches_each_run(self):
+        rng = np.random.default_rng(0)
+        x = rng.random([3, MAXPAGE_N])
+        convol = rng.random([3, MAXPAGE_N]) + 1.j * rng.random([3, MAXPAGE_N])
+        a, b, e = rng.random([3, NHISTS]), rng.random([3, NHISTS]), rng.random([3, NPTS])
+
+        ox = OPUS(x, 2 * NPTS, convol, a, b, e)
+
+        self.assertEqual((3, NPTS, NHISTS), ox.shape)
+        for k in range(3):
+            np.testing.assert_allclose(ox[k], OPUS(x[k], 2 * NPTS, convol[k], a[k], b[k], e[k]))
+
+    def test_TROPUS_with_many_runs_matches_each_run(self):
+        rng = np.random.default_rng(0)
+        ox = rng.random([3, NPTS, NHISTS])
+        convol = rng.random([3, MAXPAGE_N]) + 1.j * rng.random([3, MAXPAGE_N])
+        a, b, e = rng.random([3, NHISTS]), rng.random([3, NHISTS]), rng.random([3, NPTS])
+
+        x = TROPUS(ox, 2 * NPTS, convol, a, b, e)
+
+        self.assertEqual((3, MAXPAGE_N), x.shape)
+        for k in range(3):
+            np.testing.assert_allclose(x[k], TROPUS(ox[k], 2 * NPTS, convol[k], a[k], b[k], e[k]))
+
+    def test_CHOSOL_MANY_falls_back_to_CHOSOL_for_matrices_which_are_not_positive_definite(self):
+        a = np.array([np.diag([2., 3., 4.]), np.diag([1., -1., 1.])])
+        b = np.ones([2, 3])
+
+        x = CHOSOL_MANY(a, b, self.mylog)
+
+        for k in range(2):
+            np.testing.assert_allclose(x[k], CHOSOL(a[k], b[k], self.mylog))
+        self.mylog.warning.assert_called()
+
+    def test_MULTIMAX_MANY_matches_MULTIMAX_for_each_run(self):
+        many = MULTIMAX_MANY(**self.shared, **{key: [run[key] for run in self.runs] for key in self.runs[0]})
+
+        self.assertEqual(len(self.runs), len(many))
+        for run, many_result in zip(self.runs, many):
+            result = MULTIMAX(**self.shared, **run, phaseconvWS=None, deadDetectors=[])
+            # spectrum, phases and amplitudes
+            for index in (3, 7, 8, 17, 18):
+                np.testing.assert_allclose(many_result[index], result[index], rtol=1e-8, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,10 @@
 import os
 import sys
 from tempfile import TemporaryDirectory
+import threading
+import time
 import unittest
+from unittest import mock
 import importlib as imp
 
 from mantid.simpleapi import *
@@ -286,6 +289,52 @@ class ReductionWrapperTest(unittest.TestCase):
         self.assertTrue('SR_MAR000400#1_reduced' in mtd)
         self.assertTrue('SR_MAR000400#2_reduced' in mtd)
 
+    def test_next_run_file_is_not_read_by_default(self):
+        th = test_helper()
+        th.reducer.prop_man.sample_run = [300, 400, 500]
+
+        with mock.patch('Direct.ReductionWrapper._read_run_file') as read_run_file:
+            runs = th.run_reduction()
+
+        self.assertFalse(th.read_next_run_file)
+        self.assertEqual(3, len(runs))
+        read_run_file.assert_not_called()
+
+    def test_next_run_file_is_read_while_reducing(self):
+        th = test_helper()
+        th.read_next_run_file = True
+        th.reducer.prop_man.sample_run = [300, 400, 500]
+        runfiles = PropertyManager.sample_run.get_run_file_list()
+
+        with mock.patch('Direct.ReductionWrapper._read_run_file') as read_run_file:
+            runs = th.run_reduction()
+
+        self.assertEqual(3, len(runs))
+        self.assertEqual([runfiles[1], runfiles[2]], [args[0] for args, _ in read_run_file.call_args_list])
+
+    def test_failed_reduction_does_not_wait_for_next_run_file(self):
+        th = test_helper()
+        th.read_next_run_file = True
+        th.reducer.prop_man.sample_run = [300, 400, 500]
+        # the read only finishes when it is stopped, or when the test ends
+        test_finished = threading.Event()
+
+        def read_run_file(file_name, stop_reading):
+            while not stop_reading.is_set() and not test_finished.wait(0.01):
+                pass
+
+        try:
+            with mock.patch('Direct.ReductionWrapper._read_run_file', side_effect=read_run_file) as read_mock, \
+                    mock.patch.object(th, 'reduce', side_effect=RuntimeError('reduction failed')):
+                start = time.time()
+                self.assertRaisesRegex(RuntimeError, 'reduction failed', th.run_reduction)
+                self.assertLess(time.time() - start, 5.)
+            self.assertEqual(1, read_mock.call_count)
+            stop_reading = read_mock.call_args[0][1]
+            self.assertTrue(stop_reading.is_set())
+        finally:
+            test_finished.set()
+
     def test_check_archive_logs(self):
         th = test_helper()
 
@@ -12,8 +12,8 @@ from mantid.api import WorkspaceGroup, AnalysisDataService
 from mantid.simpleapi import CreateSampleWorkspace, GroupWorkspaces
 from sans.algorithm_detail.batch_execution import (get_all_names_to_save, get_transmission_names_to_save,
                                                    ReductionPackage, select_reduction_alg, save_workspace_to_file,
-                                                   delete_reduced_workspaces)
-from sans.common.enums import SaveType
+                                                   delete_reduced_workspaces, reductions_for_batch)
+from sans.common.enums import OutputMode, SaveType
 
 
 class ADSMock(object):
@@ -353,5 +353,77 @@ class DeleteMethodsTest(unittest.TestCase):
             self.assertFalse(i)
 
 
+@mock.patch("sans.algorithm_detail.batch_execution.group_workspaces_if_required")
+@mock.patch("sans.algorithm_detail.batch_execution.set_alg_output_names")
+@mock.patch("sans.algorithm_detail.batch_execution.reduce_package")
+@mock.patch("sans.algorithm_detail.batch_execution.get_reduction_packages")
+@mock.patch("sans.algorithm_detail.batch_execution.provide_loaded_data", return_value=({}, {}))
+class ReductionsForBatchTest(unittest.TestCase):
+    @staticmethod
+    def _create_packages(state, workspaces, monitors):
+        packages = []
+        for index in range(3):
+            package = mock.NonCallableMock(is_part_of_event_slice_reduction=False)
+            package.state.slice.start_time = None
+            package.factor = (state.index, index)
+            package.shift_and_scale_factors_name = None
+            packages.append(package)
+        return packages
+
+    @staticmethod
+    def _reduce(package, *args):
+        package.out_scale_factor = [package.factor]
+        package.out_shift_factor = [-package.factor[1]]
+        return package
+
+    def _run_reductions(self, number_of_workers, can_scatter=None):
+        states = [mock.NonCallableMock(index=index) for index in range(5)]
+        for state in states:
+            state.compatibility.use_compatibility_mode = False
+            state.compatibility.use_event_slice_optimisation = False
+            state.data.can_scatter = can_scatter
+        return reductions_for_batch(states, True, OutputMode.PUBLISH_TO_ADS, False, '',
+                                    number_of_workers=number_of_workers)
+
+    def test_concurrent_reductions_return_factors_in_order(self, _, get_packages_mock, reduce_mock, set_names_mock,
+                                                           group_mock):
+        get_packages_mock.side_effect = self._create_packages
+        reduce_mock.side_effect = self._reduce
+
+        serial_factors = self._run_reductions(number_of_workers=1)
+        concurrent_factors = self._run_reductions(number_of_workers=4)
+
+        self.assertEqual(serial_factors, concurrent_factors)
+        self.assertEqual([(2, 0), (2, 1), (2, 2)], concurrent_factors[0][2])
+        self.assertEqual(30, reduce_mock.call_count)
+        self.assertEqual(30, group_mock.call_count)
+
+    def test_each_package_is_published_in_order(self, _, get_packages_mock, reduce_mock, set_names_mock, group_mock):
+        get_packages_mock.side_effect = self._create_packages
+        reduce_mock.side_effect = self._reduce
+
+        self._run_reductions(number_of_workers=4)
+
+        published = [call[0][0].factor for call in group_mock.call_args_list]
+        self.assertEqual([(state, index) for state in range(5) for index in range(3)], published)
+
+    def test_can_is_published_before_it_is_reused(self, _, get_packages_mock, reduce_mock, set_names_mock,
+                                                  group_mock):
+        get_packages_mock.side_effect = self._create_packages
+        events = []
+
+        def _reduce(package, *args):
+            events.append(("reduce", package.factor))
+            return self._reduce(package)
+
+        reduce_mock.side_effect = _reduce
+        group_mock.side_effect = lambda package, *args, **kwargs: events.append(("publish", package.factor))
+
+        self._run_reductions(number_of_workers=4, can_scatter="SANS2D00001")
+
+        self.assertEqual([("reduce", (0, 0)), ("publish", (0, 0))], events[:2])
+        self.assertEqual(15, reduce_mock.call_count)
+
+
 if __name__ == '__main__':
     unittest.main()
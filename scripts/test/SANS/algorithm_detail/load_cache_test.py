@@ -0,0 +1,98 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2022 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from mantid.simpleapi import CreateSampleWorkspace
+from sans.algorithm_detail.load_cache import SANSLoadCache
+from sans.common.log_tagger import get_tag, set_tag
+from sans.common.constants import SANS_FILE_TAG
+
+
+class SANSLoadCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._cache_dir = tempfile.TemporaryDirectory()
+        self._data_dir = tempfile.TemporaryDirectory()
+        self.cache = SANSLoadCache(self._cache_dir.name, max_size_bytes=10 * 1024 * 1024)
+
+    def tearDown(self):
+        self._cache_dir.cleanup()
+        self._data_dir.cleanup()
+
+    def _file_information(self, file_name="SANS2D00022024.nxs"):
+        full_file_name = os.path.join(self._data_dir.name, file_name)
+        if not os.path.exists(full_file_name):
+            with open(full_file_name, "w") as data_file:
+                data_file.write(file_name)
+        return mock.NonCallableMock(get_file_name=mock.Mock(return_value=full_file_name))
+
+    @staticmethod
+    def _create_workspace(tag):
+        workspace = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=2, StoreInADS=False)
+        set_tag(SANS_FILE_TAG, tag, workspace)
+        return workspace
+
+    def test_key_depends_on_file_period_and_type(self):
+        file_information = self._file_information()
+        key = self.cache.get_key(file_information, False, 0, "")
+
+        self.assertEqual(key, self.cache.get_key(file_information, False, 0, ""))
+        self.assertNotEqual(key, self.cache.get_key(file_information, True, 0, ""))
+        self.assertNotEqual(key, self.cache.get_key(file_information, False, 1, ""))
+        self.assertNotEqual(key, self.cache.get_key(self._file_information("LOQ74044.nxs"), False, 0, ""))
+
+    def test_key_changes_when_file_is_modified(self):
+        file_information = self._file_information()
+        key = self.cache.get_key(file_information, False, 0, "")
+
+        with open(file_information.get_file_name(), "a") as data_file:
+            data_file.write("more data")
+
+        self.assertNotEqual(key, self.cache.get_key(file_information, False, 0, ""))
+
+    def test_key_is_none_for_missing_file(self):
+        file_information = mock.NonCallableMock(get_file_name=mock.Mock(return_value="not_a_file.nxs"))
+
+        self.assertIsNone(self.cache.get_key(file_information, False, 0, ""))
+
+    def test_retrieve_returns_stored_workspaces(self):
+        key = self.cache.get_key(self._file_information(), False, 0, "")
+        self.cache.store(key, [self._create_workspace("sample")], [self._create_workspace("sample_monitors")], None)
+
+        workspaces, monitors = self.cache.retrieve(key, None)
+
+        self.assertEqual(1, len(workspaces))
+        self.assertEqual(1, len(monitors))
+        self.assertEqual("sample", get_tag(SANS_FILE_TAG, workspaces[0]))
+        self.assertEqual("sample_monitors", get_tag(SANS_FILE_TAG, monitors[0]))
+
+    def test_retrieve_returns_empty_lists_without_entry(self):
+        self.assertEqual(([], []), self.cache.retrieve("missing", None))
+
+    def test_least_recently_used_entries_are_removed_when_full(self):
+        keys = [self.cache.get_key(self._file_information("SANS2D0000{}.nxs".format(index)), False, 0, "")
+                for index in range(3)]
+        for key in keys:
+            self.cache.store(key, [self._create_workspace(key)], [], None)
+        entry_size = os.path.getsize(os.path.join(self._cache_dir.name, keys[0] + "_0.nxs"))
+        # Use the first entry so that the second is the least recently used
+        time.sleep(0.01)
+        self.cache.retrieve(keys[0], None)
+
+        self.cache._max_size_bytes = int(2.5 * entry_size)
+        self.cache.remove_least_recently_used()
+
+        self.assertNotEqual(([], []), self.cache.retrieve(keys[0], None))
+        self.assertEqual(([], []), self.cache.retrieve(keys[1], None))
+        self.assertNotEqual(([], []), self.cache.retrieve(keys[2], None))
+
+
+if __name__ == '__main__':
+    unittest.main()
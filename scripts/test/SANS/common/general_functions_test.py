@@ -20,7 +20,7 @@ from sans.common.general_functions import (quaternion_to_angle_and_axis, create_
                                            convert_bank_name_to_detector_type_isis,
                                            get_facility, parse_diagnostic_settings, get_transmission_output_name,
                                            get_output_name, parse_event_slice_setting, wav_range_to_str,
-                                           wav_ranges_to_str)
+                                           wav_ranges_to_str, get_ads_workspace_references)
 from sans.state.StateObjects.StateData import StateData
 from sans.test_helper.test_director import TestDirector
 
@@ -605,6 +605,14 @@ class SANSFunctionsTest(unittest.TestCase):
         create_managed_non_child_algorithm("TestAlg", **{"test_val": 5})
         alg_manager_mock.create.assert_called_once_with("TestAlg")
 
+    @mock.patch("sans.common.general_functions.AnalysisDataService")
+    def test_that_ads_workspace_references_skip_workspaces_removed_while_iterating(self, ads_mock):
+        workspaces = {"first": mock.sentinel.first, "third": mock.sentinel.third}
+        ads_mock.getObjectNames.return_value = ["first", "second", "third"]
+        ads_mock.retrieve.side_effect = lambda name: workspaces[name]
+
+        self.assertEqual([mock.sentinel.first, mock.sentinel.third], list(get_ads_workspace_references()))
+
     def test_wav_ranges_to_str_full_range_removed(self):
         input_values = [(2, 600), (2, 200), (4, 400), (6, 600)]
         expected_output = "2-200, 4-400, 6-600"